@@ -8,10 +8,13 @@ class OrdersInline(admin.TabularInline):
     model = Billing.orders.through
 
 
+class ArchivedOrdersInline(admin.TabularInline):
+    model = Billing.archived_orders.through
+
+
 @admin.register(Billing)
 class BillingAdmin(admin.ModelAdmin):
     inlines = [
         OrdersInline,
+        ArchivedOrdersInline,
     ]
-
-
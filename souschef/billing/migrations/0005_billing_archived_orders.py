@@ -0,0 +1,20 @@
+# Generated by Django 5.2.9 on 2026-10-19 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("billing", "0004_auto_20201030_1540"),
+        ("order", "0019_archived_orders"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="billing",
+            name="archived_orders",
+            field=models.ManyToManyField(
+                blank=True, related_name="billings", to="order.archivedorder"
+            ),
+        ),
+    ]
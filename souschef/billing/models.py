@@ -15,6 +15,7 @@ from django.utils.translation import gettext_lazy as _
 
 from souschef.member.models import Client
 from souschef.order.models import (
+    ArchivedOrder,
     Order,
     Order_item,
 )
@@ -104,6 +105,11 @@ class Billing(models.Model):  # noqa: DJ008
 
     orders = models.ManyToManyField(Order)
 
+    # The orders of the billing moved to the archive tables.
+    archived_orders = models.ManyToManyField(
+        ArchivedOrder, blank=True, related_name="billings"
+    )
+
     objects = BillingManager()
 
     @property
@@ -114,10 +120,20 @@ class Billing(models.Model):  # noqa: DJ008
         period = date(self.billing_year, self.billing_month, 1)
         return period
 
+    def get_orders(self) -> list[Order | ArchivedOrder]:
+        """The orders of the billing, archived or not, by delivery date."""
+        return sorted(
+            [*self.orders.all(), *self.archived_orders.all()],
+            key=lambda order: order.delivery_date,
+            reverse=True,
+        )
+
     @property
-    def client_orders(self) -> collections.defaultdict[Client, list[Order]]:
+    def client_orders(
+        self,
+    ) -> collections.defaultdict[Client, list[Order | ArchivedOrder]]:
         client_orders = collections.defaultdict(list)
-        for order in self.orders.all():
+        for order in self.get_orders():
             client_orders[order.client].append(order)
         return client_orders
 
@@ -4,6 +4,7 @@ from decimal import Decimal
 from io import StringIO
 
 from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
 
@@ -17,7 +18,8 @@ from souschef.member.factories import ClientFactory
 from souschef.member.models import Client
 from souschef.order.constants import ORDER_STATUS_DELIVERED
 from souschef.order.factories import OrderFactory
-from souschef.order.models import Order
+from souschef.order.models import ArchivedOrder, Order, Order_item
+from souschef.sous_chef.tests import QueryPlanMixin
 from souschef.sous_chef.tests import TestMixin as SousChefTestMixin
 
 AMOUNT_COL = "Montant"
@@ -104,6 +106,34 @@ class BillingManagerTestCase(TestCase):
         self.assertEqual(None, billing)
 
 
+class BillingQueryPlanTestCase(QueryPlanMixin, TestCase):
+    fixtures = ["routes.json"]
+
+    @classmethod
+    def setUpTestData(cls):
+        client = ClientFactory()
+        for month in range(1, 13):
+            OrderFactory.create_batch(
+                3, delivery_date=date(2025, month, 28), client=client, status="D"
+            )
+        OrderFactory(delivery_date=date(2024, 12, 31), client=client, status="D")
+        OrderFactory(delivery_date=date(2026, 1, 1), client=client, status="D")
+
+    def test_billing_create_new_uses_delivery_date_index(self):
+        billing = self.assertNoFullTableScan(
+            ["order_order", "order_order_item"],
+            Billing.objects.billing_create_new,
+            2025,
+            12,
+        )
+        self.assertEqual(3, billing.orders.count())
+
+    def test_get_billable_orders_month_boundaries(self):
+        self.assertEqual(1, Order.objects.get_billable_orders(2024, 12).count())
+        self.assertEqual(1, Order.objects.get_billable_orders("2026", "01").count())
+        self.assertEqual(3, Order.objects.get_billable_orders(2025, 2).count())
+
+
 class RedirectAnonymousUserTestCase(SousChefTestMixin, TestCase):
     fixtures = ["routes.json"]
 
@@ -334,6 +364,120 @@ class BillingSummaryViewTestCase(SousChefTestMixin, TestCase):
         self.assertEqual(Decimal(EXPECTED_ORDER_TOTAL), csv_total)
 
 
+class ArchiveOrdersTestCase(SousChefTestMixin, TestCase):
+    fixtures = ["routes.json"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.billing = BillingFactory(billing_year=2025, billing_month=8)
+        cls.recent_billing = BillingFactory(billing_year=2025, billing_month=9)
+        client = ClientFactory(status=Client.ACTIVE)
+        for day, billing in (
+            (date(2025, 8, 14), cls.billing),
+            (date(2025, 8, 15), cls.billing),
+            (date(2025, 8, 21), cls.billing),
+            (date(2025, 9, 1), cls.recent_billing),
+        ):
+            order = Order.objects.create_order(
+                delivery_date=day,
+                client=client,
+                items={
+                    "main_dish_default_quantity": 2,
+                    "size_default": "L",
+                    "dessert_default_quantity": 3,
+                    "delivery_default": True,
+                },
+                is_main_dish_billable=True,
+            )
+            Order.objects.change_orders_status([order], ORDER_STATUS_DELIVERED)
+            billing.orders.add(order)
+        # Not attached to a billing.
+        cls.unbilled_order = OrderFactory(
+            delivery_date=date(2025, 8, 22), client=client, status="D"
+        )
+
+    def archive(self, batch_size=2):
+        retention_days = (date.today() - date(2025, 9, 1)).days
+        call_command(
+            "archiveorders",
+            retention_days=retention_days,
+            batch_size=batch_size,
+            stdout=StringIO(),
+        )
+
+    def get_billing_pages(self):
+        self.force_login()
+        summary = self.client.get(reverse("billing:view", args=(self.billing.id,)))
+        orders = self.client.get(
+            reverse("billing:view_orders", args=(self.billing.id,))
+        )
+        export = self.client.get(
+            reverse("billing:view", args=(self.billing.id,)),
+            {"format": "csv", "next_invoice_number": 1},
+        )
+        return (
+            summary.context["summary"]["payment_types"],
+            summary.context["summary"]["total_deliveries"],
+            [(o.id, o.price) for o in orders.context["orders"]],
+            orders.context["total_amount"],
+            export.content,
+        )
+
+    def test_archive_orders(self):
+        order_ids = sorted(self.billing.orders.values_list("id", flat=True))
+        item_ids = sorted(
+            Order_item.objects.filter(order__in=order_ids).values_list("id", flat=True)
+        )
+
+        self.archive()
+
+        self.assertFalse(Order.objects.filter(id__in=order_ids).exists())
+        self.assertFalse(Order_item.objects.filter(id__in=item_ids).exists())
+        self.assertEqual(2, Order.objects.count())
+        self.assertFalse(self.billing.orders.exists())
+        self.assertEqual(
+            order_ids, sorted(self.billing.archived_orders.values_list("id", flat=True))
+        )
+        archived = ArchivedOrder.objects.get(id=order_ids[0])
+        self.assertEqual(
+            item_ids[: archived.orders.count()],
+            sorted(archived.orders.values_list("id", flat=True)),
+        )
+        self.assertEqual(ORDER_STATUS_DELIVERED, archived.status)
+        self.assertEqual(
+            [ORDER_STATUS_DELIVERED],
+            [change["status_to"] for change in archived.status_changes],
+        )
+        self.assertEqual(1, Client.objects.get().number_of_deliveries_in_month(2025, 9))
+        self.assertEqual(4, Client.objects.get().number_of_deliveries_in_month(2025, 8))
+
+    def test_billing_pages_unchanged(self):
+        before = self.get_billing_pages()
+
+        self.archive()
+
+        self.assertEqual(3, self.billing.archived_orders.count())
+        self.assertEqual(before, self.get_billing_pages())
+        response = self.client.get(reverse("billing:list"))
+        self.assertContains(response, '<td class="center aligned">3</td>')
+
+    def test_size_warning_includes_archived_orders(self):
+        self.archive()
+        archived = self.billing.archived_orders.first()
+        archived.orders.filter(component_group="main_dish").update(size=None)
+        self.force_login()
+        response = self.client.get(reverse("billing:view", args=(self.billing.id,)))
+        self.assertContains(response, f"#{archived.id} (")
+
+    def test_archive_is_incremental(self):
+        self.archive(batch_size=1)
+        self.assertEqual(3, ArchivedOrder.objects.count())
+
+        self.archive()
+        self.assertEqual(3, ArchivedOrder.objects.count())
+        self.assertEqual(2, Order.objects.count())
+
+
 class BillingDeleteViewTestCase(SousChefTestMixin, TestCase):
     def test_redirects_users_who_do_not_have_edit_permission(self):
         # Setup
@@ -10,7 +10,6 @@ from django.contrib.auth.mixins import (
 from django.db.models import (
     Count,
     Prefetch,
-    Q,
 )
 from django.http import (
     HttpResponseBadRequest,
@@ -32,11 +31,15 @@ from souschef.billing.types import (
 from souschef.djangocompat import string_concat
 from souschef.member.models import Client
 from souschef.member.types import RateType
+from souschef.order.constants import ORDER_STATUS_DELIVERED
 from souschef.order.filters import DeliveredOrdersByMonthFilter
 from souschef.order.models import (
+    ArchivedOrder,
     Order,
     Order_item,
+    get_month_range,
 )
+from souschef.sous_chef.dbrouting import ReportingMixin
 
 
 class BillingList(LoginRequiredMixin, PermissionRequiredMixin, generic.ListView):
@@ -55,9 +58,10 @@ class BillingList(LoginRequiredMixin, PermissionRequiredMixin, generic.ListView)
 
     def get_queryset(self):
         uf = BillingFilter(self.request.GET)
-        return uf.qs.annotate(Count("orders", distinct=True)).order_by(
-            "-billing_year", "-billing_month"
-        )
+        return uf.qs.annotate(
+            orders_count=Count("orders", distinct=True)
+            + Count("archived_orders", distinct=True)
+        ).order_by("-billing_year", "-billing_month")
 
 
 class BillingCreate(LoginRequiredMixin, PermissionRequiredMixin, generic.CreateView):
@@ -147,7 +151,7 @@ class BillingAdd(LoginRequiredMixin, PermissionRequiredMixin, generic.ListView):
 
 
 class BillingSummaryView(
-    LoginRequiredMixin, PermissionRequiredMixin, generic.DetailView
+    LoginRequiredMixin, PermissionRequiredMixin, ReportingMixin, generic.DetailView
 ):
     # Display summary of billing
     model = Billing
@@ -160,9 +164,11 @@ class BillingSummaryView(
             queryset=Order.objects.all()
             .select_related("client__member")
             .only(
+                "delivery_date",
                 "client__member__firstname",
                 "client__member__lastname",
                 "client__rate_type",
+                "client__delivery_type",
                 "client__billing_payment_type",
                 "client__billing_mailing_type",
                 "client__billing_email",
@@ -180,7 +186,13 @@ class BillingSummaryView(
                     ),
                 )
             ),
-        )
+        ),
+        Prefetch(
+            "archived_orders",
+            queryset=ArchivedOrder.objects.all()
+            .select_related("client__member")
+            .prefetch_related("orders"),
+        ),
     )
 
     def get_template_names(self):
@@ -218,15 +230,32 @@ class BillingSummaryView(
             ),
             "payment_types": [],
         }
+        # Same count as `Client.number_of_deliveries_in_month`, for all the
+        # clients at once.
+        deliveries_by_client = collections.Counter()
+        # The orders are only archived with their billing.
+        models = [Order, ArchivedOrder] if billing.archived_orders.all() else [Order]
+        for model in models:
+            deliveries_by_client.update(
+                dict(
+                    model.objects.filter(
+                        delivery_date__range=get_month_range(
+                            billing.billing_year, billing.billing_month
+                        ),
+                        status=ORDER_STATUS_DELIVERED,
+                    )
+                    .values_list("client")
+                    .annotate(Count("id"))
+                    .order_by()
+                )
+            )
         for client, client_summary in billing.summary.items():
             stats = summary["payment_types_dict"][client.billing_payment_type]
             stats["total_main_dishes"]["R"] += client_summary["total_main_dishes"]["R"]
             stats["total_main_dishes"]["L"] += client_summary["total_main_dishes"]["L"]
             stats["total_billable_extras"] += client_summary["total_billable_extras"]
             stats["total_amount"] += client_summary["total_amount"]
-            nb_deliveries = client.number_of_deliveries_in_month(
-                billing.billing_year, billing.billing_month
-            )
+            nb_deliveries = deliveries_by_client.get(client.id, 0)
             stats["clients"].append(
                 {
                     "id": client.id,
@@ -277,19 +306,14 @@ class BillingSummaryView(
         context["summary"] = self._get_billing_summary(billing)
 
         # Throw a warning if there's any main_dish order with size=None.
-        q = Order_item.objects.filter(
-            Q(order__in=billing.orders.all())
-            & (Q(size__isnull=True) | Q(size=""))
-            & Q(component_group="main_dish")
-        )
-        if q.exists():
-            size_none_orders_info = list(
-                q.values_list(
-                    "order__id",
-                    "order__client__member__firstname",
-                    "order__client__member__lastname",
-                )
-            )
+        # The items are prefetched with the orders.
+        size_none_orders_info = [
+            (order.id, order.client.member.firstname, order.client.member.lastname)
+            for order in billing.get_orders()
+            for item in order.orders.all()
+            if item.component_group == "main_dish" and not item.size
+        ]
+        if size_none_orders_info:
             formatted_htmls = ['<ul class="ui list">']
             for client_id, firstname, lastname in size_none_orders_info:
                 formatted_htmls.append(
@@ -344,7 +368,7 @@ class BillingSummaryView(
 
 
 class BillingOrdersView(
-    LoginRequiredMixin, PermissionRequiredMixin, generic.DetailView
+    LoginRequiredMixin, PermissionRequiredMixin, ReportingMixin, generic.DetailView
 ):
     # Display orders detail of billing
     model = Billing
@@ -371,25 +395,30 @@ class BillingOrdersView(
                     ),
                 )
             ),
-        )
+        ),
+        Prefetch(
+            "archived_orders",
+            queryset=ArchivedOrder.objects.all()
+            .select_related("client__member")
+            .prefetch_related("orders"),
+        ),
     )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
+        all_orders = self.object.get_orders()
         if self.request.GET.get("client"):
             # has ?client=client_id
             client_id = int(self.request.GET["client"])
-            orders = self.object.orders.filter(client__id=client_id)
+            orders = [o for o in all_orders if o.client_id == client_id]
             context["orders"] = orders
             context["client"] = Client.objects.get(id=client_id)
         else:
-            context["orders"] = self.object.orders.all()
+            context["orders"] = all_orders
 
         context["total_amount"] = sum(map(lambda o: o.price, context["orders"]))
-        context["clients"] = list(
-            set(map(lambda o: o.client, self.object.orders.all()))
-        )
+        context["clients"] = list(set(map(lambda o: o.client, all_orders)))
         return context
 
 
@@ -7,5 +7,7 @@ for line in `cat /etc/souschef.conf`; do export $line; done
 
 MANAGE_CMD="/opt/pipx/venvs/gunicorn/bin/python /opt/pipx/venvs/gunicorn/lib/python3.13/site-packages/souschef/manage.py"
 
-$MANAGE_CMD processscheduledstatuschange 2>&1 | tee /var/log/souschef.processscheduledstatuschange.log
-$MANAGE_CMD setordersdelivered $(date --date="yesterday" +"%Y-%m-%d") 2>&1 | tee /var/log/souschef.setordersdelivered.log
+# All the daily tasks run in one process, see `manage.py daily --help`.
+# The JSON summary (duration and result of each task) is written to
+# /var/log/souschef.daily.json, the details to /var/log/souschef.daily.log.
+$MANAGE_CMD daily --output /var/log/souschef.daily.json 2>&1 | tee /var/log/souschef.daily.log
@@ -0,0 +1,122 @@
+"""
+Streaming CSV import shared by the data migration commands.
+
+The file is read in chunks of rows, twice: a validation pass reporting the
+invalid rows, then the import pass writing the valid rows of each chunk with
+a few bulk queries. The objects the rows refer to (members by `mid`,
+routes by name...) are resolved through in-memory maps loaded once, so that
+no query is run per row.
+"""
+
+import csv
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+
+def bulk_create_with_ids(model, objs, batch_size=None):
+    """
+    `bulk_create` that sets the primary keys beforehand, since MySQL does
+    not return them. The new objects can then be referenced right away.
+    """
+    next_id = (model.objects.aggregate(Max("id"))["id__max"] or 0) + 1
+    for i, obj in enumerate(objs):
+        obj.id = next_id + i
+    return model.objects.bulk_create(objs, batch_size=batch_size)
+
+
+def read_chunks(path, chunk_size, delimiter=";"):
+    """
+    The rows of the CSV file, as lists of `(line number, row)` of at most
+    `chunk_size` rows.
+    """
+    with open(path) as f:
+        rows = enumerate(csv.reader(f, delimiter=delimiter), start=1)
+        while chunk := list(islice(rows, chunk_size)):
+            yield chunk
+
+
+class ImportCommand(BaseCommand):
+    """
+    Base of the commands importing a CSV export of the previous system.
+
+    Subclasses set `default_file` and `mock_file` and implement
+    `validate_row` and `import_rows`, `load_maps` if they refer to
+    existing objects, and `prepare_import` if they need to create some
+    first.
+    """
+
+    default_file = None
+    mock_file = None
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=False,
+            help="Import mock data instead of actual data",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only validate the file, without importing it.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            default=1000,
+            type=int,
+            help="The number of rows imported at once.",
+        )
+
+    def handle(self, *args, **options):
+        path = self.mock_file if options["file"] else self.default_file
+        chunk_size = options["chunk_size"]
+        start = time.perf_counter()
+
+        self.load_maps()
+        rows_count = 0
+        errors_count = 0
+        for chunk in read_chunks(path, chunk_size):
+            for line, row in chunk:
+                rows_count += 1
+                error = self.validate_row(row)
+                if error:
+                    errors_count += 1
+                    self.stdout.write(self.style.WARNING(f"Line {line}: {error}"))
+        if options["dry_run"]:
+            self.stdout.write(
+                f"{rows_count} rows validated, {errors_count} in error, "
+                f"in {time.perf_counter() - start:.2f}s."
+            )
+            return
+
+        imported = 0
+        with transaction.atomic():
+            self.prepare_import()
+            for chunk in read_chunks(path, chunk_size):
+                rows = [row for _line, row in chunk if not self.validate_row(row)]
+                self.import_rows(rows)
+                imported += len(rows)
+        duration = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{imported} rows imported, {errors_count} skipped, in "
+                f"{duration:.2f}s ({imported / max(duration, 0.001):.0f} rows/s)."
+            )
+        )
+
+    def load_maps(self):
+        """Load the maps used to resolve the references of the rows."""
+
+    def prepare_import(self):
+        """Create the objects needed by the import, skipped by the dry runs."""
+
+    def validate_row(self, row):
+        """Return the error of the row, or None if it can be imported."""
+        raise NotImplementedError
+
+    def import_rows(self, rows):
+        """Import the valid rows of a chunk."""
+        raise NotImplementedError
@@ -1,7 +1,4 @@
-import csv
-
-from django.core.management.base import BaseCommand
-
+from souschef.datamigration.importer import ImportCommand, bulk_create_with_ids
 from souschef.member.models import (
     EMAIL,
     HOME,
@@ -11,9 +8,12 @@ from souschef.member.models import (
 )
 
 
-class Command(BaseCommand):
+class Command(ImportCommand):
     help = "Data: import clients from given csv file."
 
+    default_file = "clients_address.csv"
+    mock_file = "mock_addresses.csv"
+
     ROW_MID = 0
     ROW_ADDRESS1 = 3
     ROW_APARTMENT = 4
@@ -22,44 +22,51 @@ class Command(BaseCommand):
     ROW_PHONE = 7
     ROW_EMAIL = 8
 
-    def add_arguments(self, parser):
-        parser.add_argument(
-            "--file",
-            default=False,
-            help="Import mock data instead of actual data",
+    def load_maps(self):
+        self.member_ids = dict(
+            Member.objects.filter(mid__isnull=False).values_list("mid", "id")
         )
 
-    def handle(self, *args, **options):
-        file = "mock_addresses.csv" if options["file"] else "clients_address.csv"
+    def validate_row(self, row):
+        if len(row) <= self.ROW_EMAIL:
+            return "Missing columns."
+        if not row[self.ROW_MID].isdigit() or (
+            int(row[self.ROW_MID]) not in self.member_ids
+        ):
+            return "Non existing member"
+        return None
 
-        with open(file) as f:
-            reader = csv.reader(f, delimiter=";")
-            for row in reader:
-                try:
-                    member = Member.objects.get(mid=row[self.ROW_MID])
-                    # if member.address is not None:
-                    #    member.address.delete()
-                    address = Address.objects.create(
-                        street=row[self.ROW_ADDRESS1],
-                        apartment=row[self.ROW_APARTMENT],
-                        city=row[self.ROW_CITY],
-                        postal_code=row[self.ROW_POSTAL_CODE],
-                    )
+    def import_rows(self, rows):
+        # The last row of a member wins.
+        rows = {self.member_ids[int(row[self.ROW_MID])]: row for row in rows}
 
-                    member.address = address
-                    member.save()
-
-                    contacts = Contact.objects.filter(member=member)
-                    contacts.delete()
-
-                    if row[self.ROW_PHONE] != "":
-                        Contact.objects.create(
-                            type=HOME, value=row[self.ROW_PHONE], member=member
-                        )
-                    if row[self.ROW_EMAIL] != "":
-                        Contact.objects.create(
-                            type=EMAIL, value=row[self.ROW_EMAIL], member=member
-                        )
+        addresses = {
+            member_id: Address(
+                street=row[self.ROW_ADDRESS1],
+                apartment=row[self.ROW_APARTMENT],
+                city=row[self.ROW_CITY],
+                postal_code=row[self.ROW_POSTAL_CODE],
+            )
+            for member_id, row in rows.items()
+        }
+        bulk_create_with_ids(Address, list(addresses.values()))
+        Member.objects.bulk_update(
+            [
+                Member(id=member_id, address=address)
+                for member_id, address in addresses.items()
+            ],
+            ["address"],
+        )
 
-                except Member.DoesNotExist:
-                    self.stdout.write(self.style.WARNING("Non existing member"))
+        Contact.objects.filter(member__in=rows).delete()
+        contacts = []
+        for member_id, row in rows.items():
+            if row[self.ROW_PHONE] != "":
+                contacts.append(
+                    Contact(type=HOME, value=row[self.ROW_PHONE], member_id=member_id)
+                )
+            if row[self.ROW_EMAIL] != "":
+                contacts.append(
+                    Contact(type=EMAIL, value=row[self.ROW_EMAIL], member_id=member_id)
+                )
+        Contact.objects.bulk_create(contacts)
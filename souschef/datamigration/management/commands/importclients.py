@@ -1,19 +1,23 @@
-import csv
 from datetime import date
 
 from django.core.management import call_command
-from django.core.management.base import BaseCommand
+from django.utils import timezone
 
+from souschef.datamigration.importer import ImportCommand, bulk_create_with_ids
 from souschef.member.models import (
     Client,
+    ClientStatusInterval,
     Member,
     Route,
 )
 
 
-class Command(BaseCommand):
+class Command(ImportCommand):
     help = "Data: import clients from given csv file."
 
+    default_file = "clients.csv"
+    mock_file = "mock_clients.csv"
+
     ROW_MID = 0
     ROW_FIRSTNAME = 1
     ROW_LASTNAME = 2
@@ -28,72 +32,106 @@ class Command(BaseCommand):
     ROW_DELIVERY_TYPE = 11
     ROW_ROUTE = 12
 
-    def add_arguments(self, parser):
-        parser.add_argument(
-            "--file",
-            default=False,
-            help="Import mock data instead of actual data",
+    CLIENT_FIELDS = [
+        "billing_member",
+        "birthdate",
+        "status",
+        "gender",
+        "alert",
+        "delivery_type",
+        "delivery_note",
+        "route",
+        "language",
+        "rate_type",
+    ]
+
+    def load_maps(self):
+        self.member_ids = dict(
+            Member.objects.filter(mid__isnull=False).values_list("mid", "id")
         )
+        self.client_ids = dict(Client.objects.values_list("member_id", "id"))
 
-    def handle(self, *args, **options):
+    def prepare_import(self):
         # Load fixtures for the routes
         fixture_filename = "routes.json"
         call_command("loaddata", fixture_filename)
 
-        file = "mock_clients.csv" if options["file"] else "clients.csv"
-
-        with open(file) as f:
-            reader = csv.reader(f, delimiter=";")
-            for row in reader:
-                row_created = (
-                    row[self.ROW_CREATED]
-                    if row[self.ROW_CREATED] != ""
-                    else date.today()
-                )
-
-                member, created = Member.objects.update_or_create(
-                    mid=row[self.ROW_MID],
-                    defaults={
-                        "firstname": row[self.ROW_FIRSTNAME],
-                        "lastname": row[self.ROW_LASTNAME],
-                        "updated_at": row_created,
-                    },
+        self.routes = {route.name: route for route in Route.objects.all()}
+
+    def validate_row(self, row):
+        if len(row) <= self.ROW_ROUTE:
+            return "Missing columns."
+        try:
+            int(row[self.ROW_MID])
+            date.fromisoformat(row[self.ROW_BIRTHDATE])
+            if row[self.ROW_CREATED]:
+                date.fromisoformat(row[self.ROW_CREATED])
+        except ValueError as e:
+            return f"Invalid value: {e}."
+        return None
+
+    def import_rows(self, rows):
+        # The last row of a member wins.
+        rows = {int(row[self.ROW_MID]): row for row in rows}
+
+        now = timezone.now()
+        members = []
+        for mid, row in rows.items():
+            member = Member(
+                id=self.member_ids.get(mid),
+                mid=mid,
+                firstname=row[self.ROW_FIRSTNAME],
+                lastname=row[self.ROW_LASTNAME],
+                # Override creation date
+                created_at=row[self.ROW_CREATED] or date.today(),
+                updated_at=now,
+            )
+            member.update_search_key()
+            members.append(member)
+        new_members = [m for m in members if m.id is None]
+        bulk_create_with_ids(Member, new_members)
+        for member in new_members:
+            # `bulk_create` sets `created_at` to now.
+            member.created_at = rows[member.mid][self.ROW_CREATED] or date.today()
+        Member.objects.bulk_update(
+            members,
+            ["firstname", "lastname", "search_key", "created_at", "updated_at"],
+        )
+        self.member_ids.update((m.mid, m.id) for m in new_members)
+
+        clients = []
+        for member in members:
+            row = rows[member.mid]
+            route = self.routes.get(row[self.ROW_ROUTE])
+            if route is None:
+                self.routes[row[self.ROW_ROUTE]] = Route.objects.create(
+                    name=row[self.ROW_ROUTE]
                 )
-
-                route, created = Route.objects.get_or_create(name=row[self.ROW_ROUTE])
-                if created:
-                    err_msg = "A new route has been created."
-                    self.stdout.write(self.style.WARNING(err_msg))
-                    route = None
-
-                client, created = Client.objects.update_or_create(
+                err_msg = "A new route has been created."
+                self.stdout.write(self.style.WARNING(err_msg))
+            clients.append(
+                Client(
+                    id=self.client_ids.get(member.id),
                     member=member,
-                    defaults={
-                        "billing_member": member,
-                        "birthdate": row[self.ROW_BIRTHDATE],
-                        "status": row[self.ROW_STATUS],
-                        "gender": row[self.ROW_GENDER],
-                        "alert": row[self.ROW_ALERT],
-                        "delivery_type": row[self.ROW_DELIVERY_TYPE],
-                        "delivery_note": row[self.ROW_DELIVERY_NOTES],
-                        "route": route,
-                        "language": row[self.ROW_LANG],
-                        "rate_type": row[self.ROW_RATE_TYPE],
-                    },
+                    billing_member=member,
+                    birthdate=row[self.ROW_BIRTHDATE],
+                    status=row[self.ROW_STATUS],
+                    gender=row[self.ROW_GENDER],
+                    alert=row[self.ROW_ALERT],
+                    delivery_type=row[self.ROW_DELIVERY_TYPE],
+                    delivery_note=row[self.ROW_DELIVERY_NOTES],
+                    route=route,
+                    language=row[self.ROW_LANG],
+                    rate_type=row[self.ROW_RATE_TYPE],
                 )
-
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        "{} successfully {}.".format(
-                            client, "created" if created else "updated"
-                        )
-                    )
-                )
-
-                # Override creation date
-                client.member.created_at = row_created
-
-                client.member.save()
-
-                # Add Client option meals_schedule
-                # client.set_simple_meals_schedule([])
+            )
+        new_clients = [c for c in clients if c.id is None]
+        Client.objects.bulk_update(
+            [c for c in clients if c.id is not None], self.CLIENT_FIELDS
+        )
+        bulk_create_with_ids(Client, new_clients)
+        self.client_ids.update((c.member_id, c.id) for c in new_clients)
+        # The bulk queries do not send the `post_save` signals.
+        ClientStatusInterval.objects.record_changes(
+            (c.id, c.status, date.today()) for c in clients
+        )
@@ -1,16 +1,14 @@
-import csv
-
-from django.core.management.base import BaseCommand
+import json
 
+from souschef.datamigration.importer import ImportCommand
 from souschef.member.models import (
     Client,
     Client_option,
-    Member,
     Option,
 )
 
 
-class Command(BaseCommand):
+class Command(ImportCommand):
     """
     **Warning!**
     This command has been modified without keeping trace of why a long time
@@ -20,6 +18,9 @@ class Command(BaseCommand):
 
     help = "Data: import clients relationships from given csv file."
 
+    default_file = "clients_meals.csv"
+    mock_file = "mock_meals.csv"
+
     ROW_MID = 0
     ROW_MON = 1
     ROW_TUE = 2
@@ -32,81 +33,102 @@ class Command(BaseCommand):
     ROW_MLABEL = 9
     ROW_ING_BEEF = 10
 
-    def add_arguments(self, parser):
-        parser.add_argument(
-            "--file",
-            default=False,
-            help="Import mock data instead of actual data",
+    DAYS = [ROW_MON, ROW_TUE, ROW_WED, ROW_THU, ROW_FRI, ROW_SAT]
+
+    def load_maps(self):
+        self.food_prep_puree = Option.objects.get(name="Puree all")
+        self.food_prep_cut = Option.objects.get(name="Cut up meat")
+        self.client_ids = dict(
+            Client.objects.filter(member__mid__isnull=False).values_list(
+                "member__mid", "id"
+            )
         )
 
-    def handle(self, *args, **options):
-        file = "mock_meals.csv" if options["file"] else "clients_meals.csv"
+    def prepare_import(self):
+        self.meals_schedule, _ = Option.objects.get_or_create(name="meals_schedule")
 
-        food_prep_puree = Option.objects.get(name="Puree all")
-        food_prep_cut = Option.objects.get(name="Cut up meat")
+    def get_preferences_column(self, day):
+        delivery_day = day - 1
+        # Hack: there is no column Thursday in the csv file
+        if delivery_day > 3:
+            delivery_day -= 1
+        return 11 + (delivery_day * 10)
 
-        with open(file) as f:
-            reader = csv.reader(f, delimiter=";")
-            for row in reader:
+    def validate_row(self, row):
+        if len(row) <= self.ROW_ING_BEEF:
+            return "Missing columns."
+        if not row[self.ROW_MID].isdigit() or (
+            int(row[self.ROW_MID]) not in self.client_ids
+        ):
+            return "Non existing client"
+        for day in self.DAYS:
+            if row[day] != "":
+                column = self.get_preferences_column(day)
+                if len(row) <= column + 6:
+                    return f"Missing the meals preferences of {row[day]}."
                 try:
-                    member = Member.objects.get(mid=row[self.ROW_MID])
-                    client = Client.objects.get(member=member)
-                    days = [
-                        self.ROW_MON,
-                        self.ROW_TUE,
-                        self.ROW_WED,
-                        self.ROW_THU,
-                        self.ROW_FRI,
-                        self.ROW_SAT,
-                    ]
-                    meals_schedule = []
-                    prefs = {}
-
-                    for day in days:
-                        if row[day] != "":
-                            meals_schedule.append(row[day])
-                            delivery_day = day - 1
-                            # Hack: there is no column Thursday in the csv file
-                            if delivery_day > 3:
-                                delivery_day -= 1
-
-                            prefs["size_" + row[day]] = row[
-                                11 + (delivery_day * 10) + 1
-                            ]
-                            prefs["main_dish_" + row[day] + "_quantity"] = int(
-                                row[11 + (delivery_day * 10) + 0]
-                            )
-                            prefs["dessert_" + row[day] + "_quantity"] = int(
-                                row[11 + (delivery_day * 10) + 5]
-                            )
-                            prefs["fruit_salad_" + row[day] + "_quantity"] = int(
-                                row[11 + (delivery_day * 10) + 2]
-                            )
-                            prefs["green_salad_" + row[day] + "_quantity"] = int(
-                                row[11 + (delivery_day * 10) + 3]
-                            )
-                            prefs["pudding_" + row[day] + "_quantity"] = int(
-                                row[11 + (delivery_day * 10) + 6]
-                            )
-                            prefs["diabetic_" + row[day] + "_quantity"] = int(
-                                row[11 + (delivery_day * 10) + 4]
-                            )
-
-                    client.set_simple_meals_schedule(meals_schedule)
-                    client.meal_default_week = prefs
-                    client.save()
-
-                    # Food preparation
-                    if row[self.ROW_FOOD_PREP_CUT] == "1":
-                        Client_option.objects.create(
-                            client=client, option=food_prep_cut
-                        )
-                    if row[self.ROW_FOOD_PREP_PUREE] == "1":
-                        Client_option.objects.create(
-                            client=client, option=food_prep_puree
-                        )
-
-                except Member.DoesNotExist:
-                    self.stdout.write(self.style.WARNING("Non existing member"))
-                except Client.DoesNotExist:
-                    self.stdout.write(self.style.WARNING("Non existing client"))
+                    for i in (0, 2, 3, 4, 5, 6):
+                        int(row[column + i])
+                except ValueError as e:
+                    return f"Invalid value: {e}."
+        return None
+
+    def import_rows(self, rows):
+        clients = []
+        schedules = {}
+        client_options = []
+        for row in rows:
+            client = Client(id=self.client_ids[int(row[self.ROW_MID])])
+            meals_schedule = []
+            prefs = {}
+
+            for day in self.DAYS:
+                if row[day] != "":
+                    meals_schedule.append(row[day])
+                    column = self.get_preferences_column(day)
+
+                    prefs["size_" + row[day]] = row[column + 1]
+                    prefs["main_dish_" + row[day] + "_quantity"] = int(row[column + 0])
+                    prefs["dessert_" + row[day] + "_quantity"] = int(row[column + 5])
+                    prefs["fruit_salad_" + row[day] + "_quantity"] = int(
+                        row[column + 2]
+                    )
+                    prefs["green_salad_" + row[day] + "_quantity"] = int(
+                        row[column + 3]
+                    )
+                    prefs["pudding_" + row[day] + "_quantity"] = int(row[column + 6])
+                    prefs["diabetic_" + row[day] + "_quantity"] = int(row[column + 4])
+
+            client.meal_default_week = prefs
+            clients.append(client)
+            schedules[client.id] = json.dumps(meals_schedule)
+
+            # Food preparation
+            if row[self.ROW_FOOD_PREP_CUT] == "1":
+                client_options.append(
+                    Client_option(client=client, option=self.food_prep_cut)
+                )
+            if row[self.ROW_FOOD_PREP_PUREE] == "1":
+                client_options.append(
+                    Client_option(client=client, option=self.food_prep_puree)
+                )
+
+        Client.objects.bulk_update(clients, ["meal_default_week"])
+
+        # See `Client.set_simple_meals_schedule`.
+        existing = list(
+            Client_option.objects.filter(
+                client__in=schedules, option=self.meals_schedule
+            )
+        )
+        # Including the duplicated options of a client.
+        for client_option in existing:
+            client_option.value = schedules[client_option.client_id]
+        Client_option.objects.bulk_update(existing, ["value"])
+        configured = {client_option.client_id for client_option in existing}
+        client_options.extend(
+            Client_option(client_id=client_id, option=self.meals_schedule, value=value)
+            for client_id, value in schedules.items()
+            if client_id not in configured
+        )
+        Client_option.objects.bulk_create(client_options)
@@ -1,17 +1,20 @@
-import csv
+from datetime import date
 
-from django.core.management.base import BaseCommand
-
-from souschef.member.models import (
-    Client,
-    Member,
+from souschef.datamigration.importer import ImportCommand, bulk_create_with_ids
+from souschef.member.models import Client
+from souschef.order.models import (
+    Order,
+    Order_item,
+    make_order_items,
 )
-from souschef.order.models import Order
 
 
-class Command(BaseCommand):
+class Command(ImportCommand):
     help = "Data: import clients relationships from given csv file."
 
+    default_file = "clients_orders.csv"
+    mock_file = "mock_orders.csv"
+
     ROW_MID = 0
     ROW_DATE = 1
     ROW_STATUS = 2
@@ -23,44 +26,56 @@ class Command(BaseCommand):
     ROW_DESSERT = 8
     ROW_PUDDING = 9
 
-    def add_arguments(self, parser):
-        parser.add_argument(
-            "--file",
-            default=False,
-            help="Import mock data instead of actual data",
-        )
-
-    def handle(self, *args, **options):
-        file = "mock_orders.csv" if options["file"] else "clients_orders.csv"
+    def load_maps(self):
+        # Only the rate type is needed to price the items.
+        self.clients = {
+            client.member.mid: client
+            for client in Client.objects.filter(member__mid__isnull=False)
+            .select_related("member")
+            .only("rate_type", "member__mid")
+        }
 
-        with open(file) as f:
-            reader = csv.reader(f, delimiter=";")
-            for row in reader:
-                try:
-                    member = Member.objects.get(mid=row[self.ROW_MID])
-                    client = Client.objects.get(member=member)
-                    delivery_date = row[self.ROW_DATE]
-                    items = {
-                        "main_dish_default_quantity": int(
-                            row[self.ROW_MAIN_DISH_QUANTITY]
-                        ),
-                        "dessert_default_quantity": int(row[self.ROW_DESSERT]),
-                        "diabetic_default_quantity": int(
-                            row[self.ROW_DIABETIC_DESSERT]
-                        ),
-                        "fruit_salad_default_quantity": int(row[self.ROW_FRUIT_SALAD]),
-                        "green_salad_default_quantity": int(row[self.ROW_GREEN_SALAD]),
-                        "pudding_default_quantity": int(row[self.ROW_PUDDING]),
-                        "compote_default_quantity": 0,
-                        "size_default": row[self.ROW_SIZE],
-                    }
+    def validate_row(self, row):
+        if len(row) <= self.ROW_PUDDING:
+            return "Missing columns."
+        if not row[self.ROW_MID].isdigit() or (
+            int(row[self.ROW_MID]) not in self.clients
+        ):
+            return "Non existing client"
+        try:
+            date.fromisoformat(row[self.ROW_DATE])
+            for column in range(self.ROW_MAIN_DISH_QUANTITY, self.ROW_PUDDING + 1):
+                if column != self.ROW_SIZE:
+                    int(row[column])
+        except ValueError as e:
+            return f"Invalid value: {e}."
+        return None
 
-                    order = Order.objects.create_order(delivery_date, client, items)
-
-                    order.status = row[self.ROW_STATUS]
-                    order.save()
-
-                except Member.DoesNotExist:
-                    self.stdout.write(self.style.WARNING("Non existing member"))
-                except Client.DoesNotExist:
-                    self.stdout.write(self.style.WARNING("Non existing client"))
+    def import_rows(self, rows):
+        orders = []
+        items = []
+        for row in rows:
+            order = Order(
+                client=self.clients[int(row[self.ROW_MID])],
+                delivery_date=row[self.ROW_DATE],
+                status=row[self.ROW_STATUS],
+            )
+            orders.append(order)
+            items.append(
+                {
+                    "main_dish_default_quantity": int(row[self.ROW_MAIN_DISH_QUANTITY]),
+                    "dessert_default_quantity": int(row[self.ROW_DESSERT]),
+                    "diabetic_default_quantity": int(row[self.ROW_DIABETIC_DESSERT]),
+                    "fruit_salad_default_quantity": int(row[self.ROW_FRUIT_SALAD]),
+                    "green_salad_default_quantity": int(row[self.ROW_GREEN_SALAD]),
+                    "pudding_default_quantity": int(row[self.ROW_PUDDING]),
+                    "compote_default_quantity": 0,
+                    "size_default": row[self.ROW_SIZE],
+                }
+            )
+        bulk_create_with_ids(Order, orders)
+        Order_item.objects.bulk_create(
+            order_item
+            for order, order_items in zip(orders, items)
+            for order_item in make_order_items(order, order_items)
+        )
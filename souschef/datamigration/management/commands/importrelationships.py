@@ -1,8 +1,6 @@
-import csv
 from datetime import date
 
-from django.core.management.base import BaseCommand
-
+from souschef.datamigration.importer import ImportCommand, bulk_create_with_ids
 from souschef.member.models import (
     Client,
     Member,
@@ -10,9 +8,12 @@ from souschef.member.models import (
 )
 
 
-class Command(BaseCommand):
+class Command(ImportCommand):
     help = "Data: import clients relationships from given csv file."
 
+    default_file = "clients_relationships.csv"
+    mock_file = "mock_relationships.csv"
+
     ROW_MID = 0
     ROW_RID = 1
     ROW_FIRSTNAME = 2
@@ -29,65 +30,79 @@ class Command(BaseCommand):
     ROW_CITY = 13
     ROW_PHONE = 14
 
-    def add_arguments(self, parser):
-        parser.add_argument(
-            "--file",
-            default=False,
-            help="Import mock data instead of actual data",
+    def load_maps(self):
+        self.client_ids = dict(
+            Client.objects.filter(member__mid__isnull=False).values_list(
+                "member__mid", "id"
+            )
+        )
+        self.member_ids = dict(
+            Member.objects.filter(rid__isnull=False).values_list("rid", "id")
         )
 
-    def handle(self, *args, **options):
-        if options["file"]:
-            file = "mock_relationships.csv"
-        else:
-            file = "clients_relationships.csv"
-
-        with open(file) as f:
-            reader = csv.reader(f, delimiter=";")
-            for row in reader:
-                try:
-                    member = Member.objects.get(mid=row[self.ROW_MID])
-                    client = Client.objects.get(member=member)
+    def validate_row(self, row):
+        if len(row) <= self.ROW_REASON:
+            return "Missing columns."
+        if not row[self.ROW_MID].isdigit() or (
+            int(row[self.ROW_MID]) not in self.client_ids
+        ):
+            return "Non existing client"
+        if row[self.ROW_FIRSTNAME] != "" and not row[self.ROW_RID].isdigit():
+            return f"Invalid relationship id: {row[self.ROW_RID]}."
+        return None
 
-                    if row[self.ROW_FIRSTNAME] != "":
-                        relationship, created = Member.objects.update_or_create(
-                            rid=row[self.ROW_RID],
-                            defaults={
-                                "firstname": row[self.ROW_FIRSTNAME],
-                                "lastname": row[self.ROW_LASTNAME],
-                                "work_information": row[self.ROW_WORK_INFORMATION],
-                            },
-                        )
+    def import_rows(self, rows):
+        rows = [row for row in rows if row[self.ROW_FIRSTNAME] != ""]
 
-                        type_of_relation = []
-                        extra_fields = {}
-                        if row[self.ROW_REFERENT] == "1":
-                            type_of_relation.append(Relationship.REFERENT)
-                            extra_fields["referral_reason"] = row[self.ROW_REASON]
-                            extra_fields["referral_date"] = str(date.today())
-                        if row[self.ROW_EMERGENCY] == "1":
-                            type_of_relation.append(Relationship.EMERGENCY)
+        # The last row of a relationship wins.
+        members = {}
+        for row in rows:
+            rid = int(row[self.ROW_RID])
+            member = Member(
+                id=self.member_ids.get(rid),
+                rid=rid,
+                firstname=row[self.ROW_FIRSTNAME],
+                lastname=row[self.ROW_LASTNAME],
+                work_information=row[self.ROW_WORK_INFORMATION],
+            )
+            member.update_search_key()
+            members[rid] = member
+        Member.objects.bulk_update(
+            [m for m in members.values() if m.id is not None],
+            ["firstname", "lastname", "work_information", "search_key"],
+        )
+        new_members = [m for m in members.values() if m.id is None]
+        bulk_create_with_ids(Member, new_members)
+        self.member_ids.update((m.rid, m.id) for m in new_members)
 
-                        Relationship.objects.create(
-                            client=client,
-                            member=relationship,
-                            type=type_of_relation,
-                            nature=row[self.ROW_RELATIONSHIP],
-                            extra_fields=extra_fields,
-                        )
+        relationships = []
+        billed_clients = {}
+        for row in rows:
+            client_id = self.client_ids[int(row[self.ROW_MID])]
+            relationship = members[int(row[self.ROW_RID])]
 
-                        self.stdout.write(
-                            self.style.SUCCESS("Added a new Relationship.")
-                        )
+            type_of_relation = []
+            extra_fields = {}
+            if row[self.ROW_REFERENT] == "1":
+                type_of_relation.append(Relationship.REFERENT)
+                extra_fields["referral_reason"] = row[self.ROW_REASON]
+                extra_fields["referral_date"] = str(date.today())
+            if row[self.ROW_EMERGENCY] == "1":
+                type_of_relation.append(Relationship.EMERGENCY)
 
-                        if row[self.ROW_BILLTO] == "1":
-                            self.stdout.write(
-                                self.style.SUCCESS("Added a blling Relationship.")
-                            )
-                            client.billing_member = relationship
-                            client.save()
+            relationships.append(
+                Relationship(
+                    client_id=client_id,
+                    member=relationship,
+                    type=type_of_relation,
+                    nature=row[self.ROW_RELATIONSHIP],
+                    extra_fields=extra_fields,
+                )
+            )
 
-                except Member.DoesNotExist:
-                    self.stdout.write(self.style.WARNING("Non existing member"))
-                except Client.DoesNotExist:
-                    self.stdout.write(self.style.WARNING("Non existing client"))
+            if row[self.ROW_BILLTO] == "1":
+                billed_clients[client_id] = Client(
+                    id=client_id, billing_member=relationship
+                )
+        Relationship.objects.bulk_create(relationships)
+        Client.objects.bulk_update(billed_clients.values(), ["billing_member"])
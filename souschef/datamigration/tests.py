@@ -1,4 +1,5 @@
 from datetime import date
+from io import StringIO
 
 from django.core.management import call_command
 from django.test import TestCase
@@ -6,8 +7,11 @@ from django.test import TestCase
 from souschef.member.models import (
     Address,
     Client,
+    Client_option,
     Member,
+    Option,
     Relationship,
+    Route,
 )
 from souschef.order.models import Order
 
@@ -52,6 +56,21 @@ class ImportMemberTestCase(TestCase):
         self.assertEqual(Client.pending.all().count(), 1)
         self.assertEqual(Client.contact.all().count(), 6)
 
+    def test_import_again(self):
+        """
+        Importing the file again updates the members and the clients, in
+        chunks.
+        """
+        Member.objects.filter(mid=94).update(firstname="Dot")
+        call_command(
+            "importclients", file="mock_clients.csv", chunk_size=3, stdout=StringIO()
+        )
+        self.assertEqual(10, Client.objects.all().count())
+        self.assertEqual(10, Member.objects.all().count())
+        dorothy = Member.objects.get(mid=94)
+        self.assertEqual(dorothy.firstname, "Dorothy")
+        self.assertEqual(dorothy.search_key, "dorothy davis")
+
     def test_import_member_routes(self):
         self.assertEqual(Client.objects.filter(route__name="McGill").count(), 2)
         self.assertEqual(Client.objects.filter(route__name="Westmount").count(), 2)
@@ -195,3 +214,80 @@ class ImportMemberOrdersTestCase(TestCase):
         self.assertEqual(diabetic_dessert.total_quantity, 1)
         dessert = items.get(component_group="dessert")
         self.assertEqual(dessert.total_quantity, 1)
+
+
+class ImportMemberMealsTestCase(TestCase):
+    """
+    Test data importation.
+    """
+
+    fixtures = ["routes.json"]
+
+    @classmethod
+    def setUpTestData(cls):
+        Option.objects.create(name="Puree all", option_group="preparation")
+        Option.objects.create(name="Cut up meat", option_group="preparation")
+        call_command("importclients", file="mock_clients.csv")
+
+    def test_import_meals(self):
+        """
+        The rows with delivery days miss their meals preferences in the
+        mock file: only the others are imported.
+        """
+        out = StringIO()
+        call_command("importmeals", file="mock_meals.csv", stdout=out)
+        self.assertIn(
+            "Line 1: Missing the meals preferences of monday.", out.getvalue()
+        )
+        dorothy = Client.objects.get(member__mid=94)
+        self.assertEqual(dorothy.simple_meals_schedule, [])
+        self.assertEqual(
+            set(
+                Client_option.objects.filter(
+                    client=dorothy, option__option_group="preparation"
+                ).values_list("option__name", flat=True)
+            ),
+            {"Puree all", "Cut up meat"},
+        )
+
+    def test_import_meals_duplicated_schedule(self):
+        """The duplicated meals schedules of a client are all updated."""
+        dorothy = Client.objects.get(member__mid=94)
+        option, _ = Option.objects.get_or_create(name="meals_schedule")
+        Client_option.objects.bulk_create(
+            Client_option(client=dorothy, option=option, value='["monday"]')
+            for _ in range(2)
+        )
+        call_command("importmeals", file="mock_meals.csv", stdout=StringIO())
+        self.assertEqual(
+            ["[]", "[]"],
+            list(
+                Client_option.objects.filter(client=dorothy, option=option).values_list(
+                    "value", flat=True
+                )
+            ),
+        )
+
+
+class ImportDryRunTestCase(TestCase):
+    """
+    Test data validation.
+    """
+
+    def test_dry_run(self):
+        """
+        A dry run reports the invalid rows, and imports nothing.
+        """
+        out = StringIO()
+        call_command("importorders", file="mock_orders.csv", dry_run=True, stdout=out)
+        self.assertIn("Line 1: Non existing client", out.getvalue())
+        self.assertIn("1 rows validated, 1 in error", out.getvalue())
+        self.assertFalse(Order.objects.exists())
+
+    def test_dry_run_without_fixtures(self):
+        """The routes of the client import are not loaded by a dry run."""
+        out = StringIO()
+        call_command("importclients", file="mock_clients.csv", dry_run=True, stdout=out)
+        self.assertIn("rows validated", out.getvalue())
+        self.assertFalse(Route.objects.exists())
+        self.assertFalse(Client.objects.exists())
@@ -1,12 +1,15 @@
 from django import forms
 from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
 
 from souschef.meal.constants import COMPONENT_GROUP_CHOICES_MAIN_DISH
 from souschef.meal.models import (
     Component,
     Ingredient,
 )
+from souschef.member.forms import ClientSequenceForm
+from souschef.member.models import DeliveryHistory
 
 
 class DishIngredientsForm(forms.Form):
@@ -36,8 +39,27 @@ class DishIngredientsForm(forms.Form):
         required=False,
     )
 
+    def __init__(self, *args, clashes=None, **kwargs):
+        """
+        `clashes` is the number of clashing clients by main dish id, shown
+        next to the name of each main dish.
+        """
+        super().__init__(*args, **kwargs)
+        if clashes is not None:
+            self.fields["maindish"].label_from_instance = lambda dish: ngettext(
+                "%(name)s (%(count)d clash)",
+                "%(name)s (%(count)d clashes)",
+                clashes.get(dish.id, 0),
+            ) % {"name": dish.name, "count": clashes.get(dish.id, 0)}
+
     def clean_sides_ingredients(self):
         data = self.cleaned_data["sides_ingredients"]
         if not data:
             raise forms.ValidationError(_("Please choose some Sides ingredients"))
         return data
+
+
+class DeliveryHistoryForm(ClientSequenceForm):
+    class Meta:
+        model = DeliveryHistory
+        fields = ["vehicle", "comments"]
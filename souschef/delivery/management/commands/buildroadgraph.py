@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from souschef.delivery import routing
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the OpenStreetMap extract of ROUTING_OSM_EXTRACT into the road "
+        "graphs of the vehicles, saved in ROUTING_GRAPH_DIR for the route "
+        "optimisation. To run again when the extract changes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--extract",
+            help="The .osm file to load instead of ROUTING_OSM_EXTRACT.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["extract"] or settings.ROUTING_OSM_EXTRACT
+        if not path:
+            raise CommandError(
+                "No extract: set SOUSCHEF_ROUTING_OSM_EXTRACT or use --extract."
+            )
+        for vehicle in routing.SPEEDS:
+            start = time.perf_counter()
+            try:
+                graph = routing.build_graph(vehicle, path)
+            except (OSError, routing.ElementTree.ParseError) as e:
+                raise CommandError(f"Cannot load the extract: {e}") from e
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{vehicle}: {len(graph)} nodes, {len(graph.targets)} edges, "
+                    f"in {time.perf_counter() - start:.2f}s."
+                )
+            )
@@ -0,0 +1,1092 @@
+"""
+PDF documents of the deliveries: route sheets, kitchen count report and meal
+labels.
+
+ReportLab and pylabels are slow to import, so this module is only imported
+by the views generating the documents, not when the URLs are loaded.
+"""
+
+from __future__ import annotations
+
+import os
+import textwrap
+from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import labels  # package pylabels
+from django.conf import settings
+from django.utils.translation import gettext
+from reportlab.lib import colors as rl_colors
+from reportlab.lib import enums as rl_enums
+from reportlab.lib import pagesizes
+from reportlab.lib.styles import ParagraphStyle as RLParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet as rl_getSampleStyleSheet
+from reportlab.lib.units import inch as rl_inch
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import PageBreak as RLPageBreak
+from reportlab.platypus import Paragraph as RLParagraph
+from reportlab.platypus import SimpleDocTemplate as RLSimpleDocTemplate
+from reportlab.platypus import Spacer as RLSpacer
+from reportlab.platypus import Table as RLTable
+from reportlab.platypus import TableStyle as RLTableStyle
+
+from souschef.delivery.meal_labels import MealLabel, draw_label, meal_label_fields
+from souschef.order.constants import SIZE_CHOICES_LARGE
+
+if TYPE_CHECKING:
+    from souschef.delivery.views import ComponentLine, MealLine, PreparationLine
+    from souschef.order.models import KitchenItem
+
+LOGO_IMAGE = os.path.join(
+    settings.BASE_DIR,
+    "160widthSR-Logo-Screen-PurpleGreen-HI-RGB1.jpg",
+)
+
+
+def _get_pdf_file_path(filename, delivery_date) -> Path:
+    delivery = delivery_date.strftime("%Y-%m-%d")
+    today = datetime.now().replace(microsecond=0).isoformat()
+    filepath = Path(filename)
+    new_name = f"{filepath.name.rstrip('.pdf')}_{delivery}__{today}.pdf"
+    return filepath.parent / delivery / new_name
+
+
+def get_meals_label_file_path(delivery_date):
+    return _get_pdf_file_path(settings.MEAL_LABELS_FILE, delivery_date)
+
+
+def get_kitchen_count_file_path(delivery_date):
+    return _get_pdf_file_path(settings.KITCHEN_COUNT_FILE, delivery_date)
+
+
+def get_route_sheets_file_path(delivery_date):
+    return _get_pdf_file_path(settings.ROUTE_SHEETS_FILE, delivery_date)
+
+
+# Route sheet report classes and functions.
+
+
+def defineStyles(my_styles):
+    """Define common styles for ReportLab objects.
+
+    Adds reportlab.lib.styles.ParagraphStyle objects to my_styles.
+
+    Args:
+        my_styles: A reportlab.lib.styles.StyleSheet1 object.
+    """
+    my_styles.add(
+        RLParagraphStyle(
+            name="SmallRight",
+            fontName="Helvetica",
+            fontSize=7,
+            alignment=rl_enums.TA_RIGHT,
+        )
+    )
+
+    my_styles.add(
+        RLParagraphStyle(
+            name="NormalLeft",
+            fontName="Helvetica",
+            fontSize=10,
+            alignment=rl_enums.TA_LEFT,
+        )
+    )
+    my_styles.add(
+        RLParagraphStyle(
+            name="NormalLeftBold",
+            fontName="Helvetica-Bold",
+            fontSize=10,
+            alignment=rl_enums.TA_LEFT,
+        )
+    )
+    my_styles.add(
+        RLParagraphStyle(
+            name="NormalCenter",
+            fontName="Helvetica",
+            fontSize=10,
+            alignment=rl_enums.TA_CENTER,
+        )
+    )
+    my_styles.add(
+        RLParagraphStyle(
+            name="NormalCenterBold",
+            fontName="Helvetica-Bold",
+            fontSize=10,
+            alignment=rl_enums.TA_CENTER,
+        )
+    )
+    my_styles.add(
+        RLParagraphStyle(
+            name="NormalRight",
+            fontName="Helvetica",
+            fontSize=10,
+            alignment=rl_enums.TA_RIGHT,
+        )
+    )
+    my_styles.add(
+        RLParagraphStyle(
+            name="NormalRightBold",
+            fontName="Helvetica-Bold",
+            fontSize=10,
+            alignment=rl_enums.TA_RIGHT,
+        )
+    )
+
+    my_styles.add(
+        RLParagraphStyle(
+            name="LargeLeft",
+            fontName="Helvetica",
+            fontSize=12,
+            alignment=rl_enums.TA_LEFT,
+        )
+    )
+    my_styles.add(
+        RLParagraphStyle(
+            name="LargeCenter",
+            fontName="Helvetica",
+            fontSize=12,
+            alignment=rl_enums.TA_CENTER,
+        )
+    )
+    my_styles.add(
+        RLParagraphStyle(
+            name="LargeRight",
+            fontName="Helvetica",
+            fontSize=12,
+            alignment=rl_enums.TA_RIGHT,
+        )
+    )
+    my_styles.add(
+        RLParagraphStyle(
+            name="LargeBoldLeft",
+            fontName="Helvetica-Bold",
+            fontSize=12,
+            alignment=rl_enums.TA_LEFT,
+        )
+    )
+    my_styles.add(
+        RLParagraphStyle(
+            name="LargeBoldRight",
+            fontName="Helvetica-Bold",
+            fontSize=12,
+            alignment=rl_enums.TA_RIGHT,
+        )
+    )
+
+    my_styles.add(
+        RLParagraphStyle(
+            name="VeryLargeBoldLeft",
+            fontName="Helvetica-Bold",
+            fontSize=14,
+            alignment=rl_enums.TA_LEFT,
+            spaceAfter=5,
+        )
+    )
+
+    my_styles.add(
+        RLParagraphStyle(
+            name="HugeBoldCenter",
+            fontName="Helvetica-Bold",
+            fontSize=20,
+            alignment=rl_enums.TA_CENTER,
+        )
+    )
+
+
+class MultiRouteReport:
+    """Namespace for Route sheet report data structures and logic.
+
+    This class is never instantiated.
+
+    Uses ReportLab see http://www.reportlab.com/documentation/faq/
+    """
+
+    # (class attribute) last page number on which a ReportLab Table has split
+    table_split = None
+
+    # (class attribute) report document instance
+    document = None
+
+    # (class attribute) page number on which route starts
+    route_start_page = None
+
+    class RLMultiRouteTable(RLTable):
+        """Custom table for route sheets that is monitored for table splits."""
+
+        def onSplit(self, table, **kwargs):
+            """Override method to detect table splits.
+
+            ReportLab calls this twice for each split :
+              first call has the table with rows that fit on current page,
+              second call has the table with the rest of the rows.
+            """
+            MultiRouteReport.table_split = MultiRouteReport.document.page
+            # @lamontfr 20170522 : Please do not remove, used for DEBUGGING
+            # print("onSplit **********************",
+            #       "page=", MultiRouteReport.document.page,
+            #       "FIRST CLIENT _cellvalues[1][0][0].text=",
+            #       repr(table._cellvalues[1][0][0].text),
+            #       "LAST CLIENT _cellvalues[-1][0][0].text=",
+            #       repr(table._cellvalues[-1][0][0].text),
+            # )
+            super().onSplit(table, **kwargs)
+
+    class RLMultiRouteDocTemplate(RLSimpleDocTemplate):
+        """Custom document template for route sheets having multiple tables."""
+
+        def __init__(self, *args, **kwargs):
+            """Init class and ensure that we have a page footer function.
+
+            Args:
+                *args
+                    (required)
+                        route_sheets_file : string, a file name.
+                **kwargs
+                    (required)
+                        footerFunc : callable, draws the footer.
+                    (optional, see also reportlab SimpleDocTemplate)
+                        leftMargin : integer, inches.
+                        rightMargin : integer, inches.
+                        bottomMargin : integer, inches.
+            """
+            try:
+                self.footerFunc = kwargs.pop("footerFunc")
+            except KeyError as e:
+                raise KeyError(
+                    self.__class__.__name__ + " missing kwarg : footerFunc"
+                ) from e
+            super().__init__(*args, **kwargs)
+
+        def afterPage(self, *args, **kwargs):
+            """Override method for footer and blanks based on table splits.
+
+            If table has split on this page, insert footer that tells reader
+            to look for continuation on back side or on next sheet.
+            If table finishes on the front side of a page, insert a blank
+            page after it if necessary to ensure that two sided printing will
+            show the next table on the front side of the next sheet.
+            """
+            if MultiRouteReport.table_split == self.page:
+                # table has split, therefore route continues on next page
+                if (self.page - MultiRouteReport.route_start_page + 1) % 2 != 0:
+                    # split occured at bottom of front side of sheet (odd page)
+                    self.footerFunc(
+                        self, "** SUITE AU VERSO / CONTINUED ON REVERSE SIDE **"
+                    )
+                else:
+                    # split occured at bottom of back side of sheet (even page)
+                    self.footerFunc(
+                        self, "** VOIR FEUILLE SUIVANTE / SEE NEXT SHEET **"
+                    )
+            else:
+                # no table split means route finishes on this page
+                if (self.page - MultiRouteReport.route_start_page + 1) % 2 != 0:
+                    # route finishes on odd page, add a blank page
+                    self.canv.showPage()
+                # the next route, if any, will start on next document page
+                MultiRouteReport.route_start_page = self.page + 1
+
+    # static method
+    def routes_make_pages(routes_dict, delivery_date):
+        """Generate the route sheets pages as a PDF file.
+
+        Ensures that a new route starts on the front side of a sheet,
+        by adding a blank page if necessary.
+        The page footer indicates whether the delivery route continues
+        on the reverse side of the sheet or on the next sheet.
+
+        Args:
+            routes_dict : A dictionary {<route id>:<value>, ...} where
+              <value> is a dictionary containing 3 items :
+                'route' : a Route object.
+                'summary_lines' : A list of RouteSummaryLine objects, sorted by
+                                  component_group name (main dish first).
+                'detail_lines' : A list of DeliveryClient objects
+                                 (see order/models.py),
+                                 sorted according to delivery history sequence.
+
+        Returns:
+            An integer : The number of pages generated.
+        """
+        PAGE_HEIGHT = 11.0 * rl_inch
+        PAGE_WIDTH = 8.5 * rl_inch
+
+        styles = rl_getSampleStyleSheet()
+        defineStyles(styles)
+
+        def drawHeader(canvas, doc):
+            """Draw the header and footer.
+
+            Args:
+                canvas : A reportlab.pdfgen.canvas.Canvas object.
+                doc : A reportlab.platypus.SimpleDocTemplate object.
+            """
+            canvas.saveState()
+            canvas.setFont("Helvetica-Bold", 12)
+            canvas.drawString(
+                x=1.5 * rl_inch,
+                y=PAGE_HEIGHT + 0.30 * rl_inch,
+                text="Santropol Roulant",
+            )
+            canvas.setFont("Helvetica", 12)
+            canvas.drawString(
+                x=1.5 * rl_inch,
+                y=PAGE_HEIGHT + 0.15 * rl_inch,
+                text="Tel. : (514) 284-9335",
+            )
+            canvas.setFont("Helvetica", 10)
+            canvas.drawString(
+                x=1.5 * rl_inch,
+                y=PAGE_HEIGHT - 0.0 * rl_inch,
+                text="{}".format(delivery_date.strftime("%a., %d %B %Y")),
+            )
+            canvas.drawString(
+                x=3.25 * rl_inch,
+                y=PAGE_HEIGHT + 0.30 * rl_inch,
+                text="(Ce document contient des informations CONFIDENTIELLES.)",
+            )
+            canvas.drawString(
+                x=3.25 * rl_inch,
+                y=PAGE_HEIGHT + 0.15 * rl_inch,
+                text="(This document contains CONFIDENTIAL information.)",
+            )
+            canvas.drawRightString(
+                x=PAGE_WIDTH - 0.75 * rl_inch,
+                y=PAGE_HEIGHT + 0.30 * rl_inch,
+                text=f"Page {doc.page - MultiRouteReport.route_start_page + 1:d}",
+            )
+            canvas.drawInlineImage(
+                LOGO_IMAGE,
+                0.5 * rl_inch,
+                PAGE_HEIGHT - 0.2 * rl_inch,
+                width=0.8 * rl_inch,
+                height=0.7 * rl_inch,
+            )
+            canvas.restoreState()
+
+        def drawFooter(doc, text):
+            """Draw the page footer.
+
+            Args:
+                doc : A reportlab.platypus.SimpleDocTemplate object.
+                text : A string to place in the footer.
+            """
+            doc.canv.saveState()
+            doc.canv.setFont("Helvetica", 14)
+            doc.canv.drawCentredString(
+                x=4.0 * rl_inch, y=PAGE_HEIGHT - 10.5 * rl_inch, text=text
+            )
+            doc.canv.restoreState()
+
+        def go():
+            """Generate the pages.
+
+            Returns:
+                An integer : The number of pages generated.
+            """
+            file_path = get_route_sheets_file_path(delivery_date)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            doc = MultiRouteReport.RLMultiRouteDocTemplate(
+                str(file_path),
+                leftMargin=0.5 * rl_inch,
+                rightMargin=0.5 * rl_inch,
+                bottomMargin=0.5 * rl_inch,
+                footerFunc=drawFooter,
+            )
+            # initialize
+            MultiRouteReport.table_split = 0
+            MultiRouteReport.document = doc
+            MultiRouteReport.route_start_page = 1
+            story = []
+            first_route = True
+
+            # TODO Loop over routes
+            for route in routes_dict.values():
+                if not route["summary_lines"]:
+                    # empty route : skip it
+                    continue
+                # begin Summary section
+                if not first_route:
+                    # next route must start on a new page
+                    story.append(RLPageBreak())
+                rows = []
+                rows.append(
+                    [
+                        RLParagraph("PLAT / DISH", styles["NormalLeftBold"]),
+                        RLParagraph("Qté / Qty", styles["NormalCenterBold"]),
+                    ]
+                )
+                for sl in route["summary_lines"]:
+                    rows.append(
+                        [
+                            RLParagraph(sl.component_group_trans, styles["NormalLeft"]),
+                            RLParagraph(str(sl.rqty + sl.lqty), styles["NormalCenter"]),
+                        ]
+                    )
+                tab = MultiRouteReport.RLMultiRouteTable(
+                    rows,
+                    colWidths=(100, 60),
+                    style=[
+                        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                        ("GRID", (0, 0), (-1, -1), 1, rl_colors.black),
+                        ("ALIGN", (0, 0), (-1, -1), "RIGHT"),
+                    ],
+                    hAlign="LEFT",
+                )
+                story.append(tab)
+                # end Summary section
+
+                # Route name
+                story.append(RLSpacer(1, 0.25 * rl_inch))
+                story.append(RLParagraph(route["route"].name, styles["HugeBoldCenter"]))
+                story.append(RLSpacer(1, 0.25 * rl_inch))
+                story.append(
+                    RLParagraph(
+                        "- DÉBUT DE LA ROUTE / START ROUTE -", styles["LargeLeft"]
+                    )
+                )
+                story.append(RLSpacer(1, 0.125 * rl_inch))
+
+                # begin Detail section
+                rows = []
+                line = 0
+                tab_style = RLTableStyle([("VALIGN", (0, 0), (-1, -1), "TOP")])
+                rows.append(
+                    [
+                        RLParagraph("Client", styles["NormalLeft"]),
+                        RLParagraph("Note", styles["NormalLeft"]),
+                        RLParagraph("Items", styles["NormalLeft"]),
+                        RLParagraph("", styles["NormalLeft"]),
+                    ]
+                )
+                tab_style.add("LINEABOVE", (0, 0), (-1, 0), 1, rl_colors.black)
+                line += 1
+                for c in route["detail_lines"]:
+                    tab_style.add(
+                        "LINEABOVE", (0, line), (-1, line), 1, rl_colors.black
+                    )
+                    rows.append(
+                        [
+                            # client
+                            [
+                                RLParagraph(
+                                    c.firstname + " " + c.lastname,
+                                    styles["VeryLargeBoldLeft"],
+                                ),
+                                RLParagraph(c.street, styles["LargeLeft"]),
+                                RLParagraph("Apt " + c.apartment, styles["LargeLeft"])
+                                if c.apartment
+                                else [],
+                                RLParagraph(c.phone, styles["LargeLeft"]),
+                            ],
+                            # note
+                            RLParagraph(c.delivery_note, styles["LargeLeft"]),
+                            # items
+                            (
+                                [
+                                    RLParagraph(
+                                        i.component_group_trans, styles["LargeLeft"]
+                                    )
+                                    for i in c.delivery_items
+                                ]
+                                + [
+                                    RLParagraph("Facture / Bill", styles["LargeLeft"])
+                                    if c.include_a_bill
+                                    else []
+                                ]
+                            ),
+                            # quantity
+                            [
+                                RLParagraph(str(i.total_quantity), styles["LargeRight"])
+                                for i in c.delivery_items
+                            ],
+                        ]
+                    )
+                    line += 1
+                # END for
+                # add row for number of clients
+                rows.append(
+                    [
+                        [
+                            RLParagraph("- FIN DE LA ROUTE -", styles["LargeLeft"]),
+                            RLParagraph("- END OF ROUTE- ", styles["LargeLeft"]),
+                        ],
+                        [
+                            RLParagraph("Nombre d'arrêts :", styles["LargeRight"]),
+                            RLParagraph("Number of Stops :", styles["LargeRight"]),
+                        ],
+                        RLParagraph(str(line - 1), styles["LargeLeft"]),
+                        RLParagraph("", styles["LargeLeft"]),
+                    ]
+                )
+                #
+                tab_style.add(
+                    "LINEBELOW", (0, line - 1), (-1, line - 1), 1, rl_colors.black
+                )
+                tab = MultiRouteReport.RLMultiRouteTable(
+                    rows, colWidths=(140, 255, 100, 20), repeatRows=1
+                )
+                tab.setStyle(tab_style)
+                story.append(tab)
+                # end Detail section
+                first_route = False
+            # END for
+
+            # build full document
+            doc.build(
+                story,
+                onFirstPage=drawHeader,
+                onLaterPages=drawHeader,
+            )
+
+            return file_path
+
+        # END def
+        return go()  # returns the file path
+
+
+# END Route sheet report.
+
+
+def get_portions(regular_qty, large_qty):
+    # A large portion is worth 1.5 regular portions.
+    portions = regular_qty + large_qty * 1.5
+    # Remove '.0' (keep number as integer if there is no decimal part)
+    if portions == int(portions):
+        portions = int(portions)
+    return portions
+
+
+def qty_paragraph(qty: int | float, style):
+    # 0 will not be displayed
+    return RLParagraph(str(qty or ""), style)
+
+
+def kcr_make_pages(
+    kcr_date,
+    component_lines: list[ComponentLine],
+    meal_lines: list[MealLine],
+    preperation_lines_with_incompatible_ingr: list[PreparationLine],
+    preperation_lines_without_incompatible_ingr: list[PreparationLine],
+):
+    """Generate the kitchen count report pages as a PDF file.
+
+    Uses ReportLab see http://www.reportlab.com/documentation/faq/
+
+    Args:
+        kcr_date: The delivery date of the meals.
+        component_lines: A list of ComponentLine objects, the summary of
+            component quantities and sizes for the date's meal.
+        meal_lines: A list of MealLine objects, the details of the clients
+            for the date that have ingredients clashing with those in main dish.
+        preperation_lines_with_incompatible_ingr: list[PreperationLine]
+        preperation_lines_without_incompatible_ingr: list[PreperationLine]
+
+    Returns:
+        An integer : The number of pages generated.
+    """
+    PAGE_HEIGHT = 14.0 * rl_inch
+    PAGE_WIDTH = 8.5 * rl_inch
+
+    styles = rl_getSampleStyleSheet()
+    defineStyles(styles)
+
+    def drawHeader(canvas, doc):
+        """Draw the header part common to all pages.
+
+        Args:
+            canvas : A reportlab.pdfgen.canvas.Canvas object.
+            doc : A reportlab.platypus.SimpleDocTemplate object.
+        """
+        canvas.setFont("Helvetica", 14)
+        y = PAGE_HEIGHT - 0.3 * rl_inch
+        canvas.drawString(x=1.9 * rl_inch, y=y, text="Kitchen count report")
+        canvas.setFont("Helvetica", 9)
+        canvas.drawRightString(
+            x=6.0 * rl_inch,
+            y=y,
+            text="{}".format(kcr_date.strftime("%a., %d %B %Y")),
+        )
+        canvas.drawRightString(
+            x=PAGE_WIDTH - 0.75 * rl_inch,
+            y=y,
+            text=f"Page {doc.page:d}",
+        )
+
+    def myFirstPage(canvas: Canvas, doc):
+        """Draw the complete header for the first page.
+
+        Args:
+            canvas : A reportlab.pdfgen.canvas.Canvas object.
+            doc : A reportlab.platypus.SimpleDocTemplate object.
+        """
+        canvas.saveState()
+        drawHeader(canvas, doc)
+        canvas.drawInlineImage(
+            LOGO_IMAGE,
+            0.75 * rl_inch,
+            PAGE_HEIGHT - 1.0 * rl_inch,
+            width=1.0 * rl_inch,
+            height=0.85 * rl_inch,
+        )
+        canvas.restoreState()
+
+    def myLaterPages(canvas: Canvas, doc):
+        """Draw the complete header for all pages except the first one.
+
+        Args:
+            canvas : A reportlab.pdfgen.canvas.Canvas object.
+            doc : A reportlab.platypus.SimpleDocTemplate object.
+        """
+        canvas.saveState()
+        drawHeader(canvas, doc)
+        canvas.restoreState()
+
+    def get_component_table():
+        small_left = deepcopy(styles["SmallRight"])
+        small_left.alignment = 0
+
+        rows = []
+        rows.append(
+            [
+                RLParagraph("Component", styles["NormalLeft"]),
+                RLParagraph("Total", styles["NormalLeft"]),
+                "",
+                "",
+                RLParagraph("Ingredients", styles["NormalLeft"]),
+            ]
+        )
+        rows.append(
+            [
+                "",
+                RLParagraph("Regular", styles["SmallRight"]),
+                RLParagraph("Large", styles["SmallRight"]),
+                RLParagraph("Portions", styles["SmallRight"]),
+                "",
+            ]
+        )
+        for cl in component_lines:
+            portions = get_portions(cl.rqty, cl.lqty)
+            rows.append(
+                [
+                    cl.component_group,
+                    qty_paragraph(cl.rqty, styles["NormalRight"]),
+                    qty_paragraph(cl.lqty, styles["NormalRight"]),
+                    # To make reading the table easier, do not display the portions if
+                    # there are no large quantity, as then the number of portions would
+                    # be the same as the regular quantity.
+                    qty_paragraph(portions, styles["NormalRight"]) if cl.lqty else "",
+                    RLParagraph(cl.ingredients, styles["NormalLeft"]),
+                ]
+            )
+        return RLTable(
+            rows,
+            colWidths=(100, 40, 40, 40, 300),
+            style=[
+                # style, start cell, end cell, params
+                ("VALIGN", (0, 2), (-1, -1), "TOP"),
+                ("LINEABOVE", (0, 0), (-1, 0), 1, rl_colors.black),
+                ("LINEBELOW", (0, 0), (-1, 0), 1, rl_colors.black),
+                ("LINEBEFORE", (0, 0), (0, 0), 1, rl_colors.black),
+                ("LINEAFTER", (-1, 0), (-1, 0), 1, rl_colors.black),
+                ("SPAN", (1, 0), (2, 0)),
+            ],
+        )
+
+    def get_food_preperation_table(preperation_lines, heading_suffix):
+        rows = []
+        line = 0
+        tab_style = RLTableStyle([("VALIGN", (0, 0), (-1, -1), "TOP")])
+        rows.append(
+            [
+                RLParagraph("Food Preparation", styles["NormalLeft"]),
+                RLParagraph("Quantity", styles["NormalRight"]),
+                "",
+                [
+                    RLParagraph("Clients", styles["NormalLeft"]),
+                    RLParagraph(f"({heading_suffix})", styles["NormalLeftBold"]),
+                ],
+            ]
+        )
+        tab_style.add("LINEABOVE", (0, line), (-1, line), 1, rl_colors.black)
+        tab_style.add("LINEBELOW", (0, line), (-1, line), 1, rl_colors.black)
+        tab_style.add("LINEBEFORE", (0, line), (0, line), 1, rl_colors.black)
+        tab_style.add("LINEAFTER", (-1, line), (-1, line), 1, rl_colors.black)
+        line += 1
+
+        for prepline in preperation_lines:
+            rows.append(
+                [
+                    RLParagraph(prepline.preparation_method, styles["LargeBoldLeft"]),
+                    RLParagraph(str(prepline.quantity), styles["NormalRightBold"]),
+                    "",
+                    RLParagraph(
+                        ";&nbsp;&nbsp; ".join(prepline.client_names),
+                        styles["NormalLeft"],
+                    ),
+                ]
+            )
+        tab = RLTable(rows, colWidths=(150, 50, 10, 310), repeatRows=1)
+        tab.setStyle(tab_style)
+        return tab
+
+    def go():
+        """Generate the pages.
+
+        Returns:
+            An integer : The number of pages generated.
+        """
+        file_path = get_kitchen_count_file_path(kcr_date)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        doc = RLSimpleDocTemplate(str(file_path), pagesize=pagesizes.legal)
+        story = []
+
+        # begin Summary section
+
+        # Menu name
+        menu = component_lines[0].name if component_lines else ""
+        title_style = deepcopy(styles["NormalLeftBold"])
+        title_style.spaceBefore = 0
+        title_style.leftIndent = 60
+        title_style.fontSize = 14
+        story.append(RLParagraph(menu, title_style))
+        story.append(RLSpacer(1, 0.5 * rl_inch))
+
+        tab = get_component_table()
+        story.append(tab)
+        story.append(RLSpacer(1, 0.25 * rl_inch))
+        # end Summary section
+
+        # begin Detail section
+        rows = []
+        line = 0
+        tab_style = RLTableStyle([("VALIGN", (0, 0), (-1, -1), "TOP")])
+        rows.append(
+            [
+                RLParagraph("Clashing ingredients", styles["NormalLeft"]),
+                RLParagraph("Reg", styles["NormalRight"]),
+                RLParagraph("Lrg", styles["NormalRight"]),
+                RLParagraph("Portions", styles["NormalRight"]),
+                "",
+                RLParagraph("Client & Food Prep", styles["NormalLeft"]),
+                RLParagraph("Other restrictions", styles["NormalLeft"]),
+            ]
+        )
+        tab_style.add("LINEABOVE", (0, line), (-1, line), 1, rl_colors.black)
+        tab_style.add("LINEBEFORE", (0, line), (0, line), 1, rl_colors.black)
+        tab_style.add("LINEAFTER", (-1, line), (-1, line), 1, rl_colors.black)
+        line += 1
+        for ml in meal_lines:
+            if ml.ingr_clash and not ml.client:
+                # Total line at the bottom
+                rows.append(
+                    [
+                        RLParagraph(ml.ingr_clash or "∅", styles["NormalLeftBold"]),
+                        qty_paragraph(ml.rqty, styles["NormalRightBold"]),
+                        qty_paragraph(ml.lqty, styles["NormalRightBold"]),
+                        qty_paragraph(
+                            get_portions(ml.rqty, ml.lqty), styles["NormalRightBold"]
+                        ),
+                        "",
+                        "",
+                    ]
+                )
+                tab_style.add("LINEABOVE", (0, line), (-1, line), 1, rl_colors.black)
+            elif ml.ingr_clash or ml.client:
+                # not a blank separator line
+                if ml.span != "-1":
+                    # line has ingredient clash data
+                    tab_style.add("SPAN", (0, line), (0, line + int(ml.span) - 1))
+                    tab_style.add(
+                        "LINEABOVE", (0, line), (-1, line), 1, rl_colors.black
+                    )
+                    # for dashes, must use LINEABOVE because dashes do not work
+                    #   with LINEBELOW; seems to be a bug in ReportLab see :
+                    #   reportlab/platypus/tables.py line # 1309
+                    tab_style.add(
+                        "LINEABOVE",  # op
+                        (1, line + 1),  # start
+                        (-1, line + 1),  # stop
+                        1,  # weight
+                        rl_colors.black,  # color
+                        None,  # cap
+                        [1, 2],
+                    )  # dashes
+                    value = RLParagraph(ml.ingr_clash or "∅", styles["LargeBoldLeft"])
+                else:
+                    # span = -1 means clash data must be blanked out
+                    #   because it is the same as the initial spanned row
+                    value = ""
+                # END IF
+                if ml.client == "SUBTOTAL":
+                    client = ""
+                    qty_style = "LargeBoldRight"
+                else:
+                    client = ml.client
+                    qty_style = "NormalRight"
+                food_prep = f"({ml.food_prep})" if ml.food_prep else ""
+                rows.append(
+                    [
+                        value,
+                        RLParagraph(str(ml.rqty or ""), styles[qty_style]),
+                        RLParagraph(str(ml.lqty or ""), styles[qty_style]),
+                        RLParagraph(
+                            str(get_portions(ml.rqty, ml.lqty) or ""),
+                            styles[qty_style],
+                        ),
+                        "",
+                        [
+                            RLParagraph(client, styles["NormalLeft"]),
+                            RLParagraph(food_prep, styles["NormalLeftBold"]),
+                        ],
+                        [
+                            RLParagraph(
+                                ml.rest_ingr
+                                + (" ;" if ml.rest_ingr and ml.rest_item else ""),
+                                styles["NormalLeft"],
+                            ),
+                            RLParagraph(ml.rest_item, styles["NormalLeftBold"]),
+                        ],
+                    ]
+                )
+                # END IF
+                line += 1
+            # END IF
+        # END FOR
+        tab = RLTable(rows, colWidths=(130, 35, 35, 50, 20, 100, 160), repeatRows=1)
+        tab.setStyle(tab_style)
+        story.append(tab)
+        story.append(RLSpacer(1, 1 * rl_inch))
+        # end Detail section
+
+        story.append(RLPageBreak())
+        story.append(
+            get_food_preperation_table(
+                preperation_lines_with_incompatible_ingr, "with restrictions"
+            )
+        )
+        story.append(RLSpacer(1, 1 * rl_inch))
+
+        story.append(
+            get_food_preperation_table(
+                preperation_lines_without_incompatible_ingr, "without restrictions"
+            )
+        )
+        story.append(RLSpacer(1, 1 * rl_inch))
+
+        # build full document
+        doc.build(story, onFirstPage=myFirstPage, onLaterPages=myLaterPages)
+        return file_path
+
+    return go()  # returns the file path
+
+
+# END Kitchen count report view, helper classes and functions
+
+
+def get_other_restrictions_for_meal_labels(kitchen_item):
+    side_clashes = set(kitchen_item.sides_clashes)
+    restr = set(kitchen_item.restricted_items)
+    avoid = set(kitchen_item.avoid_ingredients)
+    incompatible = set(
+        ingr.replace(" (sides)", "") for ingr in kitchen_item.incompatible_ingredients
+    )
+    # Side clashes and incompatible ingredients were already displayed as
+    # "Restrictions", we do not want to display them twice.
+    return sorted((restr | avoid) - incompatible - side_clashes)
+
+
+def kcr_make_labels(
+    kcr_date,
+    kitchen_list: dict[int, KitchenItem],
+    main_dish_name: str,
+    main_dish_ingredients: str,
+    sides_ingredients: str,
+):
+    """Generate Meal Labels sheets as a PDF file.
+
+    Generate a label for each main dish serving to be delivered. The
+    sheet format is "Avery 5162" 8,5 X 11 inches, 2 cols X 7 lines.
+
+    Uses pylabels package - see https://github.com/bcbnz/pylabels
+    and ReportLab
+
+    Args:
+        kcr_date: The delivery date of the meals.
+        kitchen_list: A dictionary of KitchenItem objects (see
+            order/models) which contain detailed information about
+            all the meals that have to be prepared for the day and
+            the client requirements and restrictions.
+        main_dish_name: A string, the name of the main dish.
+        main_dish_ingredient: A string, the comma separated list
+            of all the ingredients in the main dish.
+
+    Returns:
+        An integer : The number of labels generated.
+    """
+    # dimensions are in millimeters; 1 inch = 25.4 mm
+    # Sheet format is Avery 5162 : 2 columns * 7 rows
+    sheet_height = 11.0 * 25.4
+    sheet_width = 8.5 * 25.4
+    vertic_margin = 21.0
+    horiz_margin = 4.0
+    columns = 2
+    rows = 7
+    gutter = 3.0 / 16.0 * 25.4
+    specs = labels.Specification(
+        sheet_width=sheet_width,
+        sheet_height=sheet_height,
+        columns=columns,
+        rows=rows,
+        column_gap=gutter,
+        label_width=(sheet_width - 2.0 * horiz_margin - gutter) / columns,
+        label_height=(sheet_height - 2.0 * vertic_margin) / rows,
+        top_margin=vertic_margin,
+        bottom_margin=vertic_margin,
+        left_margin=horiz_margin,
+        right_margin=horiz_margin,
+        corner_radius=1.5,
+    )
+
+    sheet = labels.Sheet(specs, draw_label, border=False)
+
+    meal_labels: list[MealLabel] = []
+    for kititm in kitchen_list.values():
+        meal_label = MealLabel(*meal_label_fields[1::2])
+        meal_label = meal_label._replace(
+            route=kititm.routename.upper(),
+            date="{}".format(kcr_date.strftime("%a, %b-%d")),
+            main_dish_name=main_dish_name,
+            name=kititm.lastname + ", " + kititm.firstname[0:2] + ".",
+        )
+        if kititm.meal_size == SIZE_CHOICES_LARGE:
+            meal_label = meal_label._replace(size=gettext("LARGE"))
+        if kititm.incompatible_ingredients:
+            other_restr = get_other_restrictions_for_meal_labels(kititm)
+            meal_label = meal_label._replace(
+                main_dish_name="_______________________________________",
+                dish_clashes=textwrap.wrap(
+                    gettext("Restrictions")
+                    + ": {}.".format(", ".join(kititm.incompatible_ingredients)),
+                    width=65,
+                    break_long_words=False,
+                    break_on_hyphens=False,
+                )
+                if kititm.incompatible_ingredients
+                else "",
+                other_restrictions=textwrap.wrap(
+                    gettext("Other restr.") + ": {}.".format(", ".join(other_restr)),
+                    width=65,
+                    break_long_words=False,
+                    break_on_hyphens=False,
+                )
+                if other_restr
+                else "",
+            )
+        elif not kititm.sides_clashes:
+            meal_label = meal_label._replace(
+                ingredients=textwrap.wrap(
+                    gettext("Ingredients") + f": {main_dish_ingredients}",
+                    width=74,
+                    break_long_words=False,
+                    break_on_hyphens=False,
+                ),
+            )
+        if kititm.preparation:
+            prefix = gettext("Preparation") + ": "
+            # wrap all text including prefix
+            preparation_list = textwrap.wrap(
+                prefix + " , ".join(kititm.preparation),
+                width=65,
+                break_long_words=False,
+                break_on_hyphens=False,
+            )
+            # remove prefix from first line
+            preparation_list[0] = preparation_list[0][len(prefix) :]
+            meal_label = meal_label._replace(preparations=[prefix] + preparation_list)
+        if kititm.sides_clashes:
+            prefix = (
+                f"{gettext('Sides')}: _______________________ {gettext('Clashes')}: "
+            )
+            # wrap all text including prefix
+            sides_clashes_list = textwrap.wrap(
+                prefix + " , ".join(kititm.sides_clashes),
+                width=65,
+                break_long_words=False,
+                break_on_hyphens=False,
+            )
+            # remove prefix from first line
+            sides_clashes_list[0] = sides_clashes_list[0][len(prefix) :]
+            meal_label = meal_label._replace(
+                sides_clashes=[prefix] + sides_clashes_list
+            )
+        else:
+            meal_label = meal_label._replace(
+                sides=textwrap.wrap(
+                    gettext("Sides") + f": {sides_ingredients}",
+                    width=74,
+                    break_long_words=False,
+                    break_on_hyphens=False,
+                ),
+            )
+
+        for _j in range(1, kititm.meal_qty + 1):
+            meal_labels.append(meal_label)
+
+    # find max lengths of fields to sort on
+    routew = 0
+    namew = 0
+    clashesw = 0
+    prepw = 0
+    for label in meal_labels:
+        routew = max(routew, len(label.route))
+        namew = max(namew, len(label.name))
+        clashesw = max(clashesw, len(label.dish_clashes), len(label.sides_clashes))
+        prepw = max(prepw, len(label.preparations))
+    # generate grouping and sorting key
+    for j in range(len(meal_labels)):
+        # for groups 1, 2 and 3 : sort by restrictions, preparations, name
+        # for groups 4 : sort by route, name
+        route = ""
+        clashes = ""
+        prep = ""
+        if meal_labels[j].dish_clashes:  # has dish restrictions
+            group = 1
+            clashes = " ".join(meal_labels[j].dish_clashes)  # sort by restrictions
+        elif meal_labels[j].sides_clashes:  # has sides restrictions
+            group = 2
+            clashes = " ".join(meal_labels[j].sides_clashes)  # sort by restrictions
+        elif meal_labels[j].preparations:  # has food preparations
+            group = 3
+            prep = " ".join(meal_labels[j].preparations)  # sort by preparations
+        else:  # regular meal
+            group = 4
+            route = meal_labels[j].route  # sort by route
+        meal_labels[j] = meal_labels[j]._replace(
+            sortkey="{grp:1}{cla:{claw}}{pre:{prew}}{rou:{rouw}}{nam:{namw}}".format(
+                grp=group,
+                cla=clashes,
+                claw=clashesw,
+                pre=prep,
+                prew=prepw,
+                rou=route,
+                rouw=routew,
+                nam=meal_labels[j].name,
+                namw=namew,
+            )
+        )
+    # generate labels into PDF
+    for label in sorted(meal_labels, key=lambda x: x.sortkey):
+        sheet.add_label(label)
+
+    file_path = None
+    if sheet.label_count > 0:
+        file_path = get_meals_label_file_path(kcr_date)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        sheet.save(str(file_path))
+    return file_path
+
+
+# END Meal labels
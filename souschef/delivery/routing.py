@@ -0,0 +1,531 @@
+"""
+Travel times on the road network, from an OpenStreetMap extract, without
+network access.
+
+The extract (an .osm XML file of the delivery area, see
+ROUTING_OSM_EXTRACT in the settings) is loaded by vehicle into a
+`RoadGraph`: the nodes of the ways the vehicle can use, and the travel
+time of each edge, stored as compact arrays (compressed sparse rows). The
+graphs are built once per version of the extract by the `buildroadgraph`
+command and saved in ROUTING_GRAPH_DIR; the requests only load them, and
+use the straight-line distance while they are not built.
+
+A location is attached to its SNAP_CANDIDATES nearest nodes, reached at
+ACCESS_SPEED. The travel times from a location are computed with one
+Dijkstra search started from all of its nodes at once (multi-source),
+stopped when the nodes of all the other locations are reached. The
+matrices of travel times between the stops of a route are cached by the
+locations of the stops, so that they are only computed again when the
+stops change.
+"""
+
+import glob
+import hashlib
+import heapq
+import logging
+import math
+import os
+import pickle
+import tempfile
+from array import array
+from functools import cached_property
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.core.cache import cache
+
+from souschef.member.constants import DEFAULT_VEHICLE
+
+logger = logging.getLogger(__name__)
+
+# Speeds in km/h by type of way (the `highway` tag) for each vehicle; the
+# other ways are not used by the vehicle.
+SPEEDS = {
+    "cycling": {
+        "cycleway": 18,
+        "primary": 15,
+        "primary_link": 15,
+        "secondary": 15,
+        "secondary_link": 15,
+        "tertiary": 15,
+        "tertiary_link": 15,
+        "unclassified": 15,
+        "residential": 15,
+        "living_street": 10,
+        "service": 12,
+        "track": 10,
+        "path": 12,
+        # Walking the bike.
+        "footway": 5,
+        "pedestrian": 5,
+    },
+    "walking": {
+        "primary": 5,
+        "primary_link": 5,
+        "secondary": 5,
+        "secondary_link": 5,
+        "tertiary": 5,
+        "tertiary_link": 5,
+        "unclassified": 5,
+        "residential": 5,
+        "living_street": 5,
+        "service": 5,
+        "track": 5,
+        "path": 5,
+        "footway": 5,
+        "pedestrian": 5,
+        "cycleway": 5,
+        "steps": 2,
+    },
+    "driving": {
+        "motorway": 90,
+        "motorway_link": 45,
+        "trunk": 70,
+        "trunk_link": 40,
+        "primary": 45,
+        "primary_link": 30,
+        "secondary": 40,
+        "secondary_link": 30,
+        "tertiary": 35,
+        "tertiary_link": 30,
+        "unclassified": 30,
+        "residential": 25,
+        "living_street": 10,
+        "service": 15,
+    },
+}
+
+# The tag restricting the access of the vehicle, besides `access`.
+ACCESS_TAGS = {"cycling": "bicycle", "walking": "foot", "driving": "motor_vehicle"}
+
+NO_ACCESS = {"no", "private"}
+
+# km/h, between a location and the road network.
+ACCESS_SPEED = 5
+
+SNAP_CANDIDATES = 3
+
+# Degrees; the nodes are indexed by cells of this size to be snapped to.
+CELL_SIZE = 0.005
+
+# The number of rings of cells searched for the nodes near a location.
+MAX_SNAP_RADIUS = 4
+
+# The straight distance is multiplied by this factor for the pairs of
+# locations not connected by the graph.
+DETOUR_FACTOR = 1.4
+
+# Seconds.
+MATRIX_TIMEOUT = 7 * 24 * 3600
+
+# Metres by degree of latitude.
+METRES_BY_DEGREE = 111_200
+
+
+def distance_m(latitude1, longitude1, latitude2, longitude2):
+    """
+    The distance between two locations in metres, with the equirectangular
+    approximation, precise enough across a city.
+    """
+    x = (longitude2 - longitude1) * math.cos(math.radians((latitude1 + latitude2) / 2))
+    y = latitude2 - latitude1
+    return METRES_BY_DEGREE * math.hypot(x, y)
+
+
+def seconds(metres, speed):
+    """The time to travel `metres` at `speed` km/h."""
+    return metres * 3.6 / speed
+
+
+def get_cell(latitude, longitude):
+    return math.floor(latitude / CELL_SIZE), math.floor(longitude / CELL_SIZE)
+
+
+def get_vehicle(vehicle):
+    return vehicle if vehicle in SPEEDS else DEFAULT_VEHICLE
+
+
+def get_speed(tags, vehicle):
+    """The speed of the vehicle on a way with `tags`, or None if it can't."""
+    speed = SPEEDS[vehicle].get(tags.get("highway"))
+    if speed is None:
+        return None
+    access = tags.get(ACCESS_TAGS[vehicle], tags.get("access"))
+    if access in NO_ACCESS:
+        return None
+    maxspeed = tags.get("maxspeed", "")
+    # Ignored if not in km/h.
+    if vehicle == "driving" and maxspeed.isdigit():
+        speed = min(speed, int(maxspeed))
+    return speed
+
+
+def get_directions(tags, vehicle):
+    """Whether the vehicle can follow the way forward, and backward."""
+    if vehicle == "walking":
+        return True, True
+    if vehicle == "cycling" and (
+        tags.get("oneway:bicycle") == "no"
+        or tags.get("cycleway") in ("opposite", "opposite_lane", "opposite_track")
+    ):
+        return True, True
+    oneway = tags.get("oneway")
+    if oneway in ("yes", "true", "1") or tags.get("junction") == "roundabout":
+        return True, False
+    if oneway in ("-1", "reverse"):
+        return False, True
+    return True, True
+
+
+def parse_osm(path, vehicle):
+    """
+    The locations of the nodes and the edges (from node, to node, speed) of
+    the ways of the extract usable by the vehicle, by OpenStreetMap ids.
+    """
+    locations = {}
+    edges = []
+    for _event, element in ElementTree.iterparse(path):
+        if element.tag == "node":
+            locations[int(element.get("id"))] = (
+                float(element.get("lat")),
+                float(element.get("lon")),
+            )
+            element.clear()
+        elif element.tag == "way":
+            tags = {tag.get("k"): tag.get("v") for tag in element.iter("tag")}
+            speed = get_speed(tags, vehicle)
+            if speed is not None:
+                forward, backward = get_directions(tags, vehicle)
+                refs = [int(nd.get("ref")) for nd in element.iter("nd")]
+                for a, b in zip(refs, refs[1:]):
+                    if forward:
+                        edges.append((a, b, speed))
+                    if backward:
+                        edges.append((b, a, speed))
+            element.clear()
+        elif element.tag == "relation":
+            element.clear()
+    return locations, edges
+
+
+class RoadGraph:
+    """
+    The road network of a vehicle: the locations of the nodes (by index),
+    and the edges of each node `i` at `offsets[i]:offsets[i + 1]` in
+    `targets` (the node reached), `times` (seconds) and `lengths` (metres).
+    """
+
+    def __init__(
+        self, vehicle, latitudes, longitudes, offsets, targets, times, lengths, stamp
+    ):
+        self.vehicle = vehicle
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.offsets = offsets
+        self.targets = targets
+        self.times = times
+        self.lengths = lengths
+        # Identifies the extract the graph was built from.
+        self.stamp = stamp
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Rebuilt when needed.
+        state.pop("cells", None)
+        return state
+
+    @classmethod
+    def from_osm(cls, path, vehicle, stamp=""):
+        locations, edges = parse_osm(path, vehicle)
+        index = {}
+        for a, b, _speed in edges:
+            if a in locations and b in locations:
+                index.setdefault(a, len(index))
+                index.setdefault(b, len(index))
+        latitudes = array("d", bytes(8 * len(index)))
+        longitudes = array("d", bytes(8 * len(index)))
+        for osm_id, i in index.items():
+            latitudes[i], longitudes[i] = locations[osm_id]
+
+        # The edges sorted by node, for the compressed sparse rows.
+        edges = sorted(
+            (index[a], index[b], speed)
+            for a, b, speed in edges
+            if a in index and b in index
+        )
+        offsets = array("q", bytes(8 * (len(index) + 1)))
+        targets = array("q")
+        times = array("f")
+        lengths = array("f")
+        for a, b, speed in edges:
+            offsets[a + 1] += 1
+            length = distance_m(
+                latitudes[a], longitudes[a], latitudes[b], longitudes[b]
+            )
+            targets.append(b)
+            times.append(seconds(length, speed))
+            lengths.append(length)
+        for i in range(len(index)):
+            offsets[i + 1] += offsets[i]
+        return cls(
+            vehicle, latitudes, longitudes, offsets, targets, times, lengths, stamp
+        )
+
+    def __len__(self):
+        return len(self.latitudes)
+
+    @cached_property
+    def cells(self):
+        """The indexes of the nodes by cell."""
+        cells = {}
+        for i, (latitude, longitude) in enumerate(zip(self.latitudes, self.longitudes)):
+            cells.setdefault(get_cell(latitude, longitude), []).append(i)
+        return cells
+
+    def snap(self, latitude, longitude, count=SNAP_CANDIDATES):
+        """
+        The nearest nodes of the location, as a list of (node, seconds to
+        reach it from the location); empty if there is no node near it.
+        """
+        row, column = get_cell(latitude, longitude)
+        # The cells around the location, widened until they hold nodes.
+        for radius in range(MAX_SNAP_RADIUS + 1):
+            nodes = [
+                node
+                for i in range(-radius - 1, radius + 2)
+                for j in range(-radius - 1, radius + 2)
+                for node in self.cells.get((row + i, column + j), ())
+            ]
+            if nodes:
+                break
+        nearest = heapq.nsmallest(
+            count,
+            (
+                (
+                    distance_m(
+                        latitude,
+                        longitude,
+                        self.latitudes[node],
+                        self.longitudes[node],
+                    ),
+                    node,
+                )
+                for node in nodes
+            ),
+        )
+        return [(node, seconds(metres, ACCESS_SPEED)) for metres, node in nearest]
+
+    def search(self, sources, targets=()):
+        """
+        Dijkstra's search from all the `sources`, (node, initial seconds)
+        pairs, at once; stopped when all the `targets` nodes are reached.
+        Returns the travel times and the predecessors of the nodes reached
+        (-1 for the sources).
+        """
+        offsets, edge_targets, edge_times = self.offsets, self.targets, self.times
+        times = {}
+        predecessors = {}
+        heap = [(time, node, -1) for node, time in sources]
+        heapq.heapify(heap)
+        remaining = set(targets)
+        while heap:
+            time, node, predecessor = heapq.heappop(heap)
+            if node in times:
+                continue
+            times[node] = time
+            predecessors[node] = predecessor
+            remaining.discard(node)
+            if targets and not remaining:
+                break
+            for edge in range(offsets[node], offsets[node + 1]):
+                target = edge_targets[edge]
+                if target not in times:
+                    heapq.heappush(heap, (time + edge_times[edge], target, node))
+        return times, predecessors
+
+    def direct_time(self, a, b):
+        """
+        The time between the locations `a` and `b` if they are not connected
+        by the graph, estimated from the straight distance.
+        """
+        metres = distance_m(*a, *b)
+        return min(
+            seconds(metres, ACCESS_SPEED),
+            seconds(metres * DETOUR_FACTOR, SPEEDS[self.vehicle]["residential"]),
+        )
+
+    def travel_times(self, locations):
+        """
+        The matrix of the travel times in seconds between the `locations`,
+        (latitude, longitude) pairs: `matrix[i][j]` from the i-th to the
+        j-th. Asymmetric with the one-way streets.
+        """
+        snapped = [self.snap(*location) for location in locations]
+        targets = {node for candidates in snapped for node, _time in candidates}
+        matrix = []
+        for i, sources in enumerate(snapped):
+            times, _predecessors = (
+                self.search(sources, targets) if sources else ({}, {})
+            )
+            row = []
+            for j, candidates in enumerate(snapped):
+                if i == j:
+                    row.append(0.0)
+                    continue
+                reached = [
+                    times[node] + time for node, time in candidates if node in times
+                ]
+                row.append(
+                    min(reached)
+                    if reached
+                    else self.direct_time(locations[i], locations[j])
+                )
+            matrix.append(row)
+        return matrix
+
+    def itinerary(self, a, b):
+        """
+        The itinerary between the locations `a` and `b`, as the list of the
+        locations passed through, the distance in metres and the time in
+        seconds; a straight line if they are not connected by the graph.
+        """
+        sources = self.snap(*a)
+        candidates = dict(self.snap(*b))
+        times, predecessors = self.search(sources, candidates) if sources else ({}, {})
+        reached = [node for node in candidates if node in times]
+        if not reached:
+            return [a, b], distance_m(*a, *b), self.direct_time(a, b)
+        end = min(reached, key=lambda node: times[node] + candidates[node])
+        nodes = [end]
+        while predecessors[nodes[-1]] != -1:
+            nodes.append(predecessors[nodes[-1]])
+        nodes.reverse()
+
+        metres = 0.0
+        for node, next_node in zip(nodes, nodes[1:]):
+            # The fastest of the edges between the two nodes.
+            _time, edge = min(
+                (self.times[edge], edge)
+                for edge in range(self.offsets[node], self.offsets[node + 1])
+                if self.targets[edge] == next_node
+            )
+            metres += self.lengths[edge]
+        path = [(self.latitudes[node], self.longitudes[node]) for node in nodes]
+        metres += distance_m(*a, *path[0]) + distance_m(*path[-1], *b)
+        return [a, *path, b], metres, times[end] + candidates[end]
+
+
+def get_extract_stamp(path):
+    stat = os.stat(path)
+    return hashlib.sha1(
+        f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}".encode()
+    ).hexdigest()
+
+
+def get_graph_path(vehicle, stamp):
+    return os.path.join(settings.ROUTING_GRAPH_DIR, f"{vehicle}-{stamp}.graph")
+
+
+# The graphs loaded by this process, by vehicle: (stamp, graph).
+_graphs = {}
+
+
+def build_graph(vehicle, path=None):
+    """
+    Build the `RoadGraph` of the vehicle from the extract at `path` (by
+    default ROUTING_OSM_EXTRACT) and save it in ROUTING_GRAPH_DIR, replacing
+    the graphs of the previous extracts. Raises OSError or ParseError if
+    the extract can't be read.
+    """
+    path = path or settings.ROUTING_OSM_EXTRACT
+    vehicle = get_vehicle(vehicle)
+    stamp = get_extract_stamp(path)
+    graph = RoadGraph.from_osm(path, vehicle, stamp)
+
+    os.makedirs(settings.ROUTING_GRAPH_DIR, exist_ok=True)
+    graph_path = get_graph_path(vehicle, stamp)
+    with tempfile.NamedTemporaryFile(
+        dir=settings.ROUTING_GRAPH_DIR, suffix=".tmp", delete=False
+    ) as f:
+        pickle.dump(graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # Atomically, for the processes loading the graph meanwhile.
+    os.replace(f.name, graph_path)
+    for old_path in glob.glob(get_graph_path(vehicle, "*")):
+        if old_path != graph_path:
+            os.remove(old_path)
+    _graphs[vehicle] = (stamp, graph)
+    return graph
+
+
+def is_graph_built(vehicle, path=None):
+    """Whether `load_graph` finds the graph of the vehicle, without loading it."""
+    path = path or settings.ROUTING_OSM_EXTRACT
+    if not path:
+        return False
+    vehicle = get_vehicle(vehicle)
+    try:
+        stamp = get_extract_stamp(path)
+    except OSError:
+        return False
+    loaded = _graphs.get(vehicle)
+    return (loaded is not None and loaded[0] == stamp) or os.path.exists(
+        get_graph_path(vehicle, stamp)
+    )
+
+
+def load_graph(vehicle, path=None):
+    """
+    The `RoadGraph` of the vehicle for the extract at `path` (by default
+    ROUTING_OSM_EXTRACT), as saved by `build_graph` (see the
+    `buildroadgraph` command). None if there is no extract, or if its graph
+    is not built: the extract is never parsed while serving a request.
+    """
+    path = path or settings.ROUTING_OSM_EXTRACT
+    if not path:
+        return None
+    vehicle = get_vehicle(vehicle)
+    try:
+        stamp = get_extract_stamp(path)
+    except OSError as e:
+        logger.warning("Cannot read the extract %s: %s", path, e)
+        return None
+    loaded = _graphs.get(vehicle)
+    if loaded is not None and loaded[0] == stamp:
+        return loaded[1]
+    try:
+        with open(get_graph_path(vehicle, stamp), "rb") as f:
+            graph = pickle.load(f)
+    except FileNotFoundError:
+        logger.warning(
+            "The %s road graph of %s is not built (see buildroadgraph).",
+            vehicle,
+            path,
+        )
+        return None
+    _graphs[vehicle] = (stamp, graph)
+    return graph
+
+
+def get_travel_times(locations, vehicle):
+    """
+    The matrix of the travel times between the `locations` on the road
+    network (see `RoadGraph.travel_times`), cached by locations; None
+    without extract.
+    """
+    graph = load_graph(vehicle)
+    if graph is None:
+        return None
+    locations = [
+        (float(latitude), float(longitude)) for latitude, longitude in locations
+    ]
+    digest = hashlib.sha1(
+        ";".join(
+            f"{latitude:.6f},{longitude:.6f}" for latitude, longitude in locations
+        ).encode()
+    ).hexdigest()
+    key = f"routing:matrix:{graph.vehicle}:{graph.stamp}:{digest}"
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = graph.travel_times(locations)
+        cache.set(key, matrix, timeout=MATRIX_TIMEOUT)
+    return matrix
@@ -1,12 +1,17 @@
 import datetime
 import json
-from io import BytesIO
+import os
+import tempfile
+from io import BytesIO, StringIO
 
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
 from django.db.models import Q
 from django.test import (
     RequestFactory,
     TestCase,
+    override_settings,
 )
 from django.urls import (
     reverse,
@@ -46,10 +51,14 @@ from souschef.member.models import (
     Restriction,
     Route,
 )
+from souschef.order.factories import OrderFactory
 from souschef.order.models import Order
+from souschef.sous_chef.tests import QueryPlanMixin
 from souschef.sous_chef.tests import TestMixin as SousChefTestMixin
 
+from . import routing, tsp
 from .filters import KitchenCountOrderFilter
+from .views import get_kitchen_list
 
 
 class KitchenCountReportTestCase(SousChefTestMixin, TestCase):
@@ -263,6 +272,15 @@ class ChooseDayMainDishIngredientsTestCase(SousChefTestMixin, TestCase):
             b"Ground porc" in response.content and b"Pepper" in response.content
         )
 
+    def test_main_dish_clashes(self):
+        """The number of clashing clients is shown next to each main dish."""
+        response = self.client.get(
+            reverse_lazy("delivery:meal"),
+            {"delivery_date": datetime.date.today().isoformat()},
+        )
+        self.assertContains(response, "Coq au vin (")
+        self.assertRegex(response.content.decode(), r"Ginger pork \(\d+ clash")
+
     def test_date_with_dish_next(self):
         """From ingredient choice go to Kitchen Count Report."""
         response = self.client.get(reverse_lazy("delivery:meal"))
@@ -626,6 +644,7 @@ class RedirectAnonymousUserTestCase(SousChefTestMixin, TestCase):
         check(reverse("delivery:kitchen_count"))
         check(reverse("delivery:route_sheet", kwargs={"pk": 1}))
         check(reverse("delivery:refresh_orders"))
+        check(reverse("delivery:cancel_orders"))
 
 
 class OrderlistViewTestCase(SousChefTestMixin, TestCase):
@@ -890,6 +909,64 @@ class RefreshOrderViewTestCase(SousChefTestMixin, TestCase):
         self.assertEqual(Order.objects.all().count(), 0)  # No order should be created.
 
 
+class CancelOrdersViewTestCase(SousChefTestMixin, TestCase):
+    fixtures = ["routes.json"]
+
+    def setUp(self):
+        self.delivery_date = datetime.date.today()
+        self.orders = OrderFactory.create_batch(
+            3, delivery_date=self.delivery_date, status="O"
+        )
+
+    def test_redirects_users_who_do_not_have_edit_permission(self):
+        user = User.objects.create_user(
+            username="foo", email="foo@example.com", password="secure"
+        )
+        user.is_staff = True
+        user.save()
+        self.client.login(username="foo", password="secure")
+        self.assertRedirectsWithAllMethods(reverse("delivery:cancel_orders"))
+
+    def test_cancel_selected_orders(self):
+        self.force_login()
+        selected = self.orders[:2]
+        response = self.client.post(
+            reverse("delivery:cancel_orders"),
+            {
+                "delivery_date": self.delivery_date.isoformat(),
+                "orders": [o.pk for o in selected],
+                "reason": "Kitchen closed",
+            },
+        )
+        self.assertRedirects(
+            response,
+            reverse("delivery:order")
+            + f"?delivery_date={self.delivery_date.isoformat()}",
+            fetch_redirect_response=False,
+        )
+        for order in selected:
+            order.refresh_from_db()
+            self.assertEqual(order.status, "C")
+            self.assertEqual(order.status_changes.get().reason, "Kitchen closed")
+        self.orders[2].refresh_from_db()
+        self.assertEqual(self.orders[2].status, "O")
+
+    def test_cancel_orders_not_ordered(self):
+        self.force_login()
+        self.orders[0].status = "D"
+        self.orders[0].save()
+        response = self.client.post(
+            reverse("delivery:cancel_orders"),
+            {
+                "delivery_date": self.delivery_date.isoformat(),
+                "orders": [o.pk for o in self.orders],
+            },
+            follow=True,
+        )
+        self.assertContains(response, f"#{self.orders[0].pk}")
+        self.assertFalse(Order.objects.filter(status="C").exists())
+
+
 class ExcludeMisconfiguredClientsTestCase(SousChefTestMixin, TestCase):
     """
     Test 4 clients:
@@ -1237,7 +1314,7 @@ class ExcludeMisconfiguredClientsTestCase(SousChefTestMixin, TestCase):
             date=tz.datetime.today(),
             # As long as this sequence is not exactly same as the clients',
             # it's always invalid, even if it contains all the clients.
-            client_id_sequence=[999999, 888888, self.c_valid.pk],
+            client_id_sequence=[self.c_nr.pk, self.c_valid.pk],
         )
         # Assert print doesn't work
         response = self.client.get(
@@ -1438,3 +1515,285 @@ class RouteSheetReportTestCase(SousChefTestMixin, TestCase):
         )
         self.assertEqual(response.status_code, 200)
         self.assertTrue("ReportLab" in repr(response.content))
+
+
+class DeliveryQueryPlanTestCase(QueryPlanMixin, TestCase):
+    """
+    The kitchen count and route sheet queries must keep using the
+    delivery date indexes instead of scanning the whole tables.
+    """
+
+    fixtures = ["sample_data"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = datetime.date.today()
+        clients = Client.active.all()
+        # Seed a few weeks of orders around the delivery date.
+        for days in range(-14, 15):
+            Order.objects.auto_create_orders(
+                cls.today + datetime.timedelta(days=days), clients
+            )
+        main_dish = Component.objects.get(name="Ginger pork")
+        for ingredient in Component.get_recipe_ingredients(main_dish.id):
+            Component_ingredient.objects.create(
+                component=main_dish, ingredient=ingredient, date=cls.today
+            )
+        Component_ingredient.objects.create(
+            component=Component.objects.get(
+                component_group=COMPONENT_GROUP_CHOICES_SIDES
+            ),
+            ingredient=Ingredient.objects.get(name="Cabbage"),
+            date=cls.today,
+        )
+        Menu.create_menu_and_components(cls.today, ["Ginger pork", "Green Salad"])
+        cls.route = Route.objects.get(name="Centre Sud")
+
+    def test_kitchen_count(self):
+        kitchen_list = self.assertNoFullTableScan(
+            [
+                "meal_component_ingredient",
+                "meal_menu",
+                "member_client",
+                "member_member",
+                "order_order",
+                "order_order_item",
+            ],
+            get_kitchen_list,
+            self.today,
+        )
+        self.assertTrue(kitchen_list)
+
+    def test_route_sheet(self):
+        route_list = self.assertNoFullTableScan(
+            ["member_client", "member_member", "order_order", "order_order_item"],
+            Order.get_delivery_list,
+            self.today,
+            self.route.id,
+        )
+        self.assertTrue(route_list)
+
+    def test_routes_information(self):
+        self.assertNoFullTableScan(
+            ["member_client", "order_order"],
+            lambda: list(
+                Order.objects.get_shippable_orders_by_route(
+                    self.route.id, self.today, exclude_non_geolocalized=True
+                ).values_list("client__pk", flat=True)
+            ),
+        )
+
+
+class RoadNetworkTestCase(SousChefTestMixin, TestCase):
+    """
+    Two streets east of the kitchen, on either side of a park: A, south,
+    and B, north, one-way eastward. They are joined at the west end by a
+    street, and at the east end by a street one-way southward; a footway
+    crosses the park in the middle.
+
+        B  11 -> 12 -> 13 -> 14 -> 15
+           |           :           v
+           21          23          25
+           |           :           v
+        A  1 --- 2 --- 3 --- 4 --- 5
+    """
+
+    SOUTH, NORTH = 45.5160, 45.5260
+    LONGITUDES = [-73.580, -73.575, -73.570, -73.565, -73.560]
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        nodes = {}
+        for i, longitude in enumerate(cls.LONGITUDES, start=1):
+            nodes[i] = (cls.SOUTH, longitude)
+            nodes[i + 10] = (cls.NORTH, longitude)
+            nodes[i + 20] = ((cls.SOUTH + cls.NORTH) / 2, longitude)
+        ways = [
+            ([1, 2, 3, 4, 5], {"highway": "residential"}),
+            ([11, 12, 13, 14, 15], {"highway": "residential", "oneway": "yes"}),
+            ([1, 21, 11], {"highway": "residential"}),
+            ([15, 25, 5], {"highway": "residential", "oneway": "yes"}),
+            ([3, 23, 13], {"highway": "footway"}),
+            # Not usable.
+            ([2, 22, 12], {"highway": "service", "access": "private"}),
+        ]
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<osm version="0.6">']
+        for osm_id, (latitude, longitude) in nodes.items():
+            lines.append(f'<node id="{osm_id}" lat="{latitude}" lon="{longitude}"/>')
+        for way_id, (refs, tags) in enumerate(ways, start=100):
+            lines.append(f'<way id="{way_id}">')
+            lines.extend(f'<nd ref="{ref}"/>' for ref in refs)
+            lines.extend(f'<tag k="{k}" v="{v}"/>' for k, v in tags.items())
+            lines.append("</way>")
+        lines.append("</osm>")
+        with tempfile.NamedTemporaryFile("w", suffix=".osm", delete=False) as f:
+            f.write("\n".join(lines))
+        cls.extract = f.name
+        cls.addClassCleanup(os.remove, f.name)
+        graph_dir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(graph_dir.cleanup)
+        cls.enterClassContext(override_settings(ROUTING_GRAPH_DIR=graph_dir.name))
+        for vehicle in routing.SPEEDS:
+            routing.build_graph(vehicle, cls.extract)
+
+    # Near the nodes 4 and 14.
+    def south_stop(self):
+        return (self.SOUTH + 0.0001, self.LONGITUDES[3])
+
+    def north_stop(self):
+        return (self.NORTH - 0.0001, self.LONGITUDES[3])
+
+    def test_graph(self):
+        graph = routing.load_graph("driving", self.extract)
+        # Without the footway nor the private way.
+        self.assertEqual(12, len(graph))
+        # The two-way streets in both directions.
+        self.assertEqual(2 * 4 + 4 + 2 * 2 + 2, len(graph.targets))
+        self.assertIs(graph, routing.load_graph("driving", self.extract))
+        self.assertEqual(13, len(routing.load_graph("walking", self.extract)))
+
+    def test_graph_not_built(self):
+        with tempfile.NamedTemporaryFile(suffix=".osm") as f:
+            with open(self.extract, "rb") as extract:
+                f.write(extract.read())
+            f.flush()
+            with self.assertLogs(routing.logger, "WARNING"):
+                self.assertIsNone(routing.load_graph("driving", f.name))
+            with (
+                self.settings(ROUTING_OSM_EXTRACT=f.name),
+                self.assertLogs(routing.logger, "WARNING"),
+            ):
+                self.assertIsNone(
+                    routing.get_travel_times([self.south_stop()], "driving")
+                )
+        with self.assertLogs(routing.logger, "WARNING"):
+            self.assertIsNone(routing.load_graph("driving", "/nonexistent.osm"))
+
+    def test_travel_times(self):
+        locations = [self.south_stop(), self.north_stop()]
+        block, park = 389.6, 1112
+        # To and from the nodes 4 and 14.
+        access = 2 * routing.seconds(11.12, routing.ACCESS_SPEED)
+
+        matrix = routing.load_graph("driving", self.extract).travel_times(locations)
+        self.assertEqual(0, matrix[0][0])
+        # Around the park by the west, or back by the east one-way street.
+        self.assertAlmostEqual(
+            routing.seconds(6 * block + park, 25) + access, matrix[0][1], delta=1
+        )
+        self.assertAlmostEqual(
+            routing.seconds(2 * block + park, 25) + access, matrix[1][0], delta=1
+        )
+
+        # Across the park, on the footway.
+        matrix = routing.load_graph("walking", self.extract).travel_times(locations)
+        self.assertAlmostEqual(matrix[0][1], matrix[1][0])
+        self.assertAlmostEqual(
+            routing.seconds(2 * block + park, 5), matrix[0][1], delta=access
+        )
+
+    def test_not_connected(self):
+        far = (46.0, -73.0)
+        graph = routing.load_graph("cycling", self.extract)
+        matrix = graph.travel_times([self.south_stop(), far])
+        self.assertEqual(graph.direct_time(self.south_stop(), far), matrix[0][1])
+
+    def test_solve_with_travel_times(self):
+        nodes = [
+            tsp.Node(None, *tsp.DELIVERY_STARTING_POINT_LAT_LONG),
+            tsp.Node(1, *self.south_stop()),
+            tsp.Node(2, *self.north_stop()),
+        ]
+        # Same distance both ways round.
+        self.assertEqual([None, 1, 2], [node.id for node in tsp.solve(nodes)])
+        matrix = routing.load_graph("driving", self.extract).travel_times(
+            [(node.latitude, node.longitude) for node in nodes]
+        )
+        self.assertEqual(
+            [None, 2, 1],
+            [node.id for node in tsp.solve(nodes, tsp.matrix_cost(nodes, matrix))],
+        )
+
+    def test_optimised_sequence(self):
+        route = RouteFactory(vehicle="driving")
+        south, north = (
+            ClientFactory(
+                route=route,
+                status=Client.ACTIVE,
+                member__address__latitude=latitude,
+                member__address__longitude=longitude,
+            )
+            for latitude, longitude in (self.south_stop(), self.north_stop())
+        )
+        self.force_login()
+        url = reverse("member:route_get_optimised_sequence", args=[route.pk])
+        response = self.client.get(url)
+        self.assertEqual([south.pk, north.pk], response.json())
+        with self.settings(ROUTING_OSM_EXTRACT=self.extract):
+            response = self.client.get(url)
+        self.assertEqual([north.pk, south.pk], response.json())
+        # The straight-line distance without the extract.
+        with (
+            self.settings(ROUTING_OSM_EXTRACT="/nonexistent.osm"),
+            self.assertLogs(routing.logger, "WARNING"),
+        ):
+            response = self.client.get(url)
+        self.assertEqual([south.pk, north.pk], response.json())
+
+    def test_road_itinerary(self):
+        self.force_login()
+        url = reverse("delivery:road_itinerary")
+        waypoints = ";".join(
+            f"{latitude},{longitude}"
+            for latitude, longitude in (self.north_stop(), self.south_stop())
+        )
+        response = self.client.get(url, {"waypoints": waypoints})
+        self.assertEqual(404, response.status_code)
+        with (
+            override_settings(ROUTING_OSM_EXTRACT="/nonexistent.osm"),
+            self.assertLogs(routing.logger, "WARNING"),
+        ):
+            response = self.client.get(url, {"waypoints": waypoints})
+        self.assertEqual(404, response.status_code)
+
+        with override_settings(ROUTING_OSM_EXTRACT=self.extract):
+            response = self.client.get(
+                url, {"waypoints": waypoints, "vehicle": "driving"}
+            )
+            self.assertEqual(
+                400, self.client.get(url, {"waypoints": "1,2"}).status_code
+            )
+        itinerary = response.json()
+        self.assertEqual(
+            [list(self.north_stop()), [self.NORTH, self.LONGITUDES[3]]],
+            itinerary["coordinates"][:2],
+        )
+        self.assertEqual(list(self.south_stop()), itinerary["coordinates"][-1])
+        self.assertEqual([0, 6], itinerary["waypoint_indices"])
+        self.assertAlmostEqual(2 * 389.6 + 1112 + 2 * 11.12, itinerary["distance"], 0)
+
+    def test_routing_url(self):
+        """The maps use the road network only once its graphs are built."""
+        self.force_login()
+        url = reverse("delivery:order")
+        with self.settings(ROUTING_OSM_EXTRACT=self.extract):
+            response = self.client.get(url)
+        self.assertEqual(
+            reverse("delivery:road_itinerary"), response.context["ROUTING_URL"]
+        )
+        with tempfile.NamedTemporaryFile(suffix=".osm") as f:
+            for extract in (f.name, "/nonexistent.osm"):
+                with self.settings(ROUTING_OSM_EXTRACT=extract):
+                    response = self.client.get(url)
+                self.assertEqual("", response.context["ROUTING_URL"])
+
+    def test_buildroadgraph(self):
+        out = StringIO()
+        call_command("buildroadgraph", extract=self.extract, stdout=out)
+        self.assertIn("driving: 12 nodes, 18 edges", out.getvalue())
+        self.assertEqual(
+            len(routing.SPEEDS), len(os.listdir(settings.ROUTING_GRAPH_DIR))
+        )
+        with self.assertRaises(CommandError):
+            call_command("buildroadgraph", stdout=out)
@@ -1,4 +1,7 @@
 import itertools
+import math
+
+DELIVERY_STARTING_POINT_LAT_LONG = (45.516564, -73.575145)  # Santropol Roulant
 
 
 class Node:
@@ -35,7 +38,7 @@ def reverse_subtour(tour, start, end):
     return tour[:start] + list(reversed(tour[start : end + 1])) + tour[end + 1 :]
 
 
-def solve(tour):
+def solve(tour, cost=None):
     """Solves the Traveling Salesman Problem (TSP) with a heuristic.
 
     Args:
@@ -43,6 +46,9 @@ def solve(tour):
             starts and ends at the same node, the last node in the
             list must be the last destination visited before returning
             to the starting point.
+        cost: Function giving the cost of going from a node to another,
+            e.g. a travel time (see matrix_cost). By default, the
+            squared euclidean distance.
 
     Returns:
         A tour with a distance less or equal to the distance of the
@@ -51,9 +57,12 @@ def solve(tour):
     """
 
     # This function implements a local search heuristic with a 2-opt
-    # neighborhood to solve an Euclidean TSP.
+    # neighborhood to solve an Euclidean TSP, or a TSP with the given
+    # (possibly asymmetric) costs.
 
-    best_solution = Solution(list(tour), tour_squared_distance(tour))
+    if cost is None:
+        cost = squared_distance
+    best_solution = Solution(list(tour), tour_cost(tour, cost))
 
     improved = True
     while improved:
@@ -61,7 +70,7 @@ def solve(tour):
         best_candidate = Solution(best_solution.tour, best_solution.value)
 
         for candidate_tour in two_opt_neighbors(best_solution.tour):
-            candidate = Solution(candidate_tour, tour_squared_distance(candidate_tour))
+            candidate = Solution(candidate_tour, tour_cost(candidate_tour, cost))
 
             # We use the squared distance since the square root
             # function is monotone increasing, so comparing squared
@@ -82,13 +91,59 @@ def squared_distance(a, b):
     return (a.latitude - b.latitude) ** 2 + (a.longitude - b.longitude) ** 2
 
 
+def distance(a, b):
+    """Euclidean distance"""
+
+    return math.sqrt(squared_distance(a, b))
+
+
+def cheapest_insertion(tour, node):
+    """Finds where to insert a node in a tour.
+
+    Args:
+        tour: List of nodes (Node) representing a tour, returning to its
+            first node after the last one.
+        node: The node to insert.
+
+    Returns:
+        The index in the tour at which inserting the node lengthens the
+        tour the least, from 1 to len(tour) (after the last node). Runs
+        in linear time.
+
+    """
+
+    best_index, best_cost = len(tour), math.inf
+    for index, (a, b) in enumerate(pairwise(tour + tour[:1]), start=1):
+        # Unlike with 2-opt moves, the squared distances would favour
+        # detours made of several short legs.
+        cost = distance(a, node) + distance(node, b) - distance(a, b)
+        # On a tie (e.g. both ways round a tour of two nodes), the later.
+        if cost <= best_cost:
+            best_index, best_cost = index, cost
+    return best_index
+
+
+def matrix_cost(nodes, matrix):
+    """Cost function of the nodes from a matrix.
+
+    Args:
+        nodes: List of the nodes (Node) of the matrix.
+        matrix: matrix[i][j] is the cost of going from the i-th node to
+            the j-th, e.g. a travel time on the road network.
+
+    """
+
+    index = {node: i for i, node in enumerate(nodes)}
+    return lambda a, b: matrix[index[a]][index[b]]
+
+
+def tour_cost(tour, cost):
+    # "+ tour[0]" => add the cost of returning to the starting point
+    return sum(cost(a, b) for a, b in pairwise(tour + [tour[0]]))
+
+
 def tour_squared_distance(tour):
-    # "+ tour[0]" => add the distance for returning to the starting
-    # point
-    distance = 0
-    for a, b in pairwise(tour + [tour[0]]):
-        distance += squared_distance(a, b)
-    return distance
+    return tour_cost(tour, squared_distance)
 
 
 def two_opt_neighbors(tour):
@@ -2,6 +2,7 @@ from django.urls import path
 from django.utils.translation import gettext_lazy as _
 
 from souschef.delivery.views import (
+    CancelOrders,
     CreateDelivery,
     DeliveryRouteSheet,
     EditDeliveryRoute,
@@ -9,6 +10,7 @@ from souschef.delivery.views import (
     MealInformation,
     RefreshOrderView,
     ReviewOrders,
+    RoadItinerary,
     RoutesInformation,
 )
 
@@ -36,4 +38,6 @@ urlpatterns = [
         name="route_sheet",
     ),
     path(_("refresh_orders/"), RefreshOrderView.as_view(), name="refresh_orders"),
+    path(_("cancel_orders/"), CancelOrders.as_view(), name="cancel_orders"),
+    path(_("road_itinerary/"), RoadItinerary.as_view(), name="road_itinerary"),
 ]
@@ -75,6 +75,46 @@ function groupWaypoints(waypoints) {
 
 }
 
+// Router of Leaflet Routing Machine computing the itineraries on the road
+// network of the server (see souschef/delivery/routing.py), without Mapbox.
+function LocalRouter(url, fallback) {
+    this.url = url;
+    this.fallback = fallback;
+    this.options = {};
+}
+
+LocalRouter.prototype.route = function (waypoints, callback, context) {
+    var fallback = this.fallback;
+    var profile = this.options.profile;
+    var points = waypoints.map(function (wp) {
+        return wp.latLng.lat + ',' + wp.latLng.lng;
+    }).join(';');
+    $.getJSON(this.url, {waypoints: points, vehicle: profile})
+        .done(function (data) {
+            callback.call(context, null, [{
+                name: '',
+                coordinates: data.coordinates.map(function (c) {
+                    return L.latLng(c[0], c[1]);
+                }),
+                instructions: [],
+                summary: {totalDistance: data.distance, totalTime: data.time},
+                inputWaypoints: waypoints,
+                waypoints: waypoints,
+                waypointIndices: data.waypoint_indices
+            }]);
+        })
+        .fail(function (xhr) {
+            if (xhr.status === 404) {
+                // No road graph for the vehicle: draw it with Mapbox.
+                fallback.options.profile = 'mapbox/' + profile;
+                fallback.route(waypoints, callback, context);
+            } else {
+                callback.call(context, {status: xhr.status, message: xhr.statusText});
+            }
+        });
+    return this;
+};
+
 function sous_chef_leaflet_map_init (map, options, settings) {
 
     // Create a new tile layer with bike path (http://thunderforest.com/maps/opencyclemap/)
@@ -85,15 +125,24 @@ function sous_chef_leaflet_map_init (map, options, settings) {
     // Center on santropol
     map.setView(new L.LatLng(45.516564, -73.575145), 13);
 
-    // Create router
-    var router = L.Routing.mapbox('pk.eyJ1IjoicmphY3F1ZW1pbiIsImEiOiJjaXAxaWpxdGkwMm5ydGhtNG84eGdjbGthIn0.TdwCw6vhAJdgxzH0JBp6iA');
+    // Create router, on the local road network if the server has one
+    var routingUrl = $('body').data('routing-url');
+    var mapboxRouter = L.Routing.mapbox('pk.eyJ1IjoicmphY3F1ZW1pbiIsImEiOiJjaXAxaWpxdGkwMm5ydGhtNG84eGdjbGthIn0.TdwCw6vhAJdgxzH0JBp6iA');
+    var router, profilePrefix;
+    if (routingUrl) {
+        router = new LocalRouter(routingUrl, mapboxRouter);
+        profilePrefix = '';
+    } else {
+        router = mapboxRouter;
+        profilePrefix = 'mapbox/';
+    }
     var defaultVehicle = settings.vehicle || 'cycling';
-    router.options.profile = 'mapbox/' + defaultVehicle;
+    router.options.profile = profilePrefix + defaultVehicle;
 
     if (settings.addListenerOnVehicleChange) {
         settings.addListenerOnVehicleChange(function (vehicle) {
             // vehicle is one of: cycling, driving, or walking
-            control.getRouter().options.profile = "mapbox/" + vehicle;
+            control.getRouter().options.profile = profilePrefix + vehicle;
             // refresh route display
             control.route();
         });
@@ -225,6 +274,29 @@ function sous_chef_leaflet_map_init (map, options, settings) {
 function __client_address_map_init (map, options) {
     var marker;  // keeps the reference to the map marker once created.
 
+    function suggestRoutes(latitude, longitude) {
+        // List the routes whose clients are closest to the address, and
+        // select the best one if no route is selected yet.
+        var $suggestions = $('#route_suggestions');
+        $.get($suggestions.data('url'), {latitude: latitude, longitude: longitude}, function(data) {
+            var $labels = $suggestions.find('.labels').empty();
+            $.each(data.routes, function(i, route) {
+                $('<a class="ui label"></a>')
+                    .text(route.name)
+                    .append($('<div class="detail"></div>').text(route.centroid_distance.toFixed(1) + ' km'))
+                    .click(function() {
+                        $('select[name$="route"]').dropdown('set selected', String(route.id));
+                    })
+                    .appendTo($labels);
+            });
+            $suggestions.toggle(data.routes.length > 0);
+            var $route = $('select[name$="route"]');
+            if (data.routes.length > 0 && !$route.val()) {
+                $route.dropdown('set selected', String(data.routes[0].id));
+            }
+        });
+    }
+
     function setMarker(latitude, longitude) {
         // Add or update marker for the found address
         if (typeof(marker) === 'undefined') {
@@ -238,6 +310,7 @@ function __client_address_map_init (map, options) {
                 $('.field > .longitude').val(chagedPos.lng);
                 var newdist = distance(45.516564,-73.575145, chagedPos.lat,chagedPos.lng,"K")
                 $('.field > .distance').val(newdist);
+                suggestRoutes(chagedPos.lat, chagedPos.lng);
             });
         }
 
@@ -279,6 +352,7 @@ function __client_address_map_init (map, options) {
                 $('.field .distance').val(dist);
 
                 setMarker(data.lat, data.long);
+                suggestRoutes(data.lat, data.long);
             }
             else {
                 alert(notFoundMsg);
@@ -293,6 +367,7 @@ function __client_address_map_init (map, options) {
     var initial_long = $('.field > .longitude').val();
     if (initial_lat && initial_long && (initial_lat !== '0') && (initial_long !== '0')) {
         setMarker(initial_lat, initial_long);
+        suggestRoutes(initial_lat, initial_long);
     } else {
         map.setView([45.516564,-73.575145], 12);  // Santropol
     }
@@ -0,0 +1,163 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from souschef.meal.models import (
+    Component,
+    Component_ingredient,
+    Incompatibility,
+    Ingredient,
+    Restricted_item,
+)
+from souschef.sous_chef import registry
+
+REFERENCE_DATA_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "data",
+    "reference_data.json",
+)
+
+
+def upsert_by_name(model, entries, fields):
+    """
+    Create the objects of `entries` missing from the database and update
+    the others, matching them on their name.
+
+    Returns the objects by name, with the numbers of created and updated
+    objects.
+    """
+    objects = {}
+    for obj in model.objects.filter(name__in=[entry["name"] for entry in entries]):
+        objects.setdefault(obj.name, obj)
+
+    new_objects = []
+    updated_objects = []
+    for entry in entries:
+        obj = objects.get(entry["name"])
+        if obj is None:
+            new_objects.append(model(**{f: entry.get(f) for f in ["name", *fields]}))
+        elif any(getattr(obj, f) != entry.get(f) for f in fields):
+            for f in fields:
+                setattr(obj, f, entry.get(f))
+            updated_objects.append(obj)
+    model.objects.bulk_create(new_objects)
+    model.objects.bulk_update(updated_objects, fields)
+
+    if new_objects:
+        # MySQL does not return the ids of the created objects.
+        for obj in model.objects.filter(name__in=[o.name for o in new_objects]):
+            objects.setdefault(obj.name, obj)
+    return objects, len(new_objects), len(updated_objects)
+
+
+def add_links(model, field, links):
+    """
+    Create the `model` rows linking the pairs of `links`, of `field` and
+    ingredient ids, that do not exist yet. Returns the number of created
+    rows.
+    """
+    queryset = model.objects.all()
+    if model is Component_ingredient:
+        # The recipes, not the ingredients of the menu of a given day.
+        queryset = queryset.filter(date=None)
+    existing = set(queryset.values_list(f"{field}_id", "ingredient_id"))
+    new_links = [
+        model(**{f"{field}_id": object_id, "ingredient_id": ingredient_id})
+        for object_id, ingredient_id in dict.fromkeys(links)
+        if (object_id, ingredient_id) not in existing
+    ]
+    model.objects.bulk_create(new_links)
+    return len(new_links)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the reference data (ingredients, components with their recipe, "
+        "restricted items with their incompatible ingredients) from a JSON "
+        "file. Existing rows are matched on their name and updated, so the "
+        "command can be run again safely."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=REFERENCE_DATA_FILE,
+            help="The reference data file. Defaults to meal/data/reference_data.json.",
+        )
+
+    def handle(self, *args, **options):
+        with open(options["file"]) as f:
+            data = json.load(f)
+        self.validate(data)
+
+        with transaction.atomic():
+            ingredients, created, updated = upsert_by_name(
+                Ingredient, data["ingredients"], ["ingredient_group"]
+            )
+            self.report("ingredients", created, updated)
+
+            components, created, updated = upsert_by_name(
+                Component, data["components"], ["component_group"]
+            )
+            self.report("components", created, updated)
+            created = add_links(
+                Component_ingredient,
+                "component",
+                [
+                    (components[entry["name"]].id, ingredients[name].id)
+                    for entry in data["components"]
+                    for name in entry["ingredients"]
+                ],
+            )
+            self.report("component ingredients", created)
+
+            restricted_items, created, updated = upsert_by_name(
+                Restricted_item,
+                data["restricted_items"],
+                ["restricted_item_group", "description"],
+            )
+            self.report("restricted items", created, updated)
+            created = add_links(
+                Incompatibility,
+                "restricted_item",
+                [
+                    (restricted_items[entry["name"]].id, ingredients[name].id)
+                    for entry in data["restricted_items"]
+                    for name in entry["ingredients"]
+                ],
+            )
+            self.report("incompatibilities", created)
+        # The bulk queries do not send the signals invalidating the registry.
+        registry.invalidate()
+
+    def validate(self, data):
+        """
+        Check the groups and the ingredients referenced by the file before
+        writing anything.
+        """
+        errors = []
+        for key, model, group in (
+            ("ingredients", Ingredient, "ingredient_group"),
+            ("components", Component, "component_group"),
+            ("restricted_items", Restricted_item, "restricted_item_group"),
+        ):
+            choices = {value for value, _ in model._meta.get_field(group).choices}
+            for entry in data[key]:
+                if entry[group] not in choices:
+                    errors.append(f"{entry['name']}: invalid {group} {entry[group]}.")
+        ingredients = {entry["name"] for entry in data["ingredients"]}
+        for key in ("components", "restricted_items"):
+            for entry in data[key]:
+                for name in entry["ingredients"]:
+                    if name not in ingredients:
+                        errors.append(f"{entry['name']}: unknown ingredient {name}.")
+        if errors:
+            raise CommandError("\n".join(errors))
+
+    def report(self, name, created, updated=None):
+        message = f"{name.capitalize()}: {created} created"
+        if updated is not None:
+            message += f", {updated} updated"
+        self.stdout.write(message + ".")
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.9 on 2026-10-19 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("meal", "0008_auto_20180704_1613"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="component_ingredient",
+            index=models.Index(
+                fields=["date", "component"], name="meal_compingr_date_comp_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="menu",
+            index=models.Index(fields=["date"], name="meal_menu_date_idx"),
+        ),
+    ]
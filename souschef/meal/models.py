@@ -1,9 +1,15 @@
-from django.db import models
+import datetime
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
 from souschef.meal.constants import (
     COMPONENT_GROUP_CHOICES,
     COMPONENT_GROUP_CHOICES_MAIN_DISH,
+    COMPONENT_GROUP_CHOICES_SIDES,
     INGREDIENT_GROUP_CHOICES,
     RESTRICTED_ITEM_GROUP_CHOICES,
 )
@@ -81,6 +87,14 @@ class Component(models.Model):
 
 
 class Component_ingredient(models.Model):
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["date", "component"],
+                name="meal_compingr_date_comp_idx",
+            ),
+        ]
+
     component = models.ForeignKey(
         "meal.Component",
         verbose_name=_("component"),
@@ -156,15 +170,223 @@ class Incompatibility(models.Model):
         return f"{self.restricted_item.name} <clash> {self.ingredient.name}"
 
 
+@dataclass
+class MenuPlan:
+    date: datetime.date  # Delivery date of the menu
+    main_dish: str  # Name of the main dish
+    # Ids of the ingredients of the main dish, None for its recipe
+    ingredients: list[int] | None = None
+    # Ids of the sides ingredients, None to keep those of the day
+    sides_ingredients: list[int] | None = None
+
+
+class MenuManager(models.Manager):
+    def get_default_components(self):
+        """
+        The components completing the menus: the first component, by name,
+        of each group other than the main dish.
+        """
+        components = {}
+        for component in Component.objects.exclude(
+            component_group=COMPONENT_GROUP_CHOICES_MAIN_DISH
+        ).order_by(Lower("name")):
+            components.setdefault(component.component_group, component)
+        return [
+            components[group]
+            for group, _label in COMPONENT_GROUP_CHOICES
+            if group in components
+        ]
+
+    @transaction.atomic
+    def set_components(self, menus_components):
+        """
+        Replace the components of the menus of the dates of
+        `menus_components`, a dictionary of lists of components by date.
+        Only one menu is kept per date, and the missing ones are created.
+
+        Returns the number of menu components created.
+        """
+        menus = {}
+        extra_menu_ids = []
+        for menu in self.filter(date__in=menus_components).order_by("id"):
+            if menu.date in menus:
+                extra_menu_ids.append(menu.id)
+            else:
+                menus[menu.date] = menu
+        Menu_component.objects.filter(menu__date__in=menus_components).delete()
+        self.filter(id__in=extra_menu_ids).delete()
+        missing_dates = [day for day in menus_components if day not in menus]
+        if missing_dates:
+            self.bulk_create([Menu(date=day) for day in missing_dates])
+            # MySQL does not return the ids of the created objects.
+            for menu in self.filter(date__in=missing_dates):
+                menus[menu.date] = menu
+        menu_components = Menu_component.objects.bulk_create(
+            Menu_component(menu=menus[day], component=component)
+            for day, components in menus_components.items()
+            for component in components
+        )
+        return len(menu_components)
+
+    @transaction.atomic
+    def plan_menus(self, plans):
+        """Plan the menus of many delivery dates at once.
+
+        For each `MenuPlan`, the ingredients of the day of the main dish
+        are replaced by the given ones or by its recipe, the sides
+        ingredients of the day by the given ones if any, and the menu is
+        made of the main dish and the default components of the other
+        groups. The plans are validated together before anything is
+        written, and everything is written with a few bulk queries.
+
+        Raises:
+            ValidationError: A date is planned twice, a main dish or an
+                ingredient does not exist, or there is not exactly one
+                sides component.
+
+        Returns:
+            The number of dated ingredients created.
+        """
+        plans = list(plans)
+        errors = []
+        dates = [plan.date for plan in plans]
+        duplicate_dates = sorted({day for day in dates if dates.count(day) > 1})
+        if duplicate_dates:
+            errors.append(
+                ValidationError(
+                    _("The dates %(dates)s are planned more than once."),
+                    code="duplicate_dates",
+                    params={"dates": ", ".join(map(str, duplicate_dates))},
+                )
+            )
+
+        main_dishes = {
+            component.name: component
+            for component in Component.objects.filter(
+                name__in={plan.main_dish for plan in plans},
+                component_group=COMPONENT_GROUP_CHOICES_MAIN_DISH,
+            )
+        }
+        unknown_dishes = sorted(
+            {plan.main_dish for plan in plans if plan.main_dish not in main_dishes}
+        )
+        if unknown_dishes:
+            errors.append(
+                ValidationError(
+                    _("The main dishes %(dishes)s do not exist."),
+                    code="unknown_main_dishes",
+                    params={"dishes": ", ".join(unknown_dishes)},
+                )
+            )
+
+        ingredient_ids = {
+            ingredient_id
+            for plan in plans
+            for ingredient_id in (plan.ingredients or [])
+            + (plan.sides_ingredients or [])
+        }
+        unknown_ingredients = ingredient_ids - set(
+            Ingredient.objects.filter(id__in=ingredient_ids).values_list(
+                "id", flat=True
+            )
+        )
+        if unknown_ingredients:
+            errors.append(
+                ValidationError(
+                    _("The ingredients %(ingredients)s do not exist."),
+                    code="unknown_ingredients",
+                    params={
+                        "ingredients": ", ".join(map(str, sorted(unknown_ingredients)))
+                    },
+                )
+            )
+
+        sides_component = None
+        if any(plan.sides_ingredients is not None for plan in plans):
+            sides_components = list(
+                Component.objects.filter(component_group=COMPONENT_GROUP_CHOICES_SIDES)
+            )
+            if len(sides_components) != 1:
+                errors.append(
+                    ValidationError(
+                        _(
+                            "The database must contain exactly one component "
+                            "having 'Component group' = 'Sides'."
+                        ),
+                        code="sides_component",
+                    )
+                )
+            else:
+                sides_component = sides_components[0]
+        if errors:
+            raise ValidationError(errors)
+
+        recipes = {}
+        for component_id, ingredient_id in Component_ingredient.objects.filter(
+            component__in=[
+                main_dishes[plan.main_dish]
+                for plan in plans
+                if plan.ingredients is None
+            ],
+            date=None,
+        ).values_list("component_id", "ingredient_id"):
+            recipes.setdefault(component_id, []).append(ingredient_id)
+
+        Component_ingredient.objects.filter(date__in=dates).exclude(
+            component__component_group=COMPONENT_GROUP_CHOICES_SIDES
+        ).delete()
+        Component_ingredient.objects.filter(
+            date__in=[
+                plan.date for plan in plans if plan.sides_ingredients is not None
+            ],
+            component__component_group=COMPONENT_GROUP_CHOICES_SIDES,
+        ).delete()
+        day_ingredients = []
+        for plan in plans:
+            main_dish = main_dishes[plan.main_dish]
+            ingredients = plan.ingredients
+            if ingredients is None:
+                ingredients = recipes.get(main_dish.id, [])
+            day_ingredients.extend(
+                Component_ingredient(
+                    component=main_dish, ingredient_id=ingredient_id, date=plan.date
+                )
+                for ingredient_id in dict.fromkeys(ingredients)
+            )
+            day_ingredients.extend(
+                Component_ingredient(
+                    component=sides_component,
+                    ingredient_id=ingredient_id,
+                    date=plan.date,
+                )
+                for ingredient_id in dict.fromkeys(plan.sides_ingredients or [])
+            )
+        Component_ingredient.objects.bulk_create(day_ingredients)
+
+        default_components = self.get_default_components()
+        self.set_components(
+            {
+                plan.date: [main_dishes[plan.main_dish], *default_components]
+                for plan in plans
+            }
+        )
+        return len(day_ingredients)
+
+
 class Menu(models.Model):
     class Meta:
         verbose_name_plural = _("menus")
+        indexes = [
+            models.Index(fields=["date"], name="meal_menu_date_idx"),
+        ]
 
     # Menu information for a specific date
     date = models.DateField(verbose_name=_("date"))
 
     components = models.ManyToManyField("meal.Component", through="Menu_component")
 
+    objects = MenuManager()
+
     def __str__(self):
         return f"Menu for {str(self.date)}"
 
@@ -189,41 +411,28 @@ class Menu(models.Model):
           Number of menu components created.
         """
 
-        num_menu_comp_created = 0
+        components = {
+            component.name: component
+            for component in Component.objects.filter(name__in=dish_names)
+        }
         component_groups = {}
-        menus = Menu.objects.filter(date=menu_date)
-        if not menus:
-            menu = Menu(date=menu_date)
-            menu.save()
-        else:
-            # menu(s) existed, must flush their menu_components
-            Menu_component.objects.filter(menu__in=menus).delete()
-            # flush extra menus
-            for menu in menus[1:]:
-                Menu.objects.filter(id=menu.id).delete()
-            # reuse the first one
-            menu = menus[0]
         for dish_name in dish_names:
-            components = Component.objects.filter(name=dish_name)
-            if not components:
+            component = components.get(dish_name)
+            if component is None:
                 raise Exception("Component ", dish_name, " does not exist")
-            component = components[0]
             if component_groups.get(component.component_group):
                 raise Exception(
                     "Menu can only have one dish for component group "
                     + component.component_group
                 )
-            component_groups[component.component_group] = dish_name
-            menu_component = Menu_component(menu=menu, component=component)
-            menu_component.save()
-            num_menu_comp_created += 1
+            component_groups[component.component_group] = component
         # END FOR
         if not component_groups.get(COMPONENT_GROUP_CHOICES_MAIN_DISH):
             raise Exception(
                 "Menu must include one dish for component group "
                 + COMPONENT_GROUP_CHOICES_MAIN_DISH
             )
-        return num_menu_comp_created
+        return Menu.objects.set_components({menu_date: list(component_groups.values())})
 
 
 class Menu_component(models.Model):
@@ -1,8 +1,20 @@
 import datetime
+import json
+import os
+import tempfile
+from io import StringIO
 
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
+from souschef.meal.management.commands.loadreferencedata import (
+    REFERENCE_DATA_FILE,
+)
 from souschef.meal.models import (
     Component,
     Component_ingredient,
@@ -10,6 +22,7 @@ from souschef.meal.models import (
     Ingredient,
     Menu,
     Menu_component,
+    MenuPlan,
     Restricted_item,
 )
 
@@ -223,6 +236,110 @@ class CreateMenuAndComponentsTestCase(TestCase):
             self.assertEqual(the_exception.error_code, 3)
 
 
+class MenuPlanTestCase(TestCase):
+    fixtures = ["meal_initial_data"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sides = Component.objects.create(name="Sides", component_group="sides")
+        cls.onions = Ingredient.objects.create(
+            name="Onions", ingredient_group="veggies_and_fruits"
+        )
+        cls.week = [
+            datetime.date(2016, 7, 11) + datetime.timedelta(i) for i in range(7)
+        ]
+
+    def get_day_ingredients(self, day, component):
+        return set(
+            Component_ingredient.objects.filter(
+                date=day, component__name=component
+            ).values_list("ingredient__name", flat=True)
+        )
+
+    def test_plan_week(self):
+        dishes = ["Ginger pork", "Coq au vin"] * 3 + ["Fish chowder"]
+        Menu.objects.plan_menus(
+            MenuPlan(date=day, main_dish=dish) for day, dish in zip(self.week, dishes)
+        )
+        self.assertEqual(Menu.objects.filter(date__in=self.week).count(), 7)
+        for day, dish in zip(self.week, dishes):
+            menu = Menu.objects.get(date=day)
+            menu_dish = menu.components.get(component_group="main_dish")
+            self.assertEqual(menu_dish.name, dish)
+            # The main dish, the sides and the six other groups.
+            self.assertEqual(menu.components.count(), 8)
+            self.assertEqual(
+                self.get_day_ingredients(day, dish),
+                {i.name for i in Component.get_recipe_ingredients(menu_dish.id)},
+            )
+
+    def test_plan_overrides(self):
+        Component_ingredient.objects.create(
+            component=self.sides, ingredient=self.onions, date=self.week[1]
+        )
+        pepper = Ingredient.objects.get(name="Pepper")
+        Menu.objects.plan_menus(
+            [
+                MenuPlan(
+                    date=self.week[0],
+                    main_dish="Ginger pork",
+                    ingredients=[pepper.id],
+                    sides_ingredients=[self.onions.id],
+                ),
+                MenuPlan(date=self.week[1], main_dish="Coq au vin", ingredients=[]),
+            ]
+        )
+        self.assertEqual(
+            self.get_day_ingredients(self.week[0], "Ginger pork"), {"Pepper"}
+        )
+        self.assertEqual(self.get_day_ingredients(self.week[0], "Sides"), {"Onions"})
+        self.assertEqual(self.get_day_ingredients(self.week[1], "Coq au vin"), set())
+        # The sides of the day are kept when no sides ingredients are given.
+        self.assertEqual(self.get_day_ingredients(self.week[1], "Sides"), {"Onions"})
+
+    def test_plan_again(self):
+        """Planning a date again replaces its menu and ingredients."""
+        Menu.objects.create(date=self.week[0])
+        Menu.objects.plan_menus([MenuPlan(date=self.week[0], main_dish="Ginger pork")])
+        Menu.objects.plan_menus([MenuPlan(date=self.week[0], main_dish="Coq au vin")])
+        menu = Menu.objects.get(date=self.week[0])
+        names = [c.name for c in menu.components.all()]
+        self.assertIn("Coq au vin", names)
+        self.assertNotIn("Ginger pork", names)
+        self.assertEqual(self.get_day_ingredients(self.week[0], "Ginger pork"), set())
+
+    def test_constant_queries(self):
+        """The number of queries does not depend on the number of dates."""
+        with CaptureQueriesContext(connection) as one_day:
+            Menu.objects.plan_menus(
+                [MenuPlan(date=datetime.date(2016, 7, 4), main_dish="Ginger pork")]
+            )
+        with CaptureQueriesContext(connection) as week:
+            Menu.objects.plan_menus(
+                [MenuPlan(date=day, main_dish="Ginger pork") for day in self.week]
+            )
+        self.assertEqual(len(week), len(one_day))
+
+    def test_invalid_plans(self):
+        """Invalid plans are all reported and nothing is written."""
+        with self.assertRaises(ValidationError) as cm:
+            Menu.objects.plan_menus(
+                [
+                    MenuPlan(date=self.week[0], main_dish="Ginger pork"),
+                    MenuPlan(date=self.week[0], main_dish="Day s Dessert"),
+                    MenuPlan(
+                        date=self.week[1], main_dish="Coq au vin", ingredients=[0]
+                    ),
+                ]
+            )
+        self.assertEqual(
+            [e.code for e in cm.exception.error_list],
+            ["duplicate_dates", "unknown_main_dishes", "unknown_ingredients"],
+        )
+        self.assertFalse(Menu.objects.filter(date__in=self.week).exists())
+        self.assertFalse(Component_ingredient.objects.filter(date__in=self.week))
+
+
 class Restricted_itemTestCase(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -261,3 +378,77 @@ class MealAdminTestCase(TestCase):
     def test_restricted_item_search(self):
         response = self.client.get("/admin/meal/restricted_item/?q=ea")
         self.assertTrue(b"eef" in response.content)
+
+
+class LoadReferenceDataTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with open(REFERENCE_DATA_FILE) as f:
+            cls.data = json.load(f)
+
+    def load(self, **options):
+        out = StringIO()
+        call_command("loadreferencedata", stdout=out, **options)
+        return out.getvalue()
+
+    def test_load(self):
+        self.load()
+        self.assertEqual(Ingredient.objects.count(), len(self.data["ingredients"]))
+        self.assertEqual(Component.objects.count(), len(self.data["components"]))
+        self.assertEqual(
+            Component_ingredient.objects.filter(date=None).count(),
+            sum(len(c["ingredients"]) for c in self.data["components"]),
+        )
+        self.assertEqual(
+            Restricted_item.objects.count(), len(self.data["restricted_items"])
+        )
+        self.assertEqual(
+            Incompatibility.objects.count(),
+            sum(len(r["ingredients"]) for r in self.data["restricted_items"]),
+        )
+
+    def test_load_again(self):
+        """Loading the data again changes nothing."""
+        self.load()
+        out = self.load()
+        self.assertIn("Ingredients: 0 created, 0 updated.", out)
+        self.assertIn("Component ingredients: 0 created.", out)
+        self.assertIn("Incompatibilities: 0 created.", out)
+        self.assertEqual(Ingredient.objects.count(), len(self.data["ingredients"]))
+
+    def test_update_existing(self):
+        """The existing rows are kept and their group is updated."""
+        entry = self.data["ingredients"][0]
+        ingredient = Ingredient.objects.create(
+            name=entry["name"], ingredient_group="oils_and_sauces"
+        )
+        out = self.load()
+        self.assertIn("1 updated.", out.splitlines()[0])
+        ingredient.refresh_from_db()
+        self.assertEqual(ingredient.ingredient_group, entry["ingredient_group"])
+        self.assertEqual(Ingredient.objects.filter(name=entry["name"]).count(), 1)
+
+    def test_invalid_file(self):
+        """A file with an unknown group or ingredient loads nothing."""
+        data = {
+            "ingredients": [{"name": "Kale", "ingredient_group": "greens"}],
+            "components": [
+                {"name": "Soup", "component_group": "main_dish", "ingredients": []}
+            ],
+            "restricted_items": [
+                {
+                    "name": "Kale",
+                    "restricted_item_group": "vegetables",
+                    "description": "",
+                    "ingredients": ["Cabbage"],
+                }
+            ],
+        }
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(data, f)
+        self.addCleanup(os.remove, f.name)
+        with self.assertRaises(CommandError) as cm:
+            self.load(file=f.name)
+        self.assertIn("invalid ingredient_group greens", str(cm.exception))
+        self.assertIn("unknown ingredient Cabbage", str(cm.exception))
+        self.assertFalse(Ingredient.objects.exists())
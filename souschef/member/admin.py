@@ -4,12 +4,17 @@ from souschef.member.models import (
     Address,
     Client,
     ClientScheduledStatus,
+    ClientStatusInterval,
     Contact,
     DeliveryHistory,
+    DeliveryStop,
     Member,
     Option,
+    PostalCodeLocation,
     Relationship,
     Route,
+    RouteStop,
+    StreetSegment,
 )
 
 
@@ -38,6 +43,18 @@ class RelationshipInline(admin.TabularInline):
     extra = 0
 
 
+class RouteStopInline(admin.TabularInline):
+    model = RouteStop
+    raw_id_fields = ["client"]
+    extra = 0
+
+
+class DeliveryStopInline(admin.TabularInline):
+    model = DeliveryStop
+    raw_id_fields = ["client"]
+    extra = 0
+
+
 @admin.register(Member)
 class MemberAdmin(admin.ModelAdmin):
     search_fields = ["lastname", "firstname"]
@@ -91,8 +108,19 @@ class RelationshipAdmin(admin.ModelAdmin):
     list_display = ("__str__", "member", "type", "nature", "client", "extra_fields")
 
 
+@admin.register(Route)
+class RouteAdmin(admin.ModelAdmin):
+    inlines = [RouteStopInline]
+
+
+@admin.register(DeliveryHistory)
+class DeliveryHistoryAdmin(admin.ModelAdmin):
+    inlines = [DeliveryStopInline]
+
+
 admin.site.register(ClientScheduledStatus)
-admin.site.register(Route)
-admin.site.register(DeliveryHistory)
+admin.site.register(ClientStatusInterval)
 admin.site.register(Address)
 admin.site.register(Option)
+admin.site.register(PostalCodeLocation)
+admin.site.register(StreetSegment)
@@ -1,8 +1,38 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, pre_save
 
 
 class MemberConfig(AppConfig):
     name = "souschef.member"
 
     def ready(self):
-        pass
+        from .models import (
+            Address,
+            Client,
+            Member,
+            record_client_status,
+            set_address_grid_cell,
+            set_member_search_key,
+        )
+        from .sequences import update_route_sequences
+
+        pre_save.connect(
+            set_member_search_key,
+            sender=Member,
+            dispatch_uid="pre_save.set_member_search_key",
+        )
+        pre_save.connect(
+            set_address_grid_cell,
+            sender=Address,
+            dispatch_uid="pre_save.set_address_grid_cell",
+        )
+        post_save.connect(
+            record_client_status,
+            sender=Client,
+            dispatch_uid="post_save.record_client_status",
+        )
+        post_save.connect(
+            update_route_sequences,
+            sender=Client,
+            dispatch_uid="post_save.update_route_sequences",
+        )
@@ -1,4 +1,3 @@
-from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from django_filters import (
     CharFilter,
@@ -8,7 +7,7 @@ from django_filters import (
 )
 
 from souschef.member.constants import DELIVERY_TYPE
-from souschef.member.models import Client, ClientScheduledStatus
+from souschef.member.models import Client, ClientScheduledStatus, search_by_name
 
 
 class ClientScheduledStatusFilter(FilterSet):
@@ -32,14 +31,4 @@ class ClientFilter(FilterSet):
         if not value:
             return queryset
 
-        name_contains = Q()
-        names = value.split(" ")
-
-        for name in names:
-            firstname_contains = Q(member__firstname__icontains=name)
-
-            lastname_contains = Q(member__lastname__icontains=name)
-
-            name_contains |= firstname_contains | lastname_contains
-
-        return queryset.filter(name_contains)
+        return search_by_name(queryset, value, prefix="member__")
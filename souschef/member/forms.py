@@ -29,6 +29,7 @@ from souschef.member.models import (
     Route,
 )
 from souschef.order.constants import SIZE_CHOICES
+from souschef.sous_chef.registry import get_registry
 
 
 class ClientBasicInformation(forms.Form):
@@ -173,6 +174,13 @@ class ClientRestrictionsInformation(forms.Form):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # The choices are read from the registry instead of the database.
+        registry = get_registry()
+        self.fields["restrictions"].choices = registry.restricted_item_choices
+        self.fields["food_preparation"].choices = registry.preparation_choices
+        self.fields["ingredient_to_avoid"].choices = registry.ingredient_choices
+        self.fields["dish_to_avoid"].choices = registry.component_choices
+
         for day, _translation in DAYS_OF_WEEK:
             self.fields[f"size_{day}"] = forms.ChoiceField(
                 choices=SIZE_CHOICES, widget=forms.Select(), required=False
@@ -618,3 +626,41 @@ class ClientScheduledStatusForm(forms.ModelForm):
                 callback_add_message(
                     _("The end date of this status change has been scheduled.")
                 )
+
+
+class ClientSequenceForm(forms.ModelForm):
+    """
+    The form of a route or a delivery, with its sequence of clients given
+    as a JSON list of ids.
+    """
+
+    client_id_sequence = forms.JSONField(required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.initial.setdefault("client_id_sequence", self.instance.client_id_sequence)
+
+    def clean_client_id_sequence(self):
+        client_ids = self.cleaned_data["client_id_sequence"]
+        if client_ids is None:
+            raise forms.ValidationError(
+                self.fields["client_id_sequence"].error_messages["required"],
+                code="required",
+            )
+        if not isinstance(client_ids, list) or not all(
+            isinstance(pk, int) for pk in client_ids
+        ):
+            raise forms.ValidationError(
+                _("The sequence must be a list of client IDs."), code="invalid"
+            )
+        return client_ids
+
+    def save(self, commit=True):
+        self.instance.client_id_sequence = self.cleaned_data["client_id_sequence"]
+        return super().save(commit)
+
+
+class RouteForm(ClientSequenceForm):
+    class Meta:
+        model = Route
+        fields = ["name", "description", "vehicle"]
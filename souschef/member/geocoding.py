@@ -0,0 +1,270 @@
+"""
+Offline geocoding of the addresses with a local gazetteer.
+
+The gazetteer is loaded from a CSV file (see `load_gazetteer`) into the
+`PostalCodeLocation` and `StreetSegment` tables. Each row is either the
+location of a postal code:
+
+    postal_code;H2X 1Y4;;;45.512345;-73.571234;;
+
+or a range of numbers of a street, with the locations of its ends:
+
+    street;Rue Saint-Urbain;3601;3699;45.512345;-73.571234;45.513456;-73.572345
+
+An address is located by interpolating its number along a segment of its
+street, or else at the location of its postal code. No network call is
+made: the gazetteer rows needed by a batch of addresses are read with two
+queries, and the locations are memoised.
+"""
+
+import collections
+import csv
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal
+from itertools import batched
+
+from django.db import transaction
+
+from souschef.member.models import (
+    Address,
+    PostalCodeLocation,
+    StreetSegment,
+    normalize_search_text,
+)
+
+SOURCE_STREET = "street"
+SOURCE_POSTAL_CODE = "postal_code"
+
+POSTAL_CODE_RE = re.compile(r"^[A-Z]\d[A-Z]\d[A-Z]\d$")
+
+LEADING_NUMBER_RE = re.compile(r"^\s*(\d+)\s*[,-]?\s*(.*)$")
+
+# The usual abbreviations of the street names.
+STREET_ABBREVIATIONS = {
+    "av": "avenue",
+    "ave": "avenue",
+    "boul": "boulevard",
+    "blvd": "boulevard",
+    "ch": "chemin",
+    "st": "saint",
+    "ste": "sainte",
+}
+
+# The type of most streets, often left out.
+STREET_DEFAULT_TYPE = "rue"
+
+COORDINATE_PRECISION = Decimal("0.000001")
+
+
+def normalize_postal_code(postal_code):
+    """`postal_code` uppercased without spaces, or "" if it is invalid."""
+    postal_code = re.sub(r"\s+", "", postal_code or "").upper()
+    return postal_code if POSTAL_CODE_RE.match(postal_code) else ""
+
+
+def normalize_street(street):
+    """
+    The street name casefolded, without accents and punctuation, with the
+    usual abbreviations expanded and without the default type: "St-Urbain"
+    and "Rue Saint-Urbain" give "saint urbain".
+    """
+    return " ".join(
+        STREET_ABBREVIATIONS.get(word, word)
+        for word in normalize_search_text(street).split()
+        if word != STREET_DEFAULT_TYPE
+    )
+
+
+def split_street_number(address):
+    """
+    The number and the normalized street of `address`, the number being
+    possibly entered with the street ("3601 rue Saint-Urbain").
+    """
+    number, street = address.number, address.street or ""
+    match = LEADING_NUMBER_RE.match(street)
+    if match:
+        number = number or int(match.group(1))
+        street = match.group(2)
+    return number, normalize_street(street)
+
+
+@transaction.atomic
+def load_gazetteer(path, delimiter=";"):
+    """
+    Replace the gazetteer with the rows of the CSV file at `path`; the lines
+    starting with # are ignored. Returns the numbers of postal codes and of
+    street segments loaded. Raises ValueError for an invalid row.
+    """
+    postal_codes = {}
+    segments = []
+    with open(path, newline="") as f:
+        for line, row in enumerate(csv.reader(f, delimiter=delimiter), start=1):
+            if not row or row[0].startswith("#"):
+                continue
+            try:
+                if row[0] == "postal_code":
+                    postal_code = normalize_postal_code(row[1])
+                    if not postal_code:
+                        raise ValueError(f"invalid postal code {row[1]!r}")
+                    postal_codes[postal_code] = PostalCodeLocation(
+                        postal_code=postal_code,
+                        latitude=Decimal(row[4]),
+                        longitude=Decimal(row[5]),
+                    )
+                elif row[0] == "street":
+                    segment = StreetSegment(
+                        street=normalize_street(row[1]),
+                        number_from=int(row[2]),
+                        number_to=int(row[3]),
+                        latitude_from=Decimal(row[4]),
+                        longitude_from=Decimal(row[5]),
+                        latitude_to=Decimal(row[6]),
+                        longitude_to=Decimal(row[7]),
+                    )
+                    if not segment.street or segment.number_from > segment.number_to:
+                        raise ValueError("invalid street segment")
+                    segments.append(segment)
+                else:
+                    raise ValueError(f"unknown row type {row[0]!r}")
+            except (IndexError, ArithmeticError, ValueError) as e:
+                # Decimal raises an ArithmeticError for an invalid number.
+                raise ValueError(f"Line {line}: {e or 'invalid row'}.") from e
+
+    PostalCodeLocation.objects.all().delete()
+    StreetSegment.objects.all().delete()
+    PostalCodeLocation.objects.bulk_create(postal_codes.values(), batch_size=1000)
+    StreetSegment.objects.bulk_create(segments, batch_size=1000)
+    return len(postal_codes), len(segments)
+
+
+@dataclass
+class Location:
+    latitude: Decimal
+    longitude: Decimal
+    source: str
+
+
+def interpolate(segment, number):
+    """The location of `number` along `segment`."""
+    if segment.number_to == segment.number_from:
+        ratio = Decimal(0)
+    else:
+        ratio = Decimal(number - segment.number_from) / (
+            segment.number_to - segment.number_from
+        )
+    return Location(
+        latitude=(
+            segment.latitude_from
+            + ratio * (segment.latitude_to - segment.latitude_from)
+        ).quantize(COORDINATE_PRECISION),
+        longitude=(
+            segment.longitude_from
+            + ratio * (segment.longitude_to - segment.longitude_from)
+        ).quantize(COORDINATE_PRECISION),
+        source=SOURCE_STREET,
+    )
+
+
+class Geocoder:
+    """
+    Locate addresses with the gazetteer. `prepare` reads the gazetteer rows
+    of a batch of addresses, `locate` memoises the locations by number,
+    street and postal code.
+    """
+
+    def __init__(self):
+        self.postal_codes = {}
+        self.segments = collections.defaultdict(list)
+        self.prepared_postal_codes = set()
+        self.prepared_streets = set()
+        self.memo = {}
+
+    def prepare(self, addresses):
+        streets = set()
+        postal_codes = set()
+        for address in addresses:
+            streets.add(split_street_number(address)[1])
+            postal_codes.add(normalize_postal_code(address.postal_code))
+        streets -= self.prepared_streets
+        postal_codes -= self.prepared_postal_codes
+        if streets:
+            for segment in StreetSegment.objects.filter(street__in=streets):
+                self.segments[segment.street].append(segment)
+            self.prepared_streets |= streets
+        if postal_codes:
+            self.postal_codes.update(
+                (location.postal_code, location)
+                for location in PostalCodeLocation.objects.filter(
+                    postal_code__in=postal_codes
+                )
+            )
+            self.prepared_postal_codes |= postal_codes
+
+    def locate(self, address):
+        """The `Location` of `address`, or None if it is not found."""
+        number, street = split_street_number(address)
+        postal_code = normalize_postal_code(address.postal_code)
+        key = (number, street, postal_code)
+        if key not in self.memo:
+            if (
+                street not in self.prepared_streets
+                or postal_code not in self.prepared_postal_codes
+            ):
+                self.prepare([address])
+            self.memo[key] = self.find(number, street, postal_code)
+        return self.memo[key]
+
+    def find(self, number, street, postal_code):
+        if number is not None:
+            segments = [
+                segment
+                for segment in self.segments.get(street, ())
+                if segment.number_from <= number <= segment.number_to
+            ]
+            if segments:
+                # The narrowest range on the same side of the street.
+                segment = min(
+                    segments,
+                    key=lambda s: (
+                        (s.number_from - number) % 2,
+                        s.number_to - s.number_from,
+                    ),
+                )
+                return interpolate(segment, number)
+        location = self.postal_codes.get(postal_code)
+        if location is not None:
+            return Location(location.latitude, location.longitude, SOURCE_POSTAL_CODE)
+        return None
+
+
+@dataclass
+class GeocodingResult:
+    # The number of addresses located, by source.
+    located: collections.Counter = field(default_factory=collections.Counter)
+    not_found: list[Address] = field(default_factory=list)
+
+
+def geocode_addresses(addresses, batch_size=1000, save=True):
+    """
+    Locate `addresses` with the gazetteer and save their coordinates, batch
+    by batch, with bulk updates.
+    """
+    geocoder = Geocoder()
+    result = GeocodingResult()
+    for batch in batched(addresses, batch_size, strict=False):
+        geocoder.prepare(batch)
+        located = []
+        for address in batch:
+            location = geocoder.locate(address)
+            if location is None:
+                result.not_found.append(address)
+                continue
+            address.latitude = location.latitude
+            address.longitude = location.longitude
+            address.update_grid_cell()
+            located.append(address)
+            result.located[location.source] += 1
+        if save:
+            Address.objects.bulk_update(located, ["latitude", "longitude", "grid_cell"])
+    return result
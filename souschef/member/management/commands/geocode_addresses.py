@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from souschef.member.geocoding import (
+    SOURCE_POSTAL_CODE,
+    SOURCE_STREET,
+    geocode_addresses,
+    load_gazetteer,
+)
+from souschef.member.models import Address
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the coordinates of the addresses from the local gazetteer, "
+        "without network calls, and list the addresses not found."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--gazetteer",
+            help="Replace the gazetteer with this CSV file before geocoding "
+            "(see souschef/member/geocoding.py for its format).",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Geocode all the addresses, not only those without coordinates "
+            "(or at 0, 0).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the results without saving the coordinates.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            default=1000,
+            type=int,
+            help="The number of addresses geocoded at once.",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        if options["gazetteer"]:
+            try:
+                postal_codes, segments = load_gazetteer(options["gazetteer"])
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot load the gazetteer: {e}") from e
+            self.stdout.write(
+                f"Gazetteer loaded: {postal_codes} postal codes, "
+                f"{segments} street segments."
+            )
+
+        addresses = Address.objects.filter(member__isnull=False).select_related(
+            "member"
+        )
+        if not options["all"]:
+            # (0, 0) is the initial value of the address forms.
+            addresses = addresses.filter(
+                Q(latitude__isnull=True)
+                | Q(longitude__isnull=True)
+                | Q(latitude=0, longitude=0)
+            )
+        result = geocode_addresses(
+            addresses.order_by("pk").iterator(chunk_size=options["batch_size"]),
+            batch_size=options["batch_size"],
+            save=not options["dry_run"],
+        )
+
+        for address in result.not_found:
+            self.stdout.write(
+                self.style.WARNING(f"Not found: {address.member} ({address}).")
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{sum(result.located.values())} addresses located "
+                f"({result.located[SOURCE_STREET]} by street number, "
+                f"{result.located[SOURCE_POSTAL_CODE]} by postal code), "
+                f"{len(result.not_found)} to locate manually, in "
+                f"{time.perf_counter() - start:.2f}s."
+            )
+        )
@@ -1,7 +1,5 @@
-from datetime import (
-    date,
-    datetime,
-)
+import time
+from datetime import datetime
 
 from django.core.management.base import BaseCommand
 
@@ -13,28 +11,29 @@ class Command(BaseCommand):
         queued in «member_ClientScheduledStatus» table."
 
     def handle(self, *args, **options):
-        # List all change not processed, and older or equal to now
-        changes = ClientScheduledStatus.objects.filter(
-            operation_status=ClientScheduledStatus.TOBEPROCESSED
-        ).filter(change_date__lte=date.today())
+        start = time.perf_counter()
+        # Process all the changes not processed, older or equal to today
+        processed, errors = ClientScheduledStatus.objects.process_due_changes()
+        duration = time.perf_counter() - start
 
-        # For each change to be processed,
-        for scheduled_change in changes:
-            if scheduled_change.process():
-                suc_msg = (
-                    f": client «{scheduled_change.client.member}» status updated "
-                    f"from {scheduled_change.get_status_from_display()} to "
-                    f"{scheduled_change.get_status_to_display()}."
-                )
-                self.stdout.write(self.style.SUCCESS(str(datetime.now()) + suc_msg))
-            # If not, mark change as processed with error
-            else:
-                err_msg = (
-                    f": client «{scheduled_change.client.member}» status not updated."
-                )
-                err_msg += (
-                    " Current status is "
-                    f"«{scheduled_change.client.get_status_display()}», should be "
-                    f"«{scheduled_change.get_status_from_display()}»."
-                )
-                self.stdout.write(self.style.ERROR(str(datetime.now()) + err_msg))
+        for scheduled_change in processed:
+            suc_msg = (
+                f": client «{scheduled_change.client.member}» status updated "
+                f"from {scheduled_change.get_status_from_display()} to "
+                f"{scheduled_change.get_status_to_display()}."
+            )
+            self.stdout.write(self.style.SUCCESS(str(datetime.now()) + suc_msg))
+        # The changes not applied are marked as processed with error
+        for scheduled_change in errors:
+            err_msg = f": client «{scheduled_change.client.member}» status not updated."
+            err_msg += (
+                " Current status is "
+                f"«{scheduled_change.client.get_status_display()}», should be "
+                f"«{scheduled_change.get_status_from_display()}»."
+            )
+            self.stdout.write(self.style.ERROR(str(datetime.now()) + err_msg))
+
+        self.stdout.write(
+            f"{datetime.now()}: {len(processed)} scheduled status changes "
+            f"processed, {len(errors)} in error, in {duration:.2f}s."
+        )
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from souschef.member.models import Client
+from souschef.member.spatial import SpatialIndex
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the clients far from the other clients of their route to the "
+        "route best fit for their address."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--margin",
+            default=1.0,
+            type=float,
+            help="How much closer, in km, the suggested route must be to move "
+            "a client whose route has other clients nearby.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the clients to move without moving them.",
+        )
+
+    def handle(self, *args, **options):
+        outliers = SpatialIndex.load().find_outliers(margin=options["margin"])
+        clients = Client.objects.select_related("member").in_bulk(
+            [client_id for client_id, current, best in outliers]
+        )
+
+        moved = []
+        for client_id, current, best in outliers:
+            client = clients[client_id]
+            self.stdout.write(
+                f"{client.member}: {current.route} -> {best.route} "
+                f"({current.score - best.score:.1f} km closer)."
+            )
+            client.route = best.route
+            moved.append(client)
+
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.SUCCESS(f"{len(moved)} clients to move (dry run).")
+            )
+            return
+        with transaction.atomic():
+            for client in moved:
+                # Saved one by one to update the delivery sequences.
+                client.save(update_fields=["route"])
+        self.stdout.write(self.style.SUCCESS(f"{len(moved)} clients moved."))
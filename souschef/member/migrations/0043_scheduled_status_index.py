@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-19 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("member", "0042_country_code_region_code"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="clientscheduledstatus",
+            index=models.Index(
+                fields=["operation_status", "change_date"],
+                name="member_sched_opstatus_date_idx",
+            ),
+        ),
+    ]
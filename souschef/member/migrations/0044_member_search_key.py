@@ -0,0 +1,40 @@
+# Generated by Django 5.2.9 on 2026-10-19 11:25
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+# A copy of `member.models.normalize_search_text` at the time of the migration.
+def normalize_search_text(text):
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(word for word in re.split(r"[\W_]+", text.casefold()) if word)
+
+
+def fill_search_keys(apps, schema_editor):
+    Member = apps.get_model("member", "Member")
+    members = list(Member.objects.only("firstname", "lastname"))
+    for member in members:
+        member.search_key = normalize_search_text(
+            f"{member.firstname} {member.lastname}"
+        )[:101]
+    Member.objects.bulk_update(members, ["search_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("member", "0043_scheduled_status_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="member",
+            name="search_key",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=101
+            ),
+        ),
+        migrations.RunPython(fill_search_keys, reverse_code=migrations.RunPython.noop),
+    ]
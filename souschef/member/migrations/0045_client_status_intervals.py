@@ -0,0 +1,110 @@
+# Generated by Django 5.2.9 on 2026-10-19 12:32
+
+import collections
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_status_intervals(apps, schema_editor):
+    """
+    Rebuild the status history of the clients from their processed
+    scheduled changes. The current status is considered to start at the
+    last change, or at the creation of the client.
+    """
+    Client = apps.get_model("member", "Client")
+    ClientScheduledStatus = apps.get_model("member", "ClientScheduledStatus")
+    ClientStatusInterval = apps.get_model("member", "ClientStatusInterval")
+    changes = collections.defaultdict(list)
+    for client_id, status_from, change_date in (
+        ClientScheduledStatus.objects.filter(operation_status="PRO")
+        .order_by("change_date", "id")
+        .values_list("client_id", "status_from", "change_date")
+    ):
+        changes[client_id].append((status_from, change_date))
+
+    intervals = []
+    for client_id, status, created_at in Client.objects.values_list(
+        "id", "status", "member__created_at"
+    ):
+        valid_from = created_at.date()
+        for status_from, change_date in changes[client_id]:
+            if change_date > valid_from:
+                intervals.append(
+                    ClientStatusInterval(
+                        client_id=client_id,
+                        status=status_from,
+                        valid_from=valid_from,
+                        valid_to=change_date,
+                    )
+                )
+                valid_from = change_date
+        intervals.append(
+            ClientStatusInterval(
+                client_id=client_id, status=status, valid_from=valid_from
+            )
+        )
+    ClientStatusInterval.objects.bulk_create(intervals, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("member", "0044_member_search_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClientStatusInterval",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("D", "Pending"),
+                            ("A", "Active"),
+                            ("S", "Paused"),
+                            ("N", "Stop: no contact"),
+                            ("C", "Stop: contact"),
+                            ("I", "Deceased"),
+                        ],
+                        max_length=1,
+                    ),
+                ),
+                ("valid_from", models.DateField()),
+                ("valid_to", models.DateField(blank=True, null=True)),
+                (
+                    "client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="status_intervals",
+                        to="member.client",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["client", "valid_from"],
+                "indexes": [
+                    models.Index(
+                        fields=["client", "valid_from"],
+                        name="member_status_client_from_idx",
+                    ),
+                    models.Index(
+                        fields=["valid_to", "valid_from"],
+                        name="member_status_to_from_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(
+            fill_status_intervals, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.9 on 2026-10-19 12:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("member", "0045_client_status_intervals"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostalCodeLocation",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("postal_code", models.CharField(max_length=6, unique=True)),
+                ("latitude", models.DecimalField(decimal_places=6, max_digits=9)),
+                ("longitude", models.DecimalField(decimal_places=6, max_digits=9)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="StreetSegment",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("street", models.CharField(max_length=100)),
+                ("number_from", models.PositiveIntegerField()),
+                ("number_to", models.PositiveIntegerField()),
+                ("latitude_from", models.DecimalField(decimal_places=6, max_digits=9)),
+                ("longitude_from", models.DecimalField(decimal_places=6, max_digits=9)),
+                ("latitude_to", models.DecimalField(decimal_places=6, max_digits=9)),
+                ("longitude_to", models.DecimalField(decimal_places=6, max_digits=9)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["street", "number_from"],
+                        name="member_segment_street_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.9 on 2026-10-19 12:50
+
+import decimal
+
+from django.db import migrations, models
+
+GRID_CELL_SIZE = decimal.Decimal("0.01")
+
+
+# A copy of `member.models.get_grid_cell` at the time of the migration.
+def get_grid_cell(latitude, longitude):
+    try:
+        latitude = decimal.Decimal(str(latitude))
+        longitude = decimal.Decimal(str(longitude))
+    except (ArithmeticError, ValueError):
+        return ""
+    if not (latitude.is_finite() and longitude.is_finite()) or (
+        not latitude and not longitude
+    ):
+        return ""
+    row = int((latitude / GRID_CELL_SIZE).to_integral_value(decimal.ROUND_FLOOR))
+    column = int((longitude / GRID_CELL_SIZE).to_integral_value(decimal.ROUND_FLOOR))
+    return f"{row}:{column}"
+
+
+def fill_grid_cells(apps, schema_editor):
+    Address = apps.get_model("member", "Address")
+    addresses = list(
+        Address.objects.filter(latitude__isnull=False, longitude__isnull=False).only(
+            "latitude", "longitude"
+        )
+    )
+    for address in addresses:
+        address.grid_cell = get_grid_cell(address.latitude, address.longitude)
+    Address.objects.bulk_update(addresses, ["grid_cell"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("member", "0046_gazetteer"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="address",
+            name="grid_cell",
+            field=models.CharField(
+                blank=True, db_index=True, default="", editable=False, max_length=20
+            ),
+        ),
+        migrations.RunPython(fill_grid_cells, reverse_code=migrations.RunPython.noop),
+    ]
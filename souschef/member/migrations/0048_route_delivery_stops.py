@@ -0,0 +1,165 @@
+# Generated by Django 5.2.9 on 2026-10-19 13:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def get_sequence(value, client_ids):
+    """The ids of the existing clients in a JSON sequence, without duplicates."""
+    if not isinstance(value, list):
+        return []
+    return list(
+        dict.fromkeys(
+            client_id
+            for client_id in value
+            if isinstance(client_id, int)
+            and not isinstance(client_id, bool)
+            and client_id in client_ids
+        )
+    )
+
+
+def copy_sequences(apps, schema_editor):
+    Client = apps.get_model("member", "Client")
+    client_ids = set(Client.objects.values_list("id", flat=True))
+    for owner_model, stop_model, owner_field in [
+        ("Route", "RouteStop", "route_id"),
+        ("DeliveryHistory", "DeliveryStop", "delivery_history_id"),
+    ]:
+        Owner = apps.get_model("member", owner_model)
+        Stop = apps.get_model("member", stop_model)
+        stops = [
+            Stop(**{owner_field: owner_id}, client_id=client_id, position=position)
+            for owner_id, value in Owner.objects.values_list(
+                "id", "client_id_sequence"
+            ).iterator()
+            for position, client_id in enumerate(get_sequence(value, client_ids))
+        ]
+        Stop.objects.bulk_create(stops, batch_size=1000)
+
+
+def copy_stops(apps, schema_editor):
+    for owner_model, stop_model, owner_field in [
+        ("Route", "RouteStop", "route_id"),
+        ("DeliveryHistory", "DeliveryStop", "delivery_history_id"),
+    ]:
+        Owner = apps.get_model("member", owner_model)
+        Stop = apps.get_model("member", stop_model)
+        sequences = {}
+        for owner_id, client_id in Stop.objects.order_by(
+            owner_field, "position"
+        ).values_list(owner_field, "client_id"):
+            sequences.setdefault(owner_id, []).append(client_id)
+        owners = list(Owner.objects.filter(pk__in=sequences).only("id"))
+        for owner in owners:
+            owner.client_id_sequence = sequences[owner.pk]
+        Owner.objects.bulk_update(owners, ["client_id_sequence"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("member", "0047_address_grid_cell"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeliveryStop",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.PositiveIntegerField()),
+                (
+                    "client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="delivery_stops",
+                        to="member.client",
+                    ),
+                ),
+                (
+                    "delivery_history",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stops",
+                        to="member.deliveryhistory",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["delivery_history", "position"],
+                "indexes": [
+                    models.Index(
+                        fields=["delivery_history", "position"],
+                        name="member_delivstop_pos_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("delivery_history", "client"),
+                        name="member_deliverystop_unique_client",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="RouteStop",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.PositiveIntegerField()),
+                (
+                    "client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="route_stops",
+                        to="member.client",
+                    ),
+                ),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stops",
+                        to="member.route",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["route", "position"],
+                "indexes": [
+                    models.Index(
+                        fields=["route", "position"], name="member_routestop_pos_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("route", "client"),
+                        name="member_routestop_unique_client",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(copy_sequences, reverse_code=copy_stops),
+        migrations.RemoveField(
+            model_name="deliveryhistory",
+            name="client_id_sequence",
+        ),
+        migrations.RemoveField(
+            model_name="route",
+            name="client_id_sequence",
+        ),
+    ]
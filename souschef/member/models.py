@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import datetime
+import decimal
 import json
+import re
+import unicodedata
 from typing import Any
 
 from annoying.fields import JSONField
-from django.db import models
-from django.db.models import Q
+from django.db import models, transaction
+from django.db.models import Case, Q, When
 from django.db.models.functions import Extract
 from django.forms import ValidationError
 from django.utils import timezone
@@ -37,6 +40,51 @@ from souschef.member.formsfield import CAPhoneNumberExtField
 from souschef.note.models import Note
 
 
+def normalize_search_text(text):
+    """
+    Return `text` casefolded, without accents and with its punctuation
+    replaced by spaces, e.g. "Hélène O'Brien-Côté" gives
+    "helene o brien cote".
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(word for word in re.split(r"[\W_]+", text.casefold()) if word)
+
+
+def search_by_name(queryset, query, prefix=""):
+    """
+    Filter `queryset` with the members whose name contains all the words
+    of `query`, ignoring the case and the accents.
+
+    `prefix` is the path from the model of `queryset` to Member, e.g.
+    "member__" for clients. The results are ranked: the names starting
+    with the query first, then the names whose words start with the words
+    of the query, then the others.
+    """
+    words = normalize_search_text(query).split()
+    if not words:
+        return queryset
+    search_key = prefix + "search_key"
+
+    contains_words = Q()
+    starts_words = Q()
+    for word in words:
+        contains_words &= Q(**{search_key + "__contains": word})
+        starts_words &= Q(**{search_key + "__startswith": word}) | Q(
+            **{search_key + "__contains": " " + word}
+        )
+    rank = Case(
+        When(Q(**{search_key + "__startswith": " ".join(words)}), then=0),
+        When(starts_words, then=1),
+        default=2,
+    )
+    return (
+        queryset.filter(contains_words)
+        .annotate(search_rank=rank)
+        .order_by("search_rank", prefix + "lastname", prefix + "firstname")
+    )
+
+
 class Member(models.Model):
     class Meta:
         verbose_name_plural = _("members")
@@ -50,6 +98,11 @@ class Member(models.Model):
 
     lastname = models.CharField(max_length=50, verbose_name=_("Last name"))
 
+    # The normalized full name, see `search_by_name`.
+    search_key = models.CharField(
+        max_length=101, editable=False, db_index=True, default=""
+    )
+
     address = models.OneToOneField(
         "member.Address",
         verbose_name=_("address"),
@@ -74,6 +127,21 @@ class Member(models.Model):
     def __str__(self):
         return f"{self.firstname} {self.lastname}"
 
+    def save(self, *args, **kwargs):
+        # The search key itself is computed by `set_member_search_key`.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"firstname", "lastname"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "search_key"}
+        super().save(*args, **kwargs)
+
+    def update_search_key(self):
+        """
+        Compute the search key from the name, e.g. before a `bulk_create`.
+        """
+        self.search_key = normalize_search_text(f"{self.firstname} {self.lastname}")[
+            : self._meta.get_field("search_key").max_length
+        ]
+
     @property
     def home_phone(self):
         try:
@@ -154,6 +222,58 @@ class Member(models.Model):
         return created
 
 
+def set_member_search_key(sender, instance, **kwargs):
+    """
+    `pre_save` handler computing the search key of a member, including when
+    it is loaded from a fixture.
+    """
+    instance.update_search_key()
+
+
+def set_address_grid_cell(sender, instance, **kwargs):
+    """
+    `pre_save` handler keeping the spatial index up to date when an address
+    is saved, including when it is loaded from a fixture.
+    """
+    instance.update_grid_cell()
+
+
+# The side of the cells of the spatial grid of the addresses, in degrees
+# (about 1.1 km north-south and 0.8 km east-west in Montreal).
+GRID_CELL_SIZE = decimal.Decimal("0.01")
+
+
+def get_grid_cell_indexes(latitude, longitude):
+    """
+    The row and column of the grid cell containing the location, or None if
+    the location is unknown.
+    """
+    try:
+        latitude = decimal.Decimal(str(latitude))
+        longitude = decimal.Decimal(str(longitude))
+    except (ArithmeticError, ValueError):
+        # Also for the empty or missing coordinates.
+        return None
+    if not (latitude.is_finite() and longitude.is_finite()) or (
+        not latitude and not longitude
+    ):
+        # (0, 0) is the initial value of the address forms.
+        return None
+    return (
+        int((latitude / GRID_CELL_SIZE).to_integral_value(decimal.ROUND_FLOOR)),
+        int((longitude / GRID_CELL_SIZE).to_integral_value(decimal.ROUND_FLOOR)),
+    )
+
+
+def get_grid_cell(latitude, longitude):
+    """
+    The key of the grid cell containing the location, e.g. "4551:-7358", or
+    "" if the location is unknown.
+    """
+    indexes = get_grid_cell_indexes(latitude, longitude)
+    return "" if indexes is None else f"{indexes[0]}:{indexes[1]}"
+
+
 class Address(models.Model):
     class Meta:
         verbose_name_plural = _("addresses")
@@ -216,6 +336,25 @@ class Address(models.Model):
         null=True,
     )
 
+    # The spatial index of the addresses, see `souschef.member.spatial`.
+    grid_cell = models.CharField(
+        max_length=20, db_index=True, default="", blank=True, editable=False
+    )
+
+    def save(self, *args, **kwargs):
+        # The grid cell itself is computed by `set_address_grid_cell`.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "grid_cell"}
+        super().save(*args, **kwargs)
+
+    def update_grid_cell(self):
+        """
+        Compute the grid cell from the coordinates, e.g. before a
+        `bulk_update`.
+        """
+        self.grid_cell = get_grid_cell(self.latitude, self.longitude)
+
     def __str__(self):
         first_line = []
         first_line.append(str(self.street))
@@ -230,6 +369,56 @@ class Address(models.Model):
         return f"{first_line}, {second_line}"
 
 
+class PostalCodeLocation(models.Model):
+    """
+    The location of a postal code, from the gazetteer loaded by the
+    `geocode_addresses` command (see `souschef.member.geocoding`).
+    """
+
+    # Without space, e.g. H3E1C2
+    postal_code = models.CharField(max_length=6, unique=True)
+
+    latitude = models.DecimalField(max_digits=9, decimal_places=6)
+
+    longitude = models.DecimalField(max_digits=9, decimal_places=6)
+
+    def __str__(self):
+        return f"{self.postal_code} ({self.latitude}, {self.longitude})"
+
+
+class StreetSegment(models.Model):
+    """
+    A range of street numbers, with the locations of its first and last
+    numbers, from the gazetteer. The numbers between are interpolated.
+    """
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["street", "number_from"],
+                name="member_segment_street_idx",
+            ),
+        ]
+
+    # Normalized by `souschef.member.geocoding.normalize_street`.
+    street = models.CharField(max_length=100)
+
+    number_from = models.PositiveIntegerField()
+
+    number_to = models.PositiveIntegerField()
+
+    latitude_from = models.DecimalField(max_digits=9, decimal_places=6)
+
+    longitude_from = models.DecimalField(max_digits=9, decimal_places=6)
+
+    latitude_to = models.DecimalField(max_digits=9, decimal_places=6)
+
+    longitude_to = models.DecimalField(max_digits=9, decimal_places=6)
+
+    def __str__(self):
+        return f"{self.number_from}-{self.number_to} {self.street}"
+
+
 class Contact(models.Model):
     class Meta:
         verbose_name_plural = _("contacts")
@@ -263,7 +452,41 @@ class Contact(models.Model):
         return f"{self.member.firstname} {self.member.lastname}"
 
 
-class Route(models.Model):
+class ClientSequenceMixin:
+    """
+    The `client_id_sequence` of a route or a delivery: the ids of its clients
+    in the order of delivery, stored as the rows of `stops`. A new sequence
+    can be assigned, e.g. from a form, and is written when the object is
+    saved, including with `update_fields=["client_id_sequence"]`. Prefetch
+    `stops` to read the sequences of several objects.
+    """
+
+    @property
+    def client_id_sequence(self):
+        pending = self.__dict__.get("_pending_client_id_sequence")
+        if pending is not None:
+            return list(pending)
+        if self.pk is None:
+            return []
+        return [stop.client_id for stop in self.stops.all()]
+
+    @client_id_sequence.setter
+    def client_id_sequence(self, client_ids):
+        self._pending_client_id_sequence = list(client_ids or [])
+
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "client_id_sequence" in update_fields:
+            kwargs["update_fields"] = set(update_fields) - {"client_id_sequence"}
+        if update_fields is None or kwargs["update_fields"]:
+            super().save(*args, **kwargs)
+        client_ids = self.__dict__.pop("_pending_client_id_sequence", None)
+        if client_ids is not None:
+            self.stops.model.objects.set_sequence(self, client_ids)
+
+
+class Route(ClientSequenceMixin, models.Model):
     class Meta:
         verbose_name_plural = _("Routes")
         ordering = ["name"]
@@ -283,15 +506,11 @@ class Route(models.Model):
         default=DEFAULT_VEHICLE,
     )
 
-    client_id_sequence = JSONField(
-        verbose_name=_("IDs of clients on this route (as a JSON list)"), default=[]
-    )
-
     def __str__(self):
         return self.name
 
 
-class DeliveryHistory(models.Model):
+class DeliveryHistory(ClientSequenceMixin, models.Model):
     class Meta:
         verbose_name = _("Delivery History")
         verbose_name_plural = _("Delivery Histories")
@@ -308,9 +527,6 @@ class DeliveryHistory(models.Model):
     vehicle = models.CharField(
         max_length=20, choices=ROUTE_VEHICLES, verbose_name=_("vehicle")
     )
-    client_id_sequence = JSONField(
-        verbose_name=_("IDs of clients on this route (as a JSON list)"), default=[]
-    )
     comments = models.TextField(
         verbose_name=_("comments"),
         blank=True,
@@ -321,16 +537,123 @@ class DeliveryHistory(models.Model):
         return f"DeliveryHistory: Route {self.route.name} delivered on {self.date}"
 
 
+class StopManager(models.Manager):
+    @transaction.atomic
+    def set_sequence(self, owner, client_ids):
+        """
+        Replace the sequence of `owner` (a route or a delivery) with
+        `client_ids`. The ids of the clients that do not exist, and the
+        repeated ones, are dropped.
+        """
+        client_ids = [pk for pk in client_ids if isinstance(pk, int)]
+        existing = set(
+            Client.objects.filter(pk__in=client_ids).values_list("pk", flat=True)
+        )
+        client_ids = [pk for pk in dict.fromkeys(client_ids) if pk in existing]
+        owner_field = self.model.owner_field
+        self.filter(**{owner_field: owner}).delete()
+        self.bulk_create(
+            self.model(**{owner_field: owner}, client_id=client_id, position=position)
+            for position, client_id in enumerate(client_ids)
+        )
+        # The prefetched sequence, if any, is outdated.
+        getattr(owner, "_prefetched_objects_cache", {}).pop("stops", None)
+
+    def insert(self, owner, client_id, position):
+        """Insert the client in the sequence of `owner` before `position`."""
+        owner_field = self.model.owner_field
+        self.filter(**{owner_field: owner, "position__gte": position}).update(
+            position=models.F("position") + 1
+        )
+        return self.create(
+            **{owner_field: owner}, client_id=client_id, position=position
+        )
+
+
+class RouteStop(models.Model):
+    """A client in the default delivery sequence of a route."""
+
+    class Meta:
+        ordering = ["route", "position"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["route", "client"], name="member_routestop_unique_client"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["route", "position"], name="member_routestop_pos_idx"),
+        ]
+
+    owner_field = "route"
+
+    route = models.ForeignKey(
+        "member.Route", on_delete=models.CASCADE, related_name="stops"
+    )
+
+    # The clients deleted are removed from the sequences.
+    client = models.ForeignKey(
+        "member.Client", on_delete=models.CASCADE, related_name="route_stops"
+    )
+
+    # From 0; there can be gaps.
+    position = models.PositiveIntegerField()
+
+    objects = StopManager()
+
+    def __str__(self):
+        return f"{self.route_id}: {self.position}. {self.client_id}"
+
+
+class DeliveryStop(models.Model):
+    """A client in the delivery sequence of a route on a given day."""
+
+    class Meta:
+        ordering = ["delivery_history", "position"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["delivery_history", "client"],
+                name="member_deliverystop_unique_client",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["delivery_history", "position"],
+                name="member_delivstop_pos_idx",
+            ),
+        ]
+
+    owner_field = "delivery_history"
+
+    delivery_history = models.ForeignKey(
+        "member.DeliveryHistory", on_delete=models.CASCADE, related_name="stops"
+    )
+
+    client = models.ForeignKey(
+        "member.Client", on_delete=models.CASCADE, related_name="delivery_stops"
+    )
+
+    position = models.PositiveIntegerField()
+
+    objects = StopManager()
+
+    def __str__(self):
+        return f"{self.delivery_history_id}: {self.position}. {self.client_id}"
+
+
 class ClientManager(models.Manager):
     def get_birthday_boys_and_girls(self):
         today = datetime.datetime.now()
 
-        clients = self.filter(
-            birthdate__year__lte=today.year,
-            birthdate__month=today.month,
-            birthdate__day__gte=today.day,
-            birthdate__day__lte=today.day + 7,
-        ).order_by(Extract("birthdate", "day"))
+        clients = (
+            self.filter(
+                birthdate__year__lte=today.year,
+                birthdate__month=today.month,
+                birthdate__day__gte=today.day,
+                birthdate__day__lte=today.day + 7,
+            )
+            .order_by(Extract("birthdate", "day"))
+            .select_related("member")
+        )
 
         today = datetime.date.today()
         for client in clients:
@@ -386,11 +709,20 @@ def get_ongoing_clients_at_date(
 ) -> list["Client"]:  # noqa: UP037
     today = today or datetime.date.today()
 
-    # This way of doing things will not work with a very large client database.
-    # Hard-to-write optimized SQL queries would be required.
+    # The planned statuses are computed in Python, from the prefetched
+    # scheduled statuses of all the clients.
+    clients = Client.objects.filter(delivery_type="O").prefetch_related(
+        models.Prefetch(
+            "scheduled_statuses",
+            queryset=ClientScheduledStatus.objects.filter(
+                change_state=ClientScheduledStatus.END,
+                operation_status=ClientScheduledStatus.TOBEPROCESSED,
+            ),
+        )
+    )
     return [
         client
-        for client in Client.objects.filter(delivery_type="O")
+        for client in clients
         if client.get_status_planned_at_date(the_date, today) == Client.ACTIVE
     ]
 
@@ -527,6 +859,22 @@ class Client(models.Model):
     contact = ContactClientManager()
     birthday_contact = BirthdayContactClientManager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        client = super().from_db(db, field_names, values)
+        if "route_id" in client.__dict__ and "status" in client.__dict__:
+            # To update the delivery sequences when the client joins or
+            # leaves a route (see `souschef.member.sequences`).
+            client._loaded_sequence_route_id = client.sequence_route_id
+        return client
+
+    @property
+    def sequence_route_id(self):
+        """The route whose delivery sequences include the client, if any."""
+        if self.status in (Client.PENDING, Client.ACTIVE, Client.PAUSED):
+            return self.route_id
+        return None
+
     @property
     def is_geolocalized(self):
         """
@@ -586,7 +934,10 @@ class Client(models.Model):
         orders = self.client_order.filter(
             status="D", delivery_date__year=year, delivery_date__month=month
         )
-        return len(orders)
+        archived_orders = self.archived_orders.filter(
+            status="D", delivery_date__year=year, delivery_date__month=month
+        )
+        return len(orders) + len(archived_orders)
 
     @property
     def upcoming_orders(self):
@@ -686,7 +1037,13 @@ class Client(models.Model):
         @param schedule
             A python list of days.
         """
-        meal_schedule_option, _ = Option.objects.get_or_create(name="meals_schedule")
+        from souschef.sous_chef.registry import get_registry
+
+        meal_schedule_option = get_registry().get_option("meals_schedule")
+        if meal_schedule_option is None:
+            meal_schedule_option, _ = Option.objects.get_or_create(
+                name="meals_schedule"
+            )
         client_option, _ = Client_option.objects.update_or_create(
             client=self,
             option=meal_schedule_option,
@@ -708,22 +1065,118 @@ class Client(models.Model):
 
         planned_status = self.status
 
-        status_changes = (
-            self.scheduled_statuses.filter(
-                change_date__gte=today,
-                change_date__lte=the_date,
-                change_state=ClientScheduledStatus.END,
-                operation_status=ClientScheduledStatus.TOBEPROCESSED,
+        if "scheduled_statuses" in getattr(self, "_prefetched_objects_cache", {}):
+            # The lists of orders prefetch the scheduled statuses to avoid
+            # running one query per order.
+            status_changes = sorted(
+                (
+                    status_change
+                    for status_change in self.scheduled_statuses.all()
+                    if today <= status_change.change_date <= the_date
+                    and status_change.change_state == ClientScheduledStatus.END
+                    and status_change.operation_status
+                    == ClientScheduledStatus.TOBEPROCESSED
+                ),
+                key=lambda status_change: status_change.change_date,
+                reverse=True,
+            )
+        else:
+            status_changes = (
+                self.scheduled_statuses.filter(
+                    change_date__gte=today,
+                    change_date__lte=the_date,
+                    change_state=ClientScheduledStatus.END,
+                    operation_status=ClientScheduledStatus.TOBEPROCESSED,
+                )
+                .order_by("-change_date")
+                .all()
             )
-            .order_by("-change_date")
-            .all()
-        )
 
         if status_changes:
             planned_status = status_changes[0].status_to
 
         return planned_status
 
+    def get_status_at_date(
+        self, the_date: datetime.date, today: datetime.date | None = None
+    ):
+        """
+        Get the `status` the client had, or will have, at date `the_date`.
+
+        The past statuses come from the status history of the client, the
+        future ones from `get_status_planned_at_date`. Before the start of
+        its history, the client is considered to have had its first status.
+
+        `today` can be overriden for unit tests.
+        """
+        today = today or datetime.date.today()
+        if the_date >= today:
+            return self.get_status_planned_at_date(the_date, today)
+
+        # The lists of orders may prefetch the intervals.
+        intervals = sorted(
+            self.status_intervals.all(), key=lambda interval: interval.valid_from
+        )
+        status = intervals[0].status if intervals else self.status
+        for interval in intervals:
+            if interval.valid_from <= the_date:
+                status = interval.status
+        return status
+
+
+class ClientScheduledStatusManager(models.Manager):
+    def process_due_changes(self, day=None):
+        """
+        Process the scheduled changes due on `day` (today by default) or
+        before, in one transaction with bulk updates.
+
+        The changes of a client are applied in order of date, so that a
+        pause that started and ended since the last run leaves the client
+        in the right status.
+
+        Returns two lists: the processed changes and the changes in error.
+        """
+        from souschef.member.sequences import update_client_sequences
+
+        day = day or datetime.date.today()
+        processed = []
+        errors = []
+        with transaction.atomic():
+            changes = (
+                self.filter(
+                    operation_status=ClientScheduledStatus.TOBEPROCESSED,
+                    change_date__lte=day,
+                )
+                .select_related("client__member")
+                .select_for_update()
+                .order_by("change_date", "id")
+            )
+            clients = {}
+            for change in changes:
+                # All the changes of a client share the same instance.
+                change.client = clients.setdefault(change.client_id, change.client)
+                if change.is_valid():
+                    change.client.status = change.status_to
+                    change.operation_status = ClientScheduledStatus.PROCESSED
+                    processed.append(change)
+                else:
+                    change.operation_status = ClientScheduledStatus.ERROR
+                    errors.append(change)
+
+            updated_clients = {
+                change.client_id: change.client for change in processed
+            }.values()
+            Client.objects.bulk_update(updated_clients, ["status"])
+            ClientStatusInterval.objects.record_changes(
+                (change.client_id, change.status_to, change.change_date)
+                for change in processed
+            )
+            # The bulk update sends no `post_save` signal.
+            update_client_sequences(updated_clients)
+            self.bulk_update(processed + errors, ["operation_status"])
+            Note.objects.bulk_create([change.make_note() for change in processed])
+        return processed, errors
+
 
 class ClientScheduledStatus(models.Model):
     START = "START"
@@ -775,8 +1228,16 @@ class ClientScheduledStatus(models.Model):
         max_length=3, choices=OPERATION_STATUS, default=TOBEPROCESSED
     )
 
+    objects = ClientScheduledStatusManager()
+
     class Meta:
         ordering = ["change_date"]
+        indexes = [
+            models.Index(
+                fields=["operation_status", "change_date"],
+                name="member_sched_opstatus_date_idx",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -800,7 +1261,11 @@ class ClientScheduledStatus(models.Model):
     def process(self):
         """Process a scheduled change if valid."""
         if self.is_valid():
-            # Update the client status
+            # Update the client status, recording the change on its date
+            # rather than on the day it is processed.
+            ClientStatusInterval.objects.record_changes(
+                [(self.client_id, self.status_to, self.change_date)]
+            )
             self.client.status = self.status_to
             self.client.save()
             # Update the instance status
@@ -821,13 +1286,16 @@ class ClientScheduledStatus(models.Model):
             and self.operation_status == self.TOBEPROCESSED
         )
 
-    def add_note_to_client(self, author=None):
-        note = Note(
-            note=self,
+    def make_note(self, author=None):
+        """Returns the (unsaved) note telling the client about this change."""
+        return Note(
+            note=str(self),
             author=author,
             client=self.client,
         )
-        note.save()
+
+    def add_note_to_client(self, author=None):
+        self.make_note(author).save()
 
     @property
     def needs_attention(self):
@@ -839,6 +1307,121 @@ class ClientScheduledStatus(models.Model):
         )
 
 
+class ClientStatusIntervalManager(models.Manager):
+    def at_date(self, the_date):
+        """The intervals of the statuses the clients had at `the_date`."""
+        return self.filter(
+            Q(valid_to__isnull=True) | Q(valid_to__gt=the_date),
+            valid_from__lte=the_date,
+        )
+
+    def get_statuses_at_date(self, the_date, clients=None) -> dict[int, str]:
+        """
+        The statuses of the clients at `the_date`, by client id. The
+        clients without history at that date are left out.
+        """
+        intervals = self.at_date(the_date)
+        if clients is not None:
+            intervals = intervals.filter(client__in=clients)
+        return dict(intervals.values_list("client_id", "status"))
+
+    def record_changes(self, changes):
+        """
+        Record status changes, given as `(client id, status, date)`: the
+        current interval of the client ends at the date, and an interval of
+        the new status starts, unless the status is unchanged.
+
+        A change dated before the start of the current interval of the
+        client is recorded at that start, since the history is not
+        rewritten.
+        """
+        changes = sorted(changes, key=lambda change: change[2])
+        current = {
+            interval.client_id: interval
+            for interval in self.filter(
+                client__in={client_id for client_id, _status, _day in changes},
+                valid_to__isnull=True,
+            )
+        }
+        updated = {}
+        created = []
+        for client_id, status, day in changes:
+            interval = current.get(client_id)
+            if interval is not None:
+                if interval.status == status:
+                    continue
+                day = max(day, interval.valid_from)
+                if day == interval.valid_from:
+                    # Changed again on the same day.
+                    interval.status = status
+                    if interval.pk:
+                        updated[interval.pk] = interval
+                    continue
+                interval.valid_to = day
+                if interval.pk:
+                    updated[interval.pk] = interval
+            current[client_id] = ClientStatusInterval(
+                client_id=client_id, status=status, valid_from=day
+            )
+            created.append(current[client_id])
+        self.bulk_update(updated.values(), ["status", "valid_to"])
+        self.bulk_create(created)
+
+
+class ClientStatusInterval(models.Model):
+    """
+    The status of a client from `valid_from` until `valid_to` (excluded),
+    or until now when `valid_to` is null.
+
+    The intervals of a client follow each other without gap. They are
+    recorded when the client is saved and when the scheduled status
+    changes are processed.
+    """
+
+    client = models.ForeignKey(
+        Client, on_delete=models.CASCADE, related_name="status_intervals"
+    )
+
+    status = models.CharField(max_length=1, choices=Client.CLIENT_STATUS)
+
+    valid_from = models.DateField()
+
+    valid_to = models.DateField(blank=True, null=True)
+
+    objects = ClientStatusIntervalManager()
+
+    class Meta:
+        ordering = ["client", "valid_from"]
+        indexes = [
+            models.Index(
+                fields=["client", "valid_from"],
+                name="member_status_client_from_idx",
+            ),
+            # Statuses of all the clients at a date.
+            models.Index(
+                fields=["valid_to", "valid_from"],
+                name="member_status_to_from_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.client.member} {self.get_status_display()} from "
+            f"{self.valid_from} to {self.valid_to or '...'}"
+        )
+
+
+def record_client_status(sender, instance, raw=False, **kwargs):
+    """
+    `post_save` handler recording the status of a client in its history,
+    except when it is loaded from a fixture.
+    """
+    if not raw:
+        ClientStatusInterval.objects.record_changes(
+            [(instance.pk, instance.status, datetime.date.today())]
+        )
+
+
 class Relationship(models.Model):
     REFERENT = "referent"
     EMERGENCY = "emergency"
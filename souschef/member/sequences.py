@@ -0,0 +1,138 @@
+"""
+Maintenance of the delivery sequences when the clients join or leave a
+route.
+
+A client joining a route is inserted in the sequence of the route (its
+`RouteStop`s) where it lengthens the tour from the kitchen the least,
+instead of being left unconfigured at the end; a client leaving a route is
+removed from its sequence. The sequences of the deliveries of the route not
+made yet (`DeliveryHistory` of today or later) are updated the same way,
+for the days the client has an order. The order chosen for the other
+clients is kept; each update reads the sequence with the coordinates of
+its clients with one query and takes linear time.
+
+A client without coordinates is not inserted and stays unconfigured.
+"""
+
+import datetime
+
+from django.db import transaction
+
+from souschef.delivery.tsp import (
+    DELIVERY_STARTING_POINT_LAT_LONG,
+    Node,
+    cheapest_insertion,
+)
+from souschef.member.models import (
+    Client,
+    DeliveryHistory,
+    DeliveryStop,
+    Route,
+    RouteStop,
+)
+from souschef.order.constants import ORDER_STATUS_ORDERED
+from souschef.order.models import Order
+
+
+def get_location(client_id):
+    """The coordinates of the client, or None if it is not located."""
+    location = (
+        Client.objects.filter(pk=client_id)
+        .values_list("member__address__latitude", "member__address__longitude")
+        .first()
+    )
+    if location is None or None in location:
+        return None
+    return float(location[0]), float(location[1])
+
+
+def get_insertion_position(stops, location):
+    """
+    The position in a sequence where a client at `location` lengthens the
+    tour the least. `stops` are the (position, latitude, longitude) of the
+    clients of the sequence, by position; the clients without coordinates
+    keep their place, the client is inserted right after a located client
+    (or the kitchen).
+    """
+    start = Node(None, *DELIVERY_STARTING_POINT_LAT_LONG)
+    tour = [start] + [
+        Node(position, float(latitude), float(longitude))
+        for position, latitude, longitude in stops
+        if latitude is not None and longitude is not None
+    ]
+    previous = tour[cheapest_insertion(tour, Node(None, *location)) - 1]
+    return 0 if previous is start else previous.id + 1
+
+
+def insert_client(owner, client_id, location):
+    """Insert the client in the sequence of `owner`, a route or a delivery."""
+    owner.stops.filter(client=client_id).delete()
+    position = get_insertion_position(
+        owner.stops.order_by("position").values_list(
+            "position",
+            "client__member__address__latitude",
+            "client__member__address__longitude",
+        ),
+        location,
+    )
+    owner.stops.model.objects.insert(owner, client_id, position)
+
+
+@transaction.atomic
+def move_client(client_id, from_route_id, to_route_id):
+    """
+    Remove the client from the sequences of `from_route_id` and insert it in
+    those of `to_route_id` (either can be None).
+    """
+    today = datetime.date.today()
+    if from_route_id is not None:
+        RouteStop.objects.filter(route=from_route_id, client=client_id).delete()
+        DeliveryStop.objects.filter(
+            delivery_history__route=from_route_id,
+            delivery_history__date__gte=today,
+            client=client_id,
+        ).delete()
+
+    location = None if to_route_id is None else get_location(client_id)
+    if location is None:
+        return
+    order_dates = Order.objects.filter(
+        client=client_id, delivery_date__gte=today, status=ORDER_STATUS_ORDERED
+    ).values("delivery_date")
+    for owner in [
+        *Route.objects.select_for_update().filter(pk=to_route_id),
+        *DeliveryHistory.objects.select_for_update().filter(
+            route=to_route_id, date__in=order_dates
+        ),
+    ]:
+        insert_client(owner, client_id, location)
+
+
+def update_route_sequences(
+    sender, instance, created, raw=False, update_fields=None, **kwargs
+):
+    """
+    `post_save` handler updating the delivery sequences when a client joins
+    or leaves a route, by changing route or status. The sequences are left
+    as they are for a client loaded without its route or status.
+    """
+    if raw or (update_fields is not None and not {"route", "status"} & update_fields):
+        return
+    if created:
+        instance._loaded_sequence_route_id = None
+    update_client_sequences([instance])
+
+
+def update_client_sequences(clients):
+    """
+    Update the delivery sequences of the `clients` saved with a new route or
+    status, e.g. by a bulk update, which sends no `post_save` signal. The
+    clients loaded without their route or status are skipped.
+    """
+    for client in clients:
+        if not hasattr(client, "_loaded_sequence_route_id"):
+            continue
+        from_route_id = client._loaded_sequence_route_id
+        to_route_id = client._loaded_sequence_route_id = client.sequence_route_id
+        if from_route_id != to_route_id:
+            move_client(client.pk, from_route_id, to_route_id)
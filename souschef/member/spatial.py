@@ -0,0 +1,273 @@
+"""
+Spatial index of the clients, and suggestion of the routes of new addresses.
+
+The addresses are bucketed in the cells of a grid of GRID_CELL_SIZE degrees
+(see `Address.grid_cell`, kept up to date when an address is saved). The
+routes suggested for a location are ranked by the distance to the nearest
+client of the route in the neighbouring cells plus the distance to the
+centroid of the clients of the route, so that a route passing by is
+preferred to a route whose clients are only close on average.
+
+Only the clients currently delivered or about to be (pending, active or
+paused) and located are indexed.
+"""
+
+import collections
+import math
+from dataclasses import dataclass
+
+from django.db.models import Avg, Count
+
+from souschef.member.models import Client, Route, get_grid_cell_indexes
+
+ROUTE_CLIENT_STATUSES = [Client.PENDING, Client.ACTIVE, Client.PAUSED]
+
+# The number of rings of cells searched around a location for the nearest
+# clients: 2 covers at least 1.6 km around it.
+SEARCH_RADIUS = 2
+
+# Kilometres by degree of latitude.
+KM_BY_DEGREE = 111.2
+
+
+def distance_km(latitude1, longitude1, latitude2, longitude2):
+    """
+    The distance between two locations in kilometres, with the
+    equirectangular approximation, precise enough across a city.
+    """
+    x = (longitude2 - longitude1) * math.cos(math.radians((latitude1 + latitude2) / 2))
+    y = latitude2 - latitude1
+    return KM_BY_DEGREE * math.hypot(x, y)
+
+
+def neighbouring_cells(latitude, longitude, radius=SEARCH_RADIUS):
+    """The keys of the grid cells within `radius` cells of the location."""
+    indexes = get_grid_cell_indexes(latitude, longitude)
+    if indexes is None:
+        return []
+    row, column = indexes
+    return [
+        f"{row + i}:{column + j}"
+        for i in range(-radius, radius + 1)
+        for j in range(-radius, radius + 1)
+    ]
+
+
+def indexed_clients():
+    return Client.objects.filter(
+        status__in=ROUTE_CLIENT_STATUSES,
+        route__isnull=False,
+        member__address__latitude__isnull=False,
+        member__address__longitude__isnull=False,
+    ).exclude(member__address__grid_cell="")
+
+
+@dataclass
+class Point:
+    client_id: int
+    route_id: int
+    latitude: float
+    longitude: float
+
+
+@dataclass
+class RouteSuggestion:
+    route: Route
+    # The number of clients of the route.
+    clients: int
+    # In kilometres; None if the route has no client near the location.
+    nearest_distance: float | None
+    centroid_distance: float
+
+    @property
+    def score(self):
+        if self.nearest_distance is None:
+            return self.centroid_distance
+        return self.nearest_distance + self.centroid_distance
+
+
+class SpatialIndex:
+    """
+    The located clients by grid cell, and the centroids of the routes.
+    `for_location` reads only the cells around a location (for the client
+    forms), `load` reads all the clients (for the bulk operations).
+    """
+
+    def __init__(self, points, centroids):
+        self.cells = collections.defaultdict(list)
+        for point in points:
+            self.cells[self.get_cell(point.latitude, point.longitude)].append(point)
+        # Route id: (number of clients, sum of latitudes, sum of longitudes).
+        self.centroids = centroids
+        self.routes = {}
+
+    @staticmethod
+    def get_cell(latitude, longitude):
+        row, column = get_grid_cell_indexes(latitude, longitude)
+        return f"{row}:{column}"
+
+    @classmethod
+    def make_points(cls, clients):
+        return [
+            Point(client_id, route_id, float(latitude), float(longitude))
+            for client_id, route_id, latitude, longitude in clients.values_list(
+                "id",
+                "route_id",
+                "member__address__latitude",
+                "member__address__longitude",
+            )
+        ]
+
+    @classmethod
+    def load(cls):
+        """The index of all the located clients, read with one query."""
+        points = cls.make_points(indexed_clients())
+        centroids = collections.defaultdict(lambda: (0, 0.0, 0.0))
+        for point in points:
+            count, latitudes, longitudes = centroids[point.route_id]
+            centroids[point.route_id] = (
+                count + 1,
+                latitudes + point.latitude,
+                longitudes + point.longitude,
+            )
+        return cls(points, dict(centroids))
+
+    @classmethod
+    def for_location(cls, latitude, longitude, radius=SEARCH_RADIUS):
+        """
+        The index of the clients in the cells around the location, with the
+        centroids of all the routes, read with two queries.
+        """
+        clients = indexed_clients()
+        points = cls.make_points(
+            clients.filter(
+                member__address__grid_cell__in=neighbouring_cells(
+                    latitude, longitude, radius
+                )
+            )
+        )
+        centroids = {
+            row["route"]: (
+                row["count"],
+                float(row["latitude"]) * row["count"],
+                float(row["longitude"]) * row["count"],
+            )
+            for row in clients.order_by()
+            .values("route")
+            .annotate(
+                count=Count("id"),
+                latitude=Avg("member__address__latitude"),
+                longitude=Avg("member__address__longitude"),
+            )
+        }
+        return cls(points, centroids)
+
+    def get_routes(self, route_ids):
+        missing = set(route_ids) - self.routes.keys()
+        if missing:
+            self.routes.update(Route.objects.in_bulk(missing))
+        return {route_id: self.routes[route_id] for route_id in route_ids}
+
+    def suggest(
+        self,
+        latitude,
+        longitude,
+        limit=3,
+        exclude_client=None,
+        radius=SEARCH_RADIUS,
+    ):
+        """
+        The `RouteSuggestion`s for the location, best first. The client
+        `exclude_client` (a `Point`) is left out, e.g. to check the route
+        of a client already indexed.
+        """
+        if get_grid_cell_indexes(latitude, longitude) is None:
+            return []
+        latitude, longitude = float(latitude), float(longitude)
+
+        nearest = {}
+        for cell in neighbouring_cells(latitude, longitude, radius):
+            for point in self.cells.get(cell, ()):
+                if exclude_client is not None and (
+                    point.client_id == exclude_client.client_id
+                ):
+                    continue
+                distance = distance_km(
+                    latitude, longitude, point.latitude, point.longitude
+                )
+                if distance < nearest.get(point.route_id, math.inf):
+                    nearest[point.route_id] = distance
+
+        suggestions = []
+        for route_id, (count, latitudes, longitudes) in self.centroids.items():
+            if exclude_client is not None and route_id == exclude_client.route_id:
+                count -= 1
+                latitudes -= exclude_client.latitude
+                longitudes -= exclude_client.longitude
+            if count <= 0:
+                continue
+            suggestions.append(
+                RouteSuggestion(
+                    route=route_id,
+                    clients=count,
+                    nearest_distance=nearest.get(route_id),
+                    centroid_distance=distance_km(
+                        latitude, longitude, latitudes / count, longitudes / count
+                    ),
+                )
+            )
+        # The routes with clients nearby first.
+        suggestions.sort(key=lambda s: (s.nearest_distance is None, s.score))
+        suggestions = suggestions[:limit]
+
+        routes = self.get_routes([s.route for s in suggestions])
+        for suggestion in suggestions:
+            suggestion.route = routes[suggestion.route]
+        return suggestions
+
+    def find_outliers(self, margin=1.0):
+        """
+        The located clients with a better suggested route, as a list of
+        (client id, current `RouteSuggestion`, best `RouteSuggestion`). A
+        route is better if its score is lower by more than `margin` km, or
+        if the current route has no client near the client.
+        """
+        outliers = []
+        for points in self.cells.values():
+            for point in points:
+                suggestions = self.suggest(
+                    point.latitude,
+                    point.longitude,
+                    limit=None,
+                    exclude_client=point,
+                )
+                if not suggestions or suggestions[0].route.pk == point.route_id:
+                    continue
+                best = suggestions[0]
+                current = next(
+                    (s for s in suggestions if s.route.pk == point.route_id), None
+                )
+                if current is None:
+                    # The only client of the route.
+                    continue
+                if best.nearest_distance is None:
+                    continue
+                if (
+                    current.nearest_distance is None
+                    or current.score - best.score > margin
+                ):
+                    outliers.append((point.client_id, current, best))
+        outliers.sort(key=lambda outlier: outlier[0])
+        return outliers
+
+
+def suggest_routes(latitude, longitude, limit=3):
+    """
+    The routes best fit for a client at the location, as a list of
+    `RouteSuggestion`s, best first; empty if the location is unknown.
+    """
+    if get_grid_cell_indexes(latitude, longitude) is None:
+        return []
+    return SpatialIndex.for_location(latitude, longitude).suggest(
+        latitude, longitude, limit=limit
+    )
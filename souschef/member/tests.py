@@ -1,7 +1,11 @@
 import json
+import os
 import random
+import tempfile
 from datetime import (
+    UTC,
     date,
+    datetime,
     timedelta,
 )
 from decimal import Decimal
@@ -10,6 +14,7 @@ from unittest import skip
 
 from django.contrib.auth.models import User
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
 from django.urls import (
     reverse,
@@ -41,6 +46,7 @@ from souschef.member.factories import (
     RelationshipFactory,
     RouteFactory,
 )
+from souschef.member.filters import ClientFilter
 from souschef.member.forms import (
     ClientAddressInformation,
     ClientBasicInformation,
@@ -49,6 +55,7 @@ from souschef.member.forms import (
     ClientRestrictionsInformation,
     ClientScheduledStatusForm,
 )
+from souschef.member.geocoding import geocode_addresses
 from souschef.member.models import (
     CELL,
     EMAIL,
@@ -59,16 +66,22 @@ from souschef.member.models import (
     Client_avoid_ingredient,
     Client_option,
     ClientScheduledStatus,
+    ClientStatusInterval,
     Contact,
     Member,
     Option,
+    PostalCodeLocation,
     Relationship,
     Restriction,
     Route,
+    RouteStop,
+    StreetSegment,
+    search_by_name,
 )
+from souschef.member.spatial import suggest_routes
 from souschef.order.constants import ORDER_STATUS_ORDERED
 from souschef.order.factories import OrderFactory
-from souschef.sous_chef.tests import TestMigrations
+from souschef.sous_chef.tests import QueryPlanMixin, TestMigrations
 from souschef.sous_chef.tests import TestMixin as SousChefTestMixin
 
 
@@ -1421,6 +1434,8 @@ class FormTestCase(TestCase):
 
 
 class MemberSearchTestCase(SousChefTestMixin, TestCase):
+    fixtures = ["routes.json"]
+
     @classmethod
     def setUpTestData(cls):
         member = Member.objects.create(firstname="Katrina", lastname="Heide")
@@ -1453,6 +1468,41 @@ class MemberSearchTestCase(SousChefTestMixin, TestCase):
         )
         self.assertTrue(b"Katrina Heide" in result.content)
 
+    def test_search_member_ignores_accents(self):
+        Member.objects.create(firstname="Hélène", lastname="Côté-Bélanger")
+        for query in ("helene", "COTE", "Hélène bélanger", "ène cot"):
+            result = self.client.get(
+                reverse_lazy("member:search"),
+                {"name": query},
+                headers={"x-requested-with": "XMLHttpRequest"},
+            )
+            titles = [r["title"] for r in result.json()["results"]]
+            self.assertIn("Hélène Côté-Bélanger", titles[0], query)
+
+    def test_search_member_ranking(self):
+        Member.objects.create(firstname="Marie", lastname="Katrinas")
+        Member.objects.create(firstname="Akatrina", lastname="Roy")
+        members = search_by_name(Member.objects.all(), "katrina")
+        self.assertEqual(
+            [str(m) for m in members],
+            ["Katrina Heide", "Marie Katrinas", "Akatrina Roy"],
+        )
+
+    def test_search_key(self):
+        member = Member.objects.create(firstname="Jean-François", lastname="O'Neil")
+        self.assertEqual(member.search_key, "jean francois o neil")
+        member.lastname = "Lévesque"
+        member.save(update_fields=["lastname"])
+        member.refresh_from_db()
+        self.assertEqual(member.search_key, "jean francois levesque")
+
+    def test_client_filter_by_name(self):
+        client = ClientFactory(
+            member__firstname="Jean-François", member__lastname="Lévesque"
+        )
+        ClientFactory(member__firstname="Jean", member__lastname="Roy")
+        self.assertEqual(list(ClientFilter({"name": "francois LEVES"}).qs), [client])
+
 
 class ClientStatusUpdateAndScheduleCase(SousChefTestMixin, TestCase):
     fixtures = ["routes.json"]
@@ -1553,6 +1603,66 @@ class ClientStatusUpdateAndScheduleCase(SousChefTestMixin, TestCase):
         self.assertEqual(scheduled_change.operation_status, ClientScheduledStatus.ERROR)
         self.assertEqual(self.stop_client.status, Client.STOPNOCONTACT)
 
+    def test_process_due_changes(self):
+        """
+        The due changes are applied in order with a constant number of
+        queries, the future ones are left untouched.
+        """
+        paused_clients = ClientFactory.create_batch(3, status=Client.ACTIVE)
+        for client in paused_clients:
+            ClientScheduledStatusFactory(
+                client=client,
+                change_date=date.today() - timedelta(days=1),
+                status_from=Client.PAUSED,
+                status_to=Client.ACTIVE,
+                change_state=ClientScheduledStatus.END,
+            )
+            ClientScheduledStatusFactory(
+                client=client,
+                change_date=date.today() - timedelta(days=3),
+                status_from=Client.ACTIVE,
+                status_to=Client.PAUSED,
+            )
+        invalid_change = ClientScheduledStatusFactory(
+            client=self.stop_client,
+            change_date=date.today(),
+            status_from=Client.ACTIVE,
+            status_to=Client.PAUSED,
+        )
+        future_change = ClientScheduledStatusFactory(
+            client=self.active_client,
+            change_date=date.today() + timedelta(days=1),
+            status_from=Client.ACTIVE,
+            status_to=Client.PAUSED,
+        )
+
+        # Select, update the clients, select and update the status
+        # intervals, update the changes, create the notes, plus the
+        # savepoint.
+        with self.assertNumQueries(8):
+            processed, errors = ClientScheduledStatus.objects.process_due_changes()
+
+        self.assertEqual(len(processed), 6)
+        self.assertEqual(errors, [invalid_change])
+        for client in paused_clients:
+            client.refresh_from_db()
+            self.assertEqual(client.status, Client.ACTIVE)
+            self.assertEqual(client.notes.count(), 2)
+            self.assertFalse(
+                client.scheduled_statuses.exclude(
+                    operation_status=ClientScheduledStatus.PROCESSED
+                ).exists()
+            )
+        invalid_change.refresh_from_db()
+        self.assertEqual(invalid_change.operation_status, ClientScheduledStatus.ERROR)
+        self.assertEqual(self.stop_client.notes.count(), 0)
+        future_change.refresh_from_db()
+        self.assertEqual(
+            future_change.operation_status, ClientScheduledStatus.TOBEPROCESSED
+        )
+        self.active_client.refresh_from_db()
+        self.assertEqual(self.active_client.status, Client.ACTIVE)
+
     def test_command_process_scheduled_status_idle(self):
         ClientScheduledStatusFactory.create_batch(
             10,
@@ -1579,11 +1689,15 @@ class ClientStatusUpdateAndScheduleCase(SousChefTestMixin, TestCase):
                 f"{scheduled_change.get_status_to_display()}",
                 out.getvalue(),
             )
+        self.assertIn(
+            "1 scheduled status changes processed, 0 in error", out.getvalue()
+        )
         # Reload
         scheduled_change = ClientScheduledStatus.objects.get(id=scheduled_change.id)
         self.assertEqual(
             scheduled_change.operation_status, ClientScheduledStatus.PROCESSED
         )
+        self.assertEqual(self.active_client.notes.count(), 1)
 
     def test_form_save_bypassed(self):
         form = ClientScheduledStatusForm()
@@ -2037,6 +2151,36 @@ class ClientStatusUpdateAndScheduleCase(SousChefTestMixin, TestCase):
         )
 
 
+class ClientScheduledStatusQueryPlanTestCase(QueryPlanMixin, TestCase):
+    fixtures = ["routes.json"]
+
+    @classmethod
+    def setUpTestData(cls):
+        client = ClientFactory(status=Client.ACTIVE)
+        for days in range(-30, 30):
+            ClientScheduledStatusFactory(
+                client=client,
+                change_date=date.today() + timedelta(days=days),
+                operation_status=(
+                    ClientScheduledStatus.PROCESSED
+                    if days < 0
+                    else ClientScheduledStatus.TOBEPROCESSED
+                ),
+            )
+
+    def test_due_changes_use_operation_status_index(self):
+        changes = self.assertNoFullTableScan(
+            ["member_clientscheduledstatus"],
+            lambda: list(
+                ClientScheduledStatus.objects.filter(
+                    operation_status=ClientScheduledStatus.TOBEPROCESSED,
+                    change_date__lte=date.today(),
+                )
+            ),
+        )
+        self.assertEqual(1, len(changes))
+
+
 class ClientUpdateTestCase(TestCase):
     fixtures = ["routes.json"]
 
@@ -3165,6 +3309,413 @@ class ClientGetStatusPlannedAtDateTestCase(SousChefTestMixin, TestCase):
         )
         self.assertEqual(planned_status, Client.ACTIVE)
 
+    def test_planned_change_in_range__prefetched(self):
+        self.client.save()
+        for days, status_to in ((1, Client.PAUSED), (10, Client.STOPCONTACT)):
+            ClientScheduledStatus.objects.create(
+                client=self.client,
+                status_from=Client.ACTIVE,
+                status_to=status_to,
+                reason="test",
+                change_date=self.TODAY + timedelta(days=days),
+                change_state=ClientScheduledStatus.END,
+                operation_status=ClientScheduledStatus.TOBEPROCESSED,
+            )
+        # Already processed: not considered
+        ClientScheduledStatus.objects.create(
+            client=self.client,
+            status_from=Client.STOPCONTACT,
+            status_to=Client.ACTIVE,
+            reason="test",
+            change_date=self.TODAY + timedelta(days=5),
+            change_state=ClientScheduledStatus.END,
+            operation_status=ClientScheduledStatus.PROCESSED,
+        )
+        client = Client.objects.prefetch_related("scheduled_statuses").get(
+            pk=self.client.pk
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                client.get_status_planned_at_date(self.TODAY, today=self.TODAY),
+                Client.ACTIVE,
+            )
+            self.assertEqual(
+                client.get_status_planned_at_date(
+                    self.TODAY + timedelta(days=5), today=self.TODAY
+                ),
+                Client.PAUSED,
+            )
+            self.assertEqual(
+                client.get_status_planned_at_date(
+                    self.TODAY + timedelta(days=11), today=self.TODAY
+                ),
+                Client.STOPCONTACT,
+            )
+
+
+class ClientStatusIntervalTestCase(SousChefTestMixin, TestCase):
+    fixtures = ["routes.json"]
+    TODAY = date(2024, 4, 29)
+
+    def setUp(self):
+        self.client = ClientFactory(status=Client.ACTIVE)
+        # The client has been active since the beginning of the year.
+        self.client.status_intervals.update(valid_from=date(2024, 1, 1))
+
+    def test_save_records_status(self):
+        self.client.status = Client.PAUSED
+        self.client.save()
+        self.client.save()
+
+        intervals = list(self.client.status_intervals.all())
+        self.assertEqual(2, len(intervals))
+        self.assertEqual(
+            (Client.ACTIVE, date(2024, 1, 1), date.today()),
+            (intervals[0].status, intervals[0].valid_from, intervals[0].valid_to),
+        )
+        self.assertEqual(
+            (Client.PAUSED, date.today(), None),
+            (intervals[1].status, intervals[1].valid_from, intervals[1].valid_to),
+        )
+
+    def test_record_changes(self):
+        other_client = ClientFactory(status=Client.PENDING)
+        other_client.status_intervals.update(valid_from=date(2024, 1, 1))
+        ClientStatusInterval.objects.record_changes(
+            [
+                (self.client.id, Client.ACTIVE, date(2024, 2, 1)),
+                (self.client.id, Client.STOPCONTACT, date(2024, 4, 1)),
+                (self.client.id, Client.PAUSED, date(2024, 3, 1)),
+                (other_client.id, Client.ACTIVE, date(2024, 3, 15)),
+                (other_client.id, Client.PAUSED, date(2024, 3, 15)),
+            ]
+        )
+
+        statuses = ClientStatusInterval.objects.get_statuses_at_date
+        self.assertEqual(
+            {self.client.id: Client.ACTIVE, other_client.id: Client.PENDING},
+            statuses(date(2024, 2, 29)),
+        )
+        self.assertEqual(
+            {self.client.id: Client.PAUSED, other_client.id: Client.PAUSED},
+            statuses(date(2024, 3, 15)),
+        )
+        self.assertEqual(
+            {self.client.id: Client.STOPCONTACT},
+            statuses(date(2024, 4, 1), clients=[self.client]),
+        )
+        self.assertEqual({}, statuses(date(2023, 12, 31)))
+        self.assertEqual(5, ClientStatusInterval.objects.count())
+
+    def test_get_status_at_date(self):
+        ClientStatusInterval.objects.record_changes(
+            [(self.client.id, Client.PAUSED, date(2024, 3, 1))]
+        )
+        ClientScheduledStatus.objects.create(
+            client=self.client,
+            status_from=Client.PAUSED,
+            status_to=Client.ACTIVE,
+            change_date=self.TODAY + timedelta(days=1),
+            change_state=ClientScheduledStatus.END,
+        )
+        self.client.status = Client.PAUSED
+
+        def status_at(day):
+            return self.client.get_status_at_date(day, today=self.TODAY)
+
+        # Before the history, the first status.
+        self.assertEqual(Client.ACTIVE, status_at(date(2023, 6, 1)))
+        self.assertEqual(Client.ACTIVE, status_at(date(2024, 2, 29)))
+        self.assertEqual(Client.PAUSED, status_at(date(2024, 3, 1)))
+        self.assertEqual(Client.PAUSED, status_at(self.TODAY))
+        self.assertEqual(Client.ACTIVE, status_at(self.TODAY + timedelta(days=1)))
+
+        client = Client.objects.prefetch_related("status_intervals").get(
+            pk=self.client.pk
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                Client.ACTIVE,
+                client.get_status_at_date(date(2024, 2, 1), today=self.TODAY),
+            )
+
+    def test_scheduled_changes_recorded_at_their_date(self):
+        ClientScheduledStatusFactory(
+            client=self.client,
+            change_date=date.today() - timedelta(days=3),
+            status_from=Client.ACTIVE,
+            status_to=Client.PAUSED,
+        )
+        change = ClientScheduledStatusFactory(
+            client=self.client,
+            change_date=date.today() - timedelta(days=1),
+            status_from=Client.PAUSED,
+            status_to=Client.ACTIVE,
+        )
+        ClientScheduledStatus.objects.process_due_changes(
+            date.today() - timedelta(days=2)
+        )
+        self.client.refresh_from_db()
+        change.process()
+
+        self.assertEqual(
+            [
+                (Client.ACTIVE, date(2024, 1, 1)),
+                (Client.PAUSED, date.today() - timedelta(days=3)),
+                (Client.ACTIVE, date.today() - timedelta(days=1)),
+            ],
+            list(self.client.status_intervals.values_list("status", "valid_from")),
+        )
+
+
+GAZETTEER = """\
+# Test gazetteer
+postal_code;h2x 1y4;;;45.510000;-73.570000;;
+street;Rue Saint-Urbain;3600;3700;45.500000;-73.500000;45.600000;-73.600000
+street;Rue Saint-Urbain;3601;3699;45.501000;-73.501000;45.599000;-73.599000
+"""
+
+
+class GeocodeAddressesTestCase(TestCase):
+    def setUp(self):
+        self.gazetteer = self.write_gazetteer(GAZETTEER)
+        self.even = MemberFactory(
+            address__number=3650,
+            address__street="St-Urbain",
+            address__postal_code="H2X 1Y4",
+            address__latitude=None,
+            address__longitude=None,
+        )
+        self.odd = MemberFactory(
+            address__number=None,
+            address__street="3651, rue Saint-Urbain",
+            address__postal_code="H2X 1Y9",
+            address__latitude=None,
+            address__longitude=None,
+        )
+        self.postal_code = MemberFactory(
+            address__number=1,
+            address__street="Rue Inconnue",
+            address__postal_code="h2x1y4",
+            address__latitude=None,
+            address__longitude=None,
+        )
+        self.not_found = MemberFactory(
+            address__number=1,
+            address__street="Rue Inconnue",
+            address__postal_code="H0H 0H0",
+            address__latitude=None,
+            address__longitude=None,
+        )
+        self.located = MemberFactory(
+            address__street="Rue Inconnue",
+            address__postal_code="H2X 1Y4",
+            address__latitude="75.0",
+            address__longitude="40.0",
+        )
+
+    def write_gazetteer(self, content):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+            f.write(content)
+        self.addCleanup(os.remove, f.name)
+        return f.name
+
+    def geocode(self, **options):
+        out = StringIO()
+        call_command("geocode_addresses", stdout=out, **options)
+        return out.getvalue()
+
+    def assertLocation(self, member, latitude, longitude):
+        member.address.refresh_from_db()
+        self.assertEqual(
+            (Decimal(latitude), Decimal(longitude)),
+            (member.address.latitude, member.address.longitude),
+        )
+
+    def test_geocode_addresses(self):
+        out = self.geocode(gazetteer=self.gazetteer)
+
+        self.assertIn("1 postal codes, 2 street segments", out)
+        self.assertIn(
+            "3 addresses located (2 by street number, 1 by postal code), "
+            "1 to locate manually",
+            out,
+        )
+        self.assertIn(f"Not found: {self.not_found}", out)
+        # Interpolated on the segment of the same side of the street.
+        self.assertLocation(self.even, "45.550000", "-73.550000")
+        self.assertLocation(self.odd, "45.551000", "-73.551000")
+        self.assertLocation(self.postal_code, "45.510000", "-73.570000")
+        self.assertLocation(self.located, "75.0", "40.0")
+        self.not_found.address.refresh_from_db()
+        self.assertIsNone(self.not_found.address.latitude)
+
+        # The gazetteer is kept, the located addresses are not geocoded again.
+        out = self.geocode()
+        self.assertIn("0 addresses located", out)
+        self.assertIn("1 to locate manually", out)
+
+    def test_geocode_initial_location(self):
+        """The addresses saved with the (0, 0) of the forms are not located."""
+        member = MemberFactory(
+            address__number=3602,
+            address__street="Rue Saint-Urbain",
+            address__postal_code="H2X 1Y4",
+            address__latitude=0,
+            address__longitude=0,
+        )
+        self.not_found.address.latitude = self.not_found.address.longitude = 0
+        self.not_found.address.save()
+        out = self.geocode(gazetteer=self.gazetteer)
+        self.assertIn("4 addresses located", out)
+        self.assertIn(f"Not found: {self.not_found}", out)
+        self.assertLocation(member, "45.502000", "-73.502000")
+
+    def test_geocode_all(self):
+        self.geocode(gazetteer=self.gazetteer)
+        self.geocode(all=True)
+        self.assertLocation(self.located, "45.510000", "-73.570000")
+
+    def test_dry_run(self):
+        out = self.geocode(gazetteer=self.gazetteer, dry_run=True)
+        self.assertIn("3 addresses located", out)
+        self.even.address.refresh_from_db()
+        self.assertIsNone(self.even.address.latitude)
+
+    def test_invalid_gazetteer(self):
+        self.geocode(gazetteer=self.gazetteer)
+        gazetteer = self.write_gazetteer(
+            "postal_code;H2X 1Y4;;;45.51;-73.57;;\nstreet;Rue X;12;10;1;1;1;1\n"
+        )
+        with self.assertRaisesMessage(CommandError, "Line 2: invalid street segment."):
+            self.geocode(gazetteer=gazetteer)
+        self.assertEqual(1, PostalCodeLocation.objects.count())
+        self.assertEqual(2, StreetSegment.objects.count())
+
+    def test_memoised(self):
+        """The gazetteer is read with two queries per batch at most."""
+        self.geocode(gazetteer=self.gazetteer, dry_run=True)
+        addresses = [
+            Address(number=3600 + i, street="Rue St-Urbain", postal_code="H2X 1Y4")
+            for i in range(50)
+        ]
+        with self.assertNumQueries(2):
+            result = geocode_addresses(addresses, batch_size=100, save=False)
+        self.assertEqual(50, result.located["street"])
+
+
+class SuggestRoutesTestCase(SousChefTestMixin, TestCase):
+    def setUp(self):
+        self.north = RouteFactory(name="North")
+        self.south = RouteFactory(name="South")
+        self.north_clients = [
+            self.make_client(self.north, "45.550000", longitude)
+            for longitude in ("-73.600000", "-73.601000", "-73.602000")
+        ]
+        self.south_clients = [
+            self.make_client(self.south, "45.500000", longitude)
+            for longitude in ("-73.560000", "-73.561000", "-73.562000")
+        ]
+        # Among the clients of the north route.
+        self.outlier = self.make_client(self.south, "45.550500", "-73.600500")
+        # Not delivered anymore.
+        self.make_client(self.north, "45.500500", "-73.560500", Client.STOPCONTACT)
+
+    def make_client(self, route, latitude, longitude, status=Client.ACTIVE):
+        return ClientFactory(
+            route=route,
+            status=status,
+            member__address__latitude=latitude,
+            member__address__longitude=longitude,
+        )
+
+    def reassign(self, **options):
+        out = StringIO()
+        call_command("reassignoutliers", stdout=out, **options)
+        return out.getvalue()
+
+    def test_grid_cell(self):
+        address = self.outlier.member.address
+        address.refresh_from_db()
+        self.assertEqual("4555:-7361", address.grid_cell)
+        address.latitude = Decimal("45.499")
+        address.save(update_fields=["latitude"])
+        address.refresh_from_db()
+        self.assertEqual("4549:-7361", address.grid_cell)
+        address.latitude = address.longitude = None
+        address.save()
+        self.assertEqual("", address.grid_cell)
+
+    def test_suggest_routes(self):
+        with self.assertNumQueries(3):
+            suggestions = suggest_routes("45.551000", "-73.601500")
+        self.assertEqual(
+            [self.north, self.south], [suggestion.route for suggestion in suggestions]
+        )
+        self.assertEqual(3, suggestions[0].clients)
+        self.assertAlmostEqual(0.12, suggestions[0].nearest_distance, places=2)
+        self.assertAlmostEqual(0.12, suggestions[0].centroid_distance, places=2)
+        # The stopped client is left out.
+        self.assertEqual(4, suggestions[1].clients)
+
+        # No route has clients near, the routes are ranked by centroid.
+        suggestions = suggest_routes("45.460000", "-73.540000", limit=1)
+        self.assertEqual([self.south], [suggestion.route for suggestion in suggestions])
+        self.assertIsNone(suggestions[0].nearest_distance)
+
+    def test_suggest_routes_unknown_location(self):
+        with self.assertNumQueries(0):
+            self.assertEqual([], suggest_routes(None, None))
+            self.assertEqual([], suggest_routes("", ""))
+            self.assertEqual([], suggest_routes("0", "0"))
+
+    def test_view(self):
+        self.force_login()
+        response = self.client.get(
+            reverse("member:suggest_routes"),
+            {"latitude": "45.499", "longitude": "-73.561"},
+        )
+        routes = response.json()["routes"]
+        self.assertEqual(
+            [self.south.pk, self.north.pk], [route["id"] for route in routes]
+        )
+        self.assertEqual("South", routes[0]["name"])
+
+    def test_view_invalid_location(self):
+        self.force_login()
+        url = reverse("member:suggest_routes")
+        self.assertEqual([], self.client.get(url).json()["routes"])
+        for latitude, longitude in (
+            ("91", "-73.561"),
+            ("45.499", "-180.5"),
+            ("1e400", "-73.561"),
+            ("nan", "-73.561"),
+            ("north", "-73.561"),
+        ):
+            response = self.client.get(
+                url, {"latitude": latitude, "longitude": longitude}
+            )
+            self.assertEqual(400, response.status_code)
+
+    def test_reassign_outliers(self):
+        out = self.reassign(dry_run=True)
+        self.assertIn(f"{self.outlier.member}: South -> North", out)
+        self.assertIn("1 clients to move (dry run).", out)
+        self.outlier.refresh_from_db()
+        self.assertEqual(self.south, self.outlier.route)
+
+        out = self.reassign()
+        self.assertIn("1 clients moved.", out)
+        self.outlier.refresh_from_db()
+        self.assertEqual(self.north, self.outlier.route)
+        self.assertIn("0 clients moved.", self.reassign())
+
+    def test_reassign_outliers_margin(self):
+        """A client with neighbours on its route is moved only if it's worth it."""
+        self.make_client(self.south, "45.551000", "-73.601000")
+        self.assertIn("0 clients moved.", self.reassign(margin=100))
+        self.assertIn("2 clients moved.", self.reassign())
+
 
 class DeleteRestrictionViewTestCase(SousChefTestMixin, TestCase):
     fixtures = ["routes.json"]
@@ -3775,6 +4326,139 @@ class RouteGetOptimisedSequenceViewTestCase(SousChefTestMixin, TestCase):
             self.fail("Response is not valid JSON.")
 
 
+class RouteSequenceMaintenanceTestCase(TestCase):
+    """The clients joining or leaving a route are placed in its sequences."""
+
+    def setUp(self):
+        self.route = RouteFactory()
+        self.other_route = RouteFactory()
+        # On a street north-east of the kitchen, in this order.
+        self.first, self.second, self.third = (
+            self.make_client(self.route, longitude)
+            for longitude in ("-73.560000", "-73.540000", "-73.520000")
+        )
+        self.route.refresh_from_db()
+
+    def make_client(self, route, longitude, latitude="45.550000"):
+        return ClientFactory(
+            route=route,
+            status=Client.ACTIVE,
+            member__address__latitude=latitude,
+            member__address__longitude=longitude,
+        )
+
+    def assertSequence(self, obj, clients):
+        obj.refresh_from_db()
+        self.assertEqual([client.pk for client in clients], obj.client_id_sequence)
+
+    def test_insert_at_cheapest_position(self):
+        self.assertSequence(self.route, [self.first, self.second, self.third])
+        self.route.client_id_sequence = [self.third.pk, self.first.pk]
+        self.route.save()
+
+        client = self.make_client(self.route, "-73.550000")
+        # The order chosen for the other clients is kept.
+        self.assertSequence(self.route, [self.third, client, self.first])
+
+    def test_change_route(self):
+        client = Client.objects.get(pk=self.second.pk)
+        client.route = self.other_route
+        client.save()
+        self.assertSequence(self.route, [self.first, self.third])
+        self.assertSequence(self.other_route, [client])
+
+        # Saved again, nothing changes.
+        self.other_route.client_id_sequence = []
+        self.other_route.save()
+        client.save()
+        self.assertSequence(self.other_route, [])
+
+    def test_change_status(self):
+        client = Client.objects.get(pk=self.second.pk)
+        client.status = Client.STOPCONTACT
+        client.save(update_fields=["status"])
+        self.assertSequence(self.route, [self.first, self.third])
+
+        client.status = Client.PAUSED
+        client.save(update_fields=["status"])
+        self.assertSequence(self.route, [self.first, self.second, self.third])
+
+    def test_not_located(self):
+        self.make_client(self.route, None, latitude=None)
+        self.assertSequence(self.route, [self.first, self.second, self.third])
+
+    def test_scheduled_status_changes(self):
+        for client, status_from, status_to in (
+            (self.second, Client.ACTIVE, Client.STOPNOCONTACT),
+            (self.third, Client.ACTIVE, Client.PAUSED),
+        ):
+            ClientScheduledStatusFactory(
+                client=client,
+                change_date=date.today(),
+                status_from=status_from,
+                status_to=status_to,
+            )
+        ClientScheduledStatus.objects.process_due_changes()
+        self.assertEqual(
+            [self.first.pk, self.third.pk],
+            list(
+                RouteStop.objects.filter(route=self.route).values_list(
+                    "client", flat=True
+                )
+            ),
+        )
+
+        change = ClientScheduledStatusFactory(
+            client=Client.objects.get(pk=self.second.pk),
+            change_date=date.today(),
+            status_from=Client.STOPNOCONTACT,
+            status_to=Client.ACTIVE,
+        )
+        change.process()
+        self.assertSequence(self.route, [self.first, self.second, self.third])
+
+    def test_delivery_histories(self):
+        today = date.today()
+        past = DeliveryHistoryFactory(
+            route=self.route, date=today - timedelta(days=1), vehicle="cycling"
+        )
+        past.client_id_sequence = [self.first.pk, self.third.pk, self.second.pk]
+        past.save()
+        current = DeliveryHistoryFactory(
+            route=self.other_route, date=today, vehicle="cycling"
+        )
+        without_order = DeliveryHistoryFactory(
+            route=self.other_route, date=today + timedelta(days=1), vehicle="cycling"
+        )
+        OrderFactory(
+            client=self.third, delivery_date=today, status=ORDER_STATUS_ORDERED
+        )
+
+        client = Client.objects.get(pk=self.third.pk)
+        client.route = self.other_route
+        client.save()
+        # The past deliveries are kept as they were made.
+        self.assertSequence(past, [self.first, self.third, self.second])
+        self.assertSequence(current, [client])
+        self.assertSequence(without_order, [])
+
+    def test_invalid_sequence(self):
+        # The clients that don't exist and the duplicates are not stored.
+        self.route.client_id_sequence = [
+            self.third.pk,
+            999999,
+            "N/A",
+            self.first.pk,
+            self.third.pk,
+        ]
+        self.route.save()
+        self.assertSequence(self.route, [self.third, self.first])
+
+    def test_deleted_client(self):
+        self.second.delete()
+        self.assertSequence(self.route, [self.first, self.third])
+
+
 class RouteDeliveryHistoryDetailViewTestCase(SousChefTestMixin, TestCase):
     fixtures = ["routes.json"]
 
@@ -3823,10 +4507,9 @@ class RouteDeliveryHistoryDetailViewTestCase(SousChefTestMixin, TestCase):
         (2) Then route sequence
         (3) Then random order
 
-        Except for the problematic ones, which means:
-        (1) Invalid client ID or client doesn't exist
-        (2) The client's order on that day was not found and we think the
-            client is invalid on this delivery sequence.
+        Except for the problematic ones, whose order on that day was not
+        found: we think the client is invalid on this delivery sequence.
+        Invalid client IDs and clients that don't exist are not stored.
         """
         route = RouteFactory()
         dh = DeliveryHistoryFactory(
@@ -3855,9 +4538,9 @@ class RouteDeliveryHistoryDetailViewTestCase(SousChefTestMixin, TestCase):
         clients[2].save(update_fields=["route"])
 
         dh.client_id_sequence = [
-            "N/A",  # Invalid client ID
+            "N/A",  # Invalid client ID, not stored
             clients[0].pk,
-            999999,  # Client doesn't exist for sure
+            999999,  # Client doesn't exist for sure, not stored
             clients[2].pk,  # Invalid because of route
             clients[5].pk,  # Invalid because order doesn't exist
             clients[7].pk,
@@ -3885,14 +4568,10 @@ class RouteDeliveryHistoryDetailViewTestCase(SousChefTestMixin, TestCase):
         self.assertEqual(clients_on_dh[3].pk, clients[4].pk)
         self.assertEqual(clients_on_dh[4].pk, clients[6].pk)
 
-        # 4 invalid messages
+        # 2 invalid messages
         messages = response.context["messages"]
-        self.assertEqual(len(messages), 4)
+        self.assertEqual(len(messages), 2)
         iter_messages = iter(messages)
-        message0 = next(iter_messages)
-        self.assertIn("N/A", message0.message)
-        message1 = next(iter_messages)
-        self.assertIn("999999", message1.message)
         message2 = next(iter_messages)
         self.assertIn(clients[2].member.firstname, message2.message)
         self.assertIn(clients[2].member.lastname, message2.message)
@@ -4338,3 +5017,121 @@ class TestMigrationUnapply0032(TestMigrations):
                         )
 
                         del member_re  # avoid myself making errors below
+
+
+class TestMigrationApply0045(TestMigrations):
+    migrate_from = "0044_member_search_key"
+    migrate_to = "0045_client_status_intervals"
+
+    def setUpBeforeMigration(self, apps):
+        Member = apps.get_model("member", "Member")
+        Client = apps.get_model("member", "Client")
+        ClientScheduledStatus = apps.get_model("member", "ClientScheduledStatus")
+
+        member = Member.objects.create(firstname="Paused", lastname="Once")
+        Member.objects.filter(pk=member.pk).update(
+            created_at=datetime(2024, 1, 1, 12, tzinfo=UTC)
+        )
+        self.client_id = Client.objects.create(
+            billing_member=member, member=member, status="A"
+        ).id
+        for status_from, status_to, change_date, operation_status in (
+            ("A", "S", date(2024, 2, 1), "PRO"),
+            ("S", "A", date(2024, 3, 1), "PRO"),
+            ("A", "S", date(2099, 1, 1), "NEW"),
+        ):
+            ClientScheduledStatus.objects.create(
+                client_id=self.client_id,
+                status_from=status_from,
+                status_to=status_to,
+                change_date=change_date,
+                operation_status=operation_status,
+            )
+
+    def test_status_intervals_filled(self):
+        ClientStatusInterval = self.apps.get_model("member", "ClientStatusInterval")
+        self.assertEqual(
+            [
+                ("A", date(2024, 1, 1), date(2024, 2, 1)),
+                ("S", date(2024, 2, 1), date(2024, 3, 1)),
+                ("A", date(2024, 3, 1), None),
+            ],
+            list(
+                ClientStatusInterval.objects.filter(client_id=self.client_id)
+                .order_by("valid_from")
+                .values_list("status", "valid_from", "valid_to")
+            ),
+        )
+
+
+class TestMigrationApply0047(TestMigrations):
+    migrate_from = "0046_gazetteer"
+    migrate_to = "0047_address_grid_cell"
+
+    def setUpBeforeMigration(self, apps):
+        Address = apps.get_model("member", "Address")
+        self.located_id = Address.objects.create(
+            street="Rue Saint-Urbain",
+            city="Montreal",
+            postal_code="H2X 1Y4",
+            latitude=Decimal("45.512345"),
+            longitude=Decimal("-73.571234"),
+        ).id
+        self.not_located_id = Address.objects.create(
+            street="Rue Inconnue", city="Montreal", postal_code="H0H 0H0"
+        ).id
+
+    def test_grid_cells_filled(self):
+        Address = self.apps.get_model("member", "Address")
+        self.assertEqual(
+            {self.located_id: "4551:-7358", self.not_located_id: ""},
+            dict(Address.objects.values_list("id", "grid_cell")),
+        )
+
+
+class TestMigrationApply0048(TestMigrations):
+    migrate_from = "0047_address_grid_cell"
+    migrate_to = "0048_route_delivery_stops"
+
+    def setUpBeforeMigration(self, apps):
+        Member = apps.get_model("member", "Member")
+        Client = apps.get_model("member", "Client")
+        Route = apps.get_model("member", "Route")
+        DeliveryHistory = apps.get_model("member", "DeliveryHistory")
+
+        self.client_ids = []
+        for name in ("First", "Second"):
+            member = Member.objects.create(firstname=name, lastname="Stop")
+            self.client_ids.append(
+                Client.objects.create(billing_member=member, member=member).id
+            )
+        first, second = self.client_ids
+        self.route_id = Route.objects.create(
+            name="Sequenced", client_id_sequence=[second, 999999, "N/A", first, second]
+        ).id
+        self.legacy_route_id = Route.objects.create(
+            name="Legacy", client_id_sequence={"2016-11-17": []}
+        ).id
+        self.delivery_history_id = DeliveryHistory.objects.create(
+            route_id=self.route_id,
+            date=date(2024, 1, 1),
+            vehicle="cycling",
+            client_id_sequence=[first],
+        ).id
+
+    def test_stops_filled(self):
+        RouteStop = self.apps.get_model("member", "RouteStop")
+        DeliveryStop = self.apps.get_model("member", "DeliveryStop")
+        first, second = self.client_ids
+        self.assertEqual(
+            [(self.route_id, second, 0), (self.route_id, first, 1)],
+            list(RouteStop.objects.values_list("route", "client", "position")),
+        )
+        self.assertEqual(
+            [(self.delivery_history_id, first, 0)],
+            list(
+                DeliveryStop.objects.values_list(
+                    "delivery_history", "client", "position"
+                )
+            ),
+        )
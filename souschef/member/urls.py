@@ -34,6 +34,7 @@ from souschef.member.views import (
     RouteEditView,
     RouteListView,
     SearchMembers,
+    SuggestRoutes,
     geolocateAddress,
     get_minimised_euclidean_distances_route_sequence,
 )
@@ -112,6 +113,7 @@ urlpatterns = [
         name="client_notes_add",
     ),
     path(_("geolocateAddress/"), geolocateAddress, name="geolocateAddress"),
+    path(_("suggest_routes/"), SuggestRoutes.as_view(), name="suggest_routes"),
     path(
         _("view/<int:pk>/status"),
         ClientStatusView.as_view(),
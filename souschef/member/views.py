@@ -10,15 +10,18 @@ from django.contrib.auth.mixins import (
 from django.db import transaction
 from django.db.models import (
     Case,
+    F,
     IntegerField,
+    OuterRef,
     Prefetch,
-    Q,
+    Subquery,
     Sum,
     When,
 )
 from django.db.transaction import atomic
 from django.http import (
     HttpResponse,
+    HttpResponseBadRequest,
     HttpResponseRedirect,
     JsonResponse,
 )
@@ -34,7 +37,7 @@ from django.utils.translation import gettext_lazy as _
 from django.views import generic
 from formtools.wizard.views import NamedUrlSessionWizardView
 
-from souschef.delivery.views import calculateRoutePointsEuclidean
+from souschef.delivery.views import calculateRoutePoints
 from souschef.meal.constants import (
     COMPONENT_GROUP_CHOICES,
     COMPONENT_GROUP_CHOICES_SIDES,
@@ -56,6 +59,7 @@ from souschef.member.forms import (
     ClientPaymentInformation,
     ClientRestrictionsInformation,
     ClientScheduledStatusForm,
+    RouteForm,
 )
 from souschef.member.formsets import (
     CreateRelationshipFormset,
@@ -70,17 +74,23 @@ from souschef.member.models import (
     ClientScheduledStatus,
     Contact,
     DeliveryHistory,
+    DeliveryStop,
     Member,
     Relationship,
     Restriction,
     Route,
+    RouteStop,
+    search_by_name,
 )
+from souschef.member.spatial import suggest_routes
 from souschef.member.types import RateType
 from souschef.order.constants import (
     SIZE_CHOICES,
 )
 from souschef.order.mixins import FormValidAjaxableResponseMixin
 from souschef.order.models import Order
+from souschef.sous_chef.dbrouting import reporting
+from souschef.sous_chef.pagination import KeysetPaginationMixin
 
 
 class NamedUrlSessionWizardView_i18nURL(NamedUrlSessionWizardView):
@@ -440,7 +450,12 @@ class ClientWizard(
         )
 
 
-class ClientList(LoginRequiredMixin, PermissionRequiredMixin, generic.ListView):
+class ClientList(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    KeysetPaginationMixin,
+    generic.ListView,
+):
     # Display the list of clients
     context_object_name = "clients"
     model = Client
@@ -485,7 +500,8 @@ class ClientList(LoginRequiredMixin, PermissionRequiredMixin, generic.ListView):
         self.format = request.GET.get("format", False)
 
         if self.format == "csv":
-            return export_csv(self, self.get_queryset())
+            with reporting():
+                return export_csv(self, self.get_queryset())
 
         return super().get(request, **kwargs)
 
@@ -1090,30 +1106,10 @@ class ClientUpdateRelationshipsInformation(ClientUpdateInformation):
 class SearchMembers(LoginRequiredMixin, PermissionRequiredMixin, generic.View):
     permission_required = "sous_chef.read"
 
-    @staticmethod
-    def _get_query_args(query):
-        """
-        Return query arguments built for first_name and
-        last_name Member fields
-        :return: Q() | Q() or Q() & Q()
-        """
-        query = query.strip()
-        if " " not in query:
-            # Is a simple word, check if both fields contains
-            # the query value
-            return Q(firstname__icontains=query) | Q(lastname__icontains=query)
-        else:
-            # More than one word, split query to search separately
-            # by first and last name
-            s_query = query.split(" ")
-            return Q(firstname__icontains=s_query[0]) & Q(
-                lastname__icontains=" ".join(s_query[1:])
-            )
-
     def get(self, request):
         if self.request.headers.get("X-Requested-With") == "XMLHttpRequest":
             q = request.GET.get("name", "")
-            members = Member.objects.filter(self._get_query_args(q))[:20]
+            members = search_by_name(Member.objects.all(), q)[:20]
             results = []
             for m in members:
                 name = "[" + str(m.id) + "] " + m.firstname + " " + m.lastname
@@ -1129,6 +1125,42 @@ class SearchMembers(LoginRequiredMixin, PermissionRequiredMixin, generic.View):
         return JsonResponse(data)
 
 
+class SuggestRoutes(LoginRequiredMixin, PermissionRequiredMixin, generic.View):
+    """
+    The routes best fit for the location given by the `latitude` and
+    `longitude` parameters, for the address step of the client forms.
+    """
+
+    permission_required = "sous_chef.read"
+
+    def get(self, request):
+        latitude = request.GET.get("latitude")
+        longitude = request.GET.get("longitude")
+        # No suggestions while the address is not located.
+        if latitude and longitude:
+            try:
+                valid = -90 <= float(latitude) <= 90 and -180 <= float(longitude) <= 180
+            except ValueError:
+                valid = False
+            if not valid:
+                return HttpResponseBadRequest("Invalid location.")
+        suggestions = suggest_routes(latitude, longitude)
+        return JsonResponse(
+            {
+                "routes": [
+                    {
+                        "id": suggestion.route.pk,
+                        "name": suggestion.route.name,
+                        "clients": suggestion.clients,
+                        "nearest_distance": suggestion.nearest_distance,
+                        "centroid_distance": suggestion.centroid_distance,
+                    }
+                    for suggestion in suggestions
+                ]
+            }
+        )
+
+
 @login_required
 def geolocateAddress(request):
     # do something with the your data
@@ -1327,28 +1359,23 @@ def get_clients_on_route(route):
     Returns a list of client instances with an extra attribute
     `has_been_configured`, ordered by configured then unconfigured.
     """
-    clients = Client.objects.filter(
-        route=route, status__in=[Client.PENDING, Client.ACTIVE, Client.PAUSED]
-    ).select_related("member", "member__address")
-    clients_dict = {client.pk: client for client in clients}
-    clients_on_route = []
-    for client_pk in route.client_id_sequence or []:
-        if client_pk in clients_dict:
-            client = clients_dict[client_pk]
-            client.has_been_configured = True
-            clients_on_route.append(client)
-            del clients_dict[client_pk]
-        else:
-            # This client has been deleted after configuring the route.
-            # We don't include it in the sequence. Thus, when the user updates
-            # the default route sequence the next time, everything will be OK.
-            pass
-
-    for _client_pk, client in clients_dict.items():
-        # Remaining clients
-        client.has_been_configured = False
-        clients_on_route.append(client)
-
+    clients = (
+        Client.objects.filter(
+            route=route, status__in=[Client.PENDING, Client.ACTIVE, Client.PAUSED]
+        )
+        .annotate(
+            route_position=Subquery(
+                RouteStop.objects.filter(route=route, client=OuterRef("pk")).values(
+                    "position"
+                )
+            )
+        )
+        .select_related("member", "member__address")
+        .order_by(F("route_position").asc(nulls_last=True), "pk")
+    )
+    clients_on_route = list(clients)
+    for client in clients_on_route:
+        client.has_been_configured = client.route_position is not None
     return clients_on_route
 
 
@@ -1358,87 +1385,73 @@ def get_clients_on_delivery_history(delivery_history, func_add_warning_message=N
     DeliveryHistory-related views.
 
     Returns a list of client instances with extra attributes
-    `has_been_configured` and `order_of_the_day`, ordered by configured
-    then unconfigured.
-
-    `order_of_the_day` could be none if we can't find the order and the
-    client is on the sequence. We assume that the order was deleted.
+    `has_been_configured` and `order_of_the_day`, ordered by the sequence
+    of the delivery, then by the sequence of the route for the clients not
+    configured, then by id.
 
     `func_add_warning_message` accepts one single string-like parameter.
-    It is called when we find a data integrity problem. That is when
-    there's a client that doesn't exist or we can't find his order
-    on that day any more.
+    It is called for the clients on the sequence of the delivery whose
+    order on that day can't be found any more (the order was deleted or
+    the client changed route).
 
     See also: member.tests.RouteDeliveryHistoryDetailViewTestCase
     """
-    orders = Order.objects.get_shippable_orders_by_route(
-        delivery_history.route.pk,
-        delivery_history.date,
-        exclude_non_geolocalized=True,
-    ).select_related("client", "client__member", "client__member__address")
-    clients = []
-    clients_dict = {}
-    for order in orders:
-        c = order.client
-        c.order_of_the_day = order
-        clients.append(c)
-        clients_dict[c.pk] = c
-
+    orders = (
+        Order.objects.get_shippable_orders_by_route(
+            delivery_history.route.pk,
+            delivery_history.date,
+            exclude_non_geolocalized=True,
+        )
+        .annotate(
+            delivery_position=Subquery(
+                DeliveryStop.objects.filter(
+                    delivery_history=delivery_history, client=OuterRef("client")
+                ).values("position")
+            ),
+            route_position=Subquery(
+                RouteStop.objects.filter(
+                    route=delivery_history.route_id, client=OuterRef("client")
+                ).values("position")
+            ),
+        )
+        .select_related("client", "client__member", "client__member__address")
+        .order_by(
+            F("delivery_position").asc(nulls_last=True),
+            F("route_position").asc(nulls_last=True),
+            "client",
+        )
+    )
     clients_on_delivery_history = []
+    for order in orders:
+        client = order.client
+        client.order_of_the_day = order
+        client.has_been_configured = order.delivery_position is not None
+        clients_on_delivery_history.append(client)
 
-    # First, check the clients on `id_sequence` and see if we put them in the
-    # display sequence.
-    for client_pk in delivery_history.client_id_sequence or []:
-        if client_pk in clients_dict:
-            client = clients_dict[client_pk]
-            client.has_been_configured = True
-            clients_on_delivery_history.append(client)
-            del clients_dict[client_pk]
-        else:
-            # Oops, a data integrity error. Let user know.
-            if func_add_warning_message:
-                try:
-                    client = Client.objects.select_related("member").get(
-                        pk=int(client_pk)
-                    )
-                    func_add_warning_message(
-                        mark_safe(
-                            _(
-                                "The client <a href={url}>{firstname} {lastname}"
-                                "</a> is found on this delivery sequence but is no "
-                                "longer valid for this delivery."
-                            ).format(
-                                firstname=client.member.firstname,
-                                lastname=client.member.lastname,
-                                url=reverse(
-                                    "member:client_information", args=(client.pk,)
-                                ),
-                            )
-                        )
-                    )
-                except (Client.DoesNotExist, ValueError, TypeError):
-                    func_add_warning_message(
-                        _(
-                            "The delivery sequence contains a client with ID"
-                            "{client_id} that no longer exists in the "
-                            "database."
-                        ).format(client_id=client_pk)
+    if func_add_warning_message:
+        # Oops, a data integrity error. Let user know.
+        for stop in (
+            delivery_history.stops.exclude(
+                client__in=[client.pk for client in clients_on_delivery_history]
+            )
+            .select_related("client__member")
+            .order_by("position")
+        ):
+            func_add_warning_message(
+                mark_safe(
+                    _(
+                        "The client <a href={url}>{firstname} {lastname}"
+                        "</a> is found on this delivery sequence but is no "
+                        "longer valid for this delivery."
+                    ).format(
+                        firstname=stop.client.member.firstname,
+                        lastname=stop.client.member.lastname,
+                        url=reverse(
+                            "member:client_information", args=(stop.client_id,)
+                        ),
                     )
-
-    # Then, check if there are clients that exist on default route sequence.
-    # They are considered as "by default".
-    for cpk in delivery_history.route.client_id_sequence or []:
-        if cpk in clients_dict:
-            client = clients_dict[cpk]
-            client.has_been_configured = False
-            clients_on_delivery_history.append(client)
-            del clients_dict[cpk]
-
-    # Finally, check the clients that had delivery on that day but were not
-    # configured on the delivery sequence. Append them to the display sequence.
-    for _client_pk, client in clients_dict.items():
-        client.has_been_configured = False
-        clients_on_delivery_history.append(client)
+                )
+            )
     return clients_on_delivery_history
 
 
@@ -1467,7 +1480,7 @@ class RouteEditView(
     LoginRequiredMixin, PermissionRequiredMixin, generic.edit.UpdateView
 ):
     model = Route
-    fields = ("name", "description", "vehicle", "client_id_sequence")
+    form_class = RouteForm
     permission_required = "sous_chef.edit"
     template_name = "route/edit.html"
 
@@ -1496,7 +1509,9 @@ class RouteEditView(
 def get_minimised_euclidean_distances_route_sequence(request, pk):
     """
     Return the sequence of clients on the given route that minimises
-    euclidean distances, as a JSON list of client IDs.
+    the travel time on the road network with the vehicle of the route, or
+    the euclidean distances without road network, as a JSON list of client
+    IDs.
     """
     route = get_object_or_404(Route, pk=pk)
     clients_on_route = get_clients_on_route(route)
@@ -1510,7 +1525,7 @@ def get_minimised_euclidean_distances_route_sequence(request, pk):
             clients_on_route,
         )
     )
-    optimised_waypoints = calculateRoutePointsEuclidean(waypoints)
+    optimised_waypoints = calculateRoutePoints(waypoints, route.vehicle)
     return JsonResponse(list(map(lambda w: w["id"], optimised_waypoints)), safe=False)
 
 
@@ -27,15 +27,22 @@ from souschef.note.forms import (
 from souschef.note.models import (
     Note,
 )
+from souschef.sous_chef.pagination import KeysetPaginationMixin
 
 # Create your views here.
 
 
-class NoteList(LoginRequiredMixin, PermissionRequiredMixin, generic.ListView):
+class NoteList(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    KeysetPaginationMixin,
+    generic.ListView,
+):
     # Display the list of notes
     context_object_name = "notes"
     model = Note
     paginate_by = 20
+    keyset_ordering = ["-date_modified", "-id"]
     permission_required = "sous_chef.read"
     template_name = "notes_list.html"
 
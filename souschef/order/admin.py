@@ -1,19 +1,18 @@
 from django.contrib import admin
 
+from souschef.order.constants import ORDER_STATUS_DELIVERED
 from souschef.order.models import (
+    ArchivedOrder,
+    ArchivedOrder_item,
     Order,
     Order_item,
     OrderStatusChange,
 )
 
 
-@admin.action(
-    description="Mark selected orders as delivered"
-)
+@admin.action(description="Mark selected orders as delivered")
 def make_delivered(modeladmin, request, queryset):
-    queryset.update(status="D")
-
-
+    Order.objects.change_orders_status(queryset, ORDER_STATUS_DELIVERED)
 
 
 class OrderItemInline(admin.TabularInline):
@@ -50,3 +49,22 @@ class OrderAdmin(admin.ModelAdmin):
 
 
 admin.site.register(OrderStatusChange)
+
+
+class ArchivedOrderItemInline(admin.TabularInline):
+    model = ArchivedOrder_item
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    search_fields = ["client__member__lastname", "client__member__firstname"]
+    list_filter = ("status", "delivery_date")
+    list_display = (
+        "id",
+        "client",
+        "status",
+        "price",
+        "delivery_date",
+        "creation_date",
+    )
+    inlines = [ArchivedOrderItemInline]
@@ -0,0 +1,46 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from souschef.order.models import ArchivedOrder
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the billed orders delivered before the retention window to the "
+        "archive tables, in batches. Can be interrupted and run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            default=730,
+            type=int,
+            help="The number of days of orders kept in the order tables.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            default=1000,
+            type=int,
+            help="The number of orders archived in each transaction.",
+        )
+
+    def handle(self, *args, **options):
+        before = date.today() - timedelta(days=options["retention_days"])
+        batch_size = options["batch_size"]
+        start = time.perf_counter()
+
+        archived = 0
+        while True:
+            count = ArchivedOrder.objects.archive_orders(before, batch_size)
+            archived += count
+            if count < batch_size:
+                break
+            self.stdout.write(f"{archived} orders archived...")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{archived} orders delivered before {before} archived, in "
+                f"{time.perf_counter() - start:.2f}s."
+            )
+        )
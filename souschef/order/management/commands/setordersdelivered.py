@@ -6,10 +6,6 @@ from django.contrib.admin.models import (
 )
 from django.core.management.base import BaseCommand
 
-from souschef.order.constants import (
-    ORDER_STATUS_DELIVERED,
-    ORDER_STATUS_ORDERED,
-)
 from souschef.order.models import (
     Order,
 )
@@ -28,9 +24,7 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         delivery_date = datetime.strptime(options["delivery_date"], "%Y-%m-%d").date()
 
-        numorders = Order.objects.filter(
-            status=ORDER_STATUS_ORDERED, delivery_date=delivery_date
-        ).update(status=ORDER_STATUS_DELIVERED)
+        numorders = Order.objects.set_orders_delivered(delivery_date)
 
         # Log the execution
         LogEntry.objects.log_action(
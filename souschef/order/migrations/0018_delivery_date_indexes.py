@@ -0,0 +1,26 @@
+# Generated by Django 5.2.9 on 2026-10-19 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("member", "0043_scheduled_status_index"),
+        ("order", "0017_total_quantity_not_nullable"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["delivery_date", "status", "client"],
+                name="order_date_status_client_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["client", "delivery_date"], name="order_client_date_idx"
+            ),
+        ),
+    ]
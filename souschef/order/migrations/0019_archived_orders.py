@@ -0,0 +1,155 @@
+# Generated by Django 5.2.9 on 2026-10-19 12:11
+
+import json
+
+import annoying.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("member", "0044_member_search_key"),
+        ("order", "0018_delivery_date_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("creation_date", models.DateField(verbose_name="creation date")),
+                ("delivery_date", models.DateField(verbose_name="delivery date")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("O", "Ordered"),
+                            ("D", "Delivered"),
+                            ("N", "No Charge"),
+                            ("C", "Cancelled"),
+                            ("B", "Billed"),
+                            ("P", "Paid"),
+                        ],
+                        max_length=1,
+                        verbose_name="order status",
+                    ),
+                ),
+                (
+                    "status_changes",
+                    annoying.fields.JSONField(
+                        blank=True,
+                        default=list,
+                        deserializer=json.loads,
+                        serializer=annoying.fields.dumps,
+                    ),
+                ),
+                (
+                    "client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_orders",
+                        to="member.client",
+                        verbose_name="client",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "archived orders",
+                "ordering": ["-delivery_date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedOrder_item",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                (
+                    "price",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=6, verbose_name="price"
+                    ),
+                ),
+                ("billable_flag", models.BooleanField(verbose_name="billable flag")),
+                (
+                    "size",
+                    models.CharField(
+                        blank=True,
+                        choices=[("", ""), ("R", "Regular"), ("L", "Large")],
+                        max_length=1,
+                        null=True,
+                        verbose_name="size",
+                    ),
+                ),
+                (
+                    "order_item_type",
+                    models.CharField(
+                        choices=[
+                            (
+                                "meal_component",
+                                "Meal component (main dish, "
+                                "vegetable, side dish, seasonal)",
+                            ),
+                            (
+                                "delivery",
+                                "Delivery (general store item, invitation, ...)",
+                            ),
+                            ("pickup", "Pickup (payment)"),
+                            ("visit", "Visit"),
+                        ],
+                        max_length=20,
+                        verbose_name="order item type",
+                    ),
+                ),
+                (
+                    "remark",
+                    models.CharField(
+                        blank=True, max_length=256, null=True, verbose_name="remark"
+                    ),
+                ),
+                ("total_quantity", models.IntegerField(verbose_name="total quantity")),
+                (
+                    "free_quantity",
+                    models.IntegerField(
+                        blank=True, null=True, verbose_name="free quantity"
+                    ),
+                ),
+                (
+                    "component_group",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("main_dish", "Main Dish"),
+                            ("dessert", "Dessert"),
+                            ("diabetic", "Diabetic"),
+                            ("fruit_salad", "Fruit Salad"),
+                            ("green_salad", "Green Salad"),
+                            ("pudding", "Pudding"),
+                            ("compote", "Compote"),
+                            ("sides", "Sides"),
+                        ],
+                        max_length=100,
+                        null=True,
+                        verbose_name="component group",
+                    ),
+                ),
+                (
+                    "order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="orders",
+                        to="order.archivedorder",
+                        verbose_name="order",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "archived order items",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="archivedorder",
+            index=models.Index(
+                fields=["client", "delivery_date"], name="archivedorder_client_date_idx"
+            ),
+        ),
+    ]
@@ -1,4 +1,6 @@
+import calendar
 import collections
+import logging
 import re
 from collections.abc import Sequence
 from dataclasses import dataclass
@@ -8,9 +10,10 @@ from datetime import (
 )
 from typing import TYPE_CHECKING, Any, cast
 
+from annoying.fields import JSONField
 from django.core.exceptions import ValidationError
 from django.db import (
-    connection,
+    connections,
     models,
     transaction,
 )
@@ -22,6 +25,7 @@ from souschef.meal.constants import (
     COMPONENT_GROUP_CHOICES_MAIN_DISH,
     COMPONENT_GROUP_CHOICES_SIDES,
 )
+from souschef.meal.models import Component_ingredient
 from souschef.member.constants import (
     DAYS_OF_WEEK,
     OPTION_GROUP_CHOICES_PREPARATION,
@@ -41,10 +45,26 @@ from souschef.order.prices import (
     get_main_dish_unit_price,
     get_side_unit_price,
 )
+from souschef.sous_chef.dbrouting import get_read_database
+from souschef.sous_chef.slowqueries import skip_call_site
 
 if TYPE_CHECKING:
     from souschef.member.models import Client
 
+logger = logging.getLogger(__name__)
+
+
+def get_month_range(year, month) -> tuple[date, date]:
+    """
+    Return the first and last days of the given month.
+
+    Filtering on a date range (instead of extracting the month from the
+    date) allows the database to use the indexes on `delivery_date`.
+    """
+    year, month = int(year), int(month)
+    _weekday, number_of_days = calendar.monthrange(year, month)
+    return date(year, month, 1), date(year, month, number_of_days)
+
 
 class OrderManager(models.Manager):
     def get_orders(self, delivery_date=None, order_statuses=None):
@@ -98,6 +118,83 @@ class OrderManager(models.Manager):
             **extra_kwargs,
         )
 
+    def set_orders_delivered(self, delivery_date):
+        """
+        Set the status of the orders still 'Ordered' on the given delivery
+        date to 'Delivered'.
+
+        Returns the number of updated orders.
+        """
+        orders = self.get_queryset().filter(
+            status=ORDER_STATUS_ORDERED, delivery_date=delivery_date
+        )
+        return len(
+            self.change_orders_status(
+                orders, ORDER_STATUS_DELIVERED, status_from=ORDER_STATUS_ORDERED
+            )
+        )
+
+    @transaction.atomic
+    def change_orders_status(self, orders, status_to, status_from=None, reason=""):
+        """
+        Change the status of many orders at once, recording an
+        `OrderStatusChange` for each of them.
+
+        Parameters:
+          orders: a queryset or a list of orders
+          status_to: the new status
+          status_from: the status, or a collection of statuses, the orders
+            must currently have (any status by default). If an order has
+            another status, a ValidationError is raised and no order is
+            changed.
+          reason: the reason of the change, recorded in the audit trail
+
+        The orders already having the new status are left untouched.
+
+        Returns:
+          The created `OrderStatusChange` instances.
+        """
+        if isinstance(orders, models.QuerySet):
+            order_ids = orders.values("pk")
+        else:
+            order_ids = [order.pk for order in orders]
+        current_statuses = dict(
+            self.get_queryset()
+            .filter(pk__in=order_ids)
+            .exclude(status=status_to)
+            .select_for_update()
+            .order_by("pk")
+            .values_list("pk", "status")
+        )
+
+        if status_from is not None:
+            if isinstance(status_from, str):
+                status_from = {status_from}
+            invalid_ids = [
+                order_id
+                for order_id, status in current_statuses.items()
+                if status not in status_from
+            ]
+            if invalid_ids:
+                raise ValidationError(
+                    _("Invalid order status update for the orders %(orders)s."),
+                    code="status_from_incorrect",
+                    params={"orders": ", ".join(f"#{pk}" for pk in invalid_ids)},
+                )
+
+        self.get_queryset().filter(pk__in=list(current_statuses)).update(
+            status=status_to
+        )
+        return OrderStatusChange.objects.bulk_create(
+            OrderStatusChange(
+                order_id=order_id,
+                status_from=status,
+                status_to=status_to,
+                reason=reason,
+            )
+            for order_id, status in current_statuses.items()
+        )
+
     def get_billable_orders(self, year, month):
         """
         Return the orders that have successfully delivered during
@@ -105,8 +202,7 @@ class OrderManager(models.Manager):
         A period is represented by a year and a month.
         """
         return self.get_queryset().filter(
-            delivery_date__year=year,
-            delivery_date__month=month,
+            delivery_date__range=get_month_range(year, month),
             status__in=(ORDER_STATUS_DELIVERED, ORDER_STATUS_NO_CHARGE),
         )
 
@@ -117,8 +213,7 @@ class OrderManager(models.Manager):
         A period is represented by a year and a month.
         """
         return self.get_queryset().filter(
-            delivery_date__year=year,
-            delivery_date__month=month,
+            delivery_date__range=get_month_range(year, month),
             client=client,
             status__in=(ORDER_STATUS_DELIVERED, ORDER_STATUS_NO_CHARGE),
         )
@@ -238,89 +333,123 @@ class OrderManager(models.Manager):
         Every main dish comes with a free side dish. (thus not billable)
         """
         order = Order.objects.create(client=client, delivery_date=delivery_date)
-        free_side_dishes: int = items.get("main_dish_default_quantity") or 0
+        for order_item in make_order_items(order, items, is_main_dish_billable):
+            order_item.save()
 
-        for component_group, _trans in COMPONENT_GROUP_CHOICES:
-            if component_group != COMPONENT_GROUP_CHOICES_SIDES:
-                item_qty: int = items.get(component_group + "_default_quantity") or 0
-                if item_qty == 0:
-                    continue
+        return order
 
-                common_kwargs = {
-                    "order": order,
-                    "component_group": component_group,
-                    "order_item_type": ORDER_ITEM_TYPE_CHOICES_COMPONENT,
-                }
+    def update_orders_status(self, orders, new):
+        """
+        Allow changing status of multiple orders at once.
+        """
+        return len(self.change_orders_status(orders, new))
 
-                if component_group == COMPONENT_GROUP_CHOICES_MAIN_DISH:
-                    unit_price = get_main_dish_unit_price(
-                        rate_type=cast(RateType, client.rate_type),
-                        size=items["size_default"],
-                    )
-                    price = item_qty * unit_price
-                    # main dish
-                    Order_item.objects.create(
+
+def make_order_items(
+    order: "Order", items: dict[str, Any], is_main_dish_billable: bool = True
+) -> list["Order_item"]:
+    """
+    Build (without saving) the order items of an order, with their prices.
+
+    See `OrderManager.create_order` for the format of `items`.
+    Every main dish comes with a free side dish. (thus not billable)
+    """
+    order_items = []
+    rate_type = cast(RateType, order.client.rate_type)
+    free_side_dishes: int = items.get("main_dish_default_quantity") or 0
+
+    for component_group, _trans in COMPONENT_GROUP_CHOICES:
+        if component_group != COMPONENT_GROUP_CHOICES_SIDES:
+            item_qty: int = items.get(component_group + "_default_quantity") or 0
+            if item_qty == 0:
+                continue
+
+            common_kwargs = {
+                "order": order,
+                "component_group": component_group,
+                "order_item_type": ORDER_ITEM_TYPE_CHOICES_COMPONENT,
+            }
+
+            if component_group == COMPONENT_GROUP_CHOICES_MAIN_DISH:
+                unit_price = get_main_dish_unit_price(
+                    rate_type=rate_type, size=items["size_default"]
+                )
+                price = item_qty * unit_price
+                # main dish
+                order_items.append(
+                    Order_item(
                         size=items["size_default"],
                         total_quantity=item_qty,
                         price=price,
                         billable_flag=is_main_dish_billable,
                         **common_kwargs,
                     )
-                else:
-                    # side dish: deduct+billable
-                    deduct = min(free_side_dishes, item_qty)
-                    free_side_dishes -= deduct
-                    unit_price = get_side_unit_price(
-                        rate_type=cast(RateType, client.rate_type)
-                    )
-                    if deduct > 0:
-                        # free side dishes
-                        Order_item.objects.create(
+                )
+            else:
+                # side dish: deduct+billable
+                deduct = min(free_side_dishes, item_qty)
+                free_side_dishes -= deduct
+                unit_price = get_side_unit_price(rate_type=rate_type)
+                if deduct > 0:
+                    # free side dishes
+                    order_items.append(
+                        Order_item(
                             size=None,
                             total_quantity=deduct,
                             price=deduct * unit_price,
                             billable_flag=False,
                             **common_kwargs,
                         )
+                    )
 
-                    billable = item_qty - deduct
-                    if billable > 0:
-                        # billable side dishes
-                        Order_item.objects.create(
+                billable = item_qty - deduct
+                if billable > 0:
+                    # billable side dishes
+                    order_items.append(
+                        Order_item(
                             size=None,
                             total_quantity=billable,
                             price=billable * unit_price,
                             billable_flag=True,
                             **common_kwargs,
                         )
+                    )
 
-        for order_item_type, _trans in ORDER_ITEM_TYPE_CHOICES:
-            if order_item_type != ORDER_ITEM_TYPE_CHOICES_COMPONENT:
-                additional = items.get(f"{order_item_type}_default")
-                if additional:
-                    Order_item.objects.create(
+    for order_item_type, _trans in ORDER_ITEM_TYPE_CHOICES:
+        if order_item_type != ORDER_ITEM_TYPE_CHOICES_COMPONENT:
+            additional = items.get(f"{order_item_type}_default")
+            if additional:
+                order_items.append(
+                    Order_item(
                         order=order,
                         price=0,
                         total_quantity=0,
                         billable_flag=False,
                         order_item_type=order_item_type,
                     )
+                )
 
-        return order
-
-    """
-    Allow changing status of multiple orders at once.
-    """
-
-    def update_orders_status(self, orders, new):
-        count = orders.update(status=new)
-        return count
+    return order_items
 
 
 class Order(models.Model):
     class Meta:
         verbose_name_plural = _("orders")
         ordering = ["-delivery_date"]
+        indexes = [
+            # Kitchen count, route sheets and billing all filter on
+            # delivery_date and status; client is included so that the
+            # join towards member_client (route) can be done from the index.
+            models.Index(
+                fields=["delivery_date", "status", "client"],
+                name="order_date_status_client_idx",
+            ),
+            # Order generation and client order history.
+            models.Index(
+                fields=["client", "delivery_date"],
+                name="order_client_date_idx",
+            ),
+        ]
 
     # Order information
     creation_date = models.DateField(verbose_name=_("creation date"), auto_now_add=True)
@@ -642,7 +771,7 @@ class Order(models.Model):
 
     @property
     def client_planned_status_at_delivery(self):
-        return self.client.get_status_planned_at_date(self.delivery_date)
+        return self.client.get_status_at_date(self.delivery_date)
 
     @property
     def client_planned_status_at_delivery_verbose(self):
@@ -726,28 +855,25 @@ def sql_prep(query, valuesdict):
     return "".join(mod), values
 
 
+@skip_call_site
 def sql_exec(query, values, heading=""):
     """Execute SQL 'query' passing to it the given 'values'.
 
     Args:
         query: A string, the SQL query containing parameters like %(name)s.
         values: A dictionary of parameter values : {'name': value, ...}.
-        heading: A string that if we debug, will be printed once before
-            all the result rows.
+        heading: A string logged before all the result rows, when the
+            `souschef.order.models` logger is at the DEBUG level.
 
     Returns:
         A list of named tuples, each one is a row returned by the database
         as the result of the SQL query.
     """
-    with connection.cursor() as cursor:
+    with connections[get_read_database()].cursor() as cursor:
         cursor.execute(*sql_prep(query, values))
         rows = named_tuple_fetchall(cursor)
-    # UNCOMMENT THESE LINES FOR DEBUGGING; DO NOT REMOVE
-    # print("\n-----------------------------------------------------\n",
-    #       heading, "\n")
-    # for row in rows:
-    #     print(row)
-    #
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s\n%s", heading, "\n".join(str(row) for row in rows))
     return rows
 
 
@@ -1021,6 +1147,66 @@ def check_for_new_client(kitchen_list, row):
         )
 
 
+class DishClashIndex:
+    """The clients who cannot eat each ingredient on a delivery date.
+
+    Each client having ordered a main dish for the date gets a bit, and
+    each ingredient maps to the bitset (an int) of the clients avoiding it,
+    explicitly or through one of their restricted items. The clients
+    clashing with a dish are then the union of the bitsets of its
+    ingredients, so that the candidate main dishes are scored with a few
+    queries whatever their number.
+    """
+
+    def __init__(self, delivery_date):
+        self.delivery_date = delivery_date
+        orders = Order.objects.filter(
+            delivery_date=delivery_date,
+            orders__component_group=COMPONENT_GROUP_CHOICES_MAIN_DISH,
+        ).exclude(status=ORDER_STATUS_CANCELLED)
+        client_bits = {}
+        self.ingredient_clients = collections.defaultdict(int)
+        for lookup in (
+            "client__ingredients_to_avoid",
+            "client__restrictions__ingredients",
+        ):
+            rows = orders.filter(**{f"{lookup}__isnull": False}).values_list(
+                "client_id", lookup
+            )
+            for client_id, ingredient_id in rows:
+                bit = client_bits.setdefault(client_id, 1 << len(client_bits))
+                self.ingredient_clients[ingredient_id] |= bit
+
+    def count_clashes(self, ingredient_ids) -> int:
+        """The number of clients clashing with any of the ingredients."""
+        clients = 0
+        for ingredient_id in ingredient_ids:
+            clients |= self.ingredient_clients.get(ingredient_id, 0)
+        return clients.bit_count()
+
+    def count_dish_clashes(self, dishes) -> dict[int, int]:
+        """The number of clients clashing with each dish, by dish id.
+
+        The ingredients chosen for the delivery date are used for a dish
+        having some, and the ingredients of its recipe otherwise.
+        """
+        recipes = collections.defaultdict(set)
+        day_ingredients = collections.defaultdict(set)
+        rows = Component_ingredient.objects.filter(
+            models.Q(date=None) | models.Q(date=self.delivery_date),
+            component__in=dishes,
+        ).values_list("component_id", "ingredient_id", "date")
+        for component_id, ingredient_id, day in rows:
+            ingredients = recipes if day is None else day_ingredients
+            ingredients[component_id].add(ingredient_id)
+        return {
+            dish.id: self.count_clashes(
+                day_ingredients.get(dish.id) or recipes.get(dish.id, ())
+            )
+            for dish in dishes
+        }
+
+
 # End Order.kitchen items helpers
 
 
@@ -1208,3 +1394,187 @@ class OrderStatusChange(models.Model):
         super().save(*a, **k)
         self.order.status = self.status_to
         self.order.save()
+
+
+class ArchivedOrderManager(models.Manager):
+    @transaction.atomic
+    def archive_orders(self, before, batch_size=1000):
+        """
+        Move at most `batch_size` orders delivered before `before`, and
+        attached to a billing, to the archive tables, with their items,
+        their billings and their status changes.
+
+        Returns the number of orders archived, so that the caller can
+        repeat until it is lower than `batch_size`.
+        """
+        order_ids = list(
+            Order.objects.filter(delivery_date__lt=before, billing__isnull=False)
+            .order_by("id")
+            .values_list("id", flat=True)
+            .distinct()[:batch_size]
+        )
+        if not order_ids:
+            return 0
+
+        status_changes = collections.defaultdict(list)
+        for change in OrderStatusChange.objects.filter(order__in=order_ids):
+            status_changes[change.order_id].append(
+                {
+                    "status_from": change.status_from,
+                    "status_to": change.status_to,
+                    "reason": change.reason,
+                    "change_time": change.change_time.isoformat(),
+                }
+            )
+        self.bulk_create(
+            ArchivedOrder(
+                id=order.id,
+                creation_date=order.creation_date,
+                delivery_date=order.delivery_date,
+                status=order.status,
+                client_id=order.client_id,
+                status_changes=status_changes[order.id],
+            )
+            for order in Order.objects.filter(id__in=order_ids)
+        )
+        # The items have the same fields, the order being the archived one.
+        item_fields = [f.attname for f in ArchivedOrder_item._meta.concrete_fields]
+        ArchivedOrder_item.objects.bulk_create(
+            ArchivedOrder_item(**{name: getattr(item, name) for name in item_fields})
+            for item in Order_item.objects.filter(order__in=order_ids)
+        )
+        ArchivedBillings = ArchivedOrder.billings.through
+        ArchivedBillings.objects.bulk_create(
+            ArchivedBillings(billing_id=billing_id, archivedorder_id=order_id)
+            for billing_id, order_id in Order.billing_set.through.objects.filter(
+                order__in=order_ids
+            ).values_list("billing_id", "order_id")
+        )
+        # The items, the status changes and the links to the billings
+        # are deleted in cascade.
+        Order.objects.filter(id__in=order_ids).delete()
+        return len(order_ids)
+
+
+class ArchivedOrder(models.Model):
+    """
+    An order of a past billing period, moved out of the order tables by
+    the `archiveorders` command to keep them (and their indexes) small.
+
+    It keeps the id of the order, and reads like an order for the billing
+    code: the items are in `orders` and `price` and `simple_summary` are
+    computed the same way.
+    """
+
+    class Meta:
+        verbose_name_plural = _("archived orders")
+        ordering = ["-delivery_date"]
+        indexes = [
+            models.Index(
+                fields=["client", "delivery_date"],
+                name="archivedorder_client_date_idx",
+            ),
+        ]
+
+    id = models.IntegerField(primary_key=True)
+
+    creation_date = models.DateField(verbose_name=_("creation date"))
+
+    delivery_date = models.DateField(verbose_name=_("delivery date"))
+
+    status = models.CharField(
+        max_length=1,
+        choices=ORDER_STATUS,
+        verbose_name=_("order status"),
+    )
+
+    client = models.ForeignKey(
+        "member.Client",
+        verbose_name=_("client"),
+        related_name="archived_orders",
+        on_delete=models.CASCADE,
+    )
+
+    # The status changes of the order, as a list of dictionaries.
+    status_changes = JSONField(default=list, blank=True)
+
+    objects = ArchivedOrderManager()
+
+    is_archived = True
+
+    price = Order.price
+
+    simple_summary = Order.simple_summary
+
+    def __str__(self):
+        return f"client={self.client}, delivery_date={self.delivery_date} (archived)"
+
+
+class ArchivedOrder_item(models.Model):
+    """An item of an archived order, keeping the id of the order item."""
+
+    class Meta:
+        verbose_name_plural = _("archived order items")
+
+    id = models.IntegerField(primary_key=True)
+
+    order = models.ForeignKey(
+        ArchivedOrder,
+        verbose_name=_("order"),
+        related_name="orders",
+        on_delete=models.CASCADE,
+    )
+
+    price = models.DecimalField(max_digits=6, decimal_places=2, verbose_name=_("price"))
+
+    billable_flag = models.BooleanField(
+        verbose_name=_("billable flag"),
+    )
+
+    size = models.CharField(
+        verbose_name=_("size"),
+        max_length=1,
+        null=True,
+        blank=True,
+        choices=SIZE_CHOICES,
+    )
+
+    order_item_type = models.CharField(
+        verbose_name=_("order item type"),
+        max_length=20,
+        choices=ORDER_ITEM_TYPE_CHOICES,
+    )
+
+    remark = models.CharField(
+        max_length=256,
+        verbose_name=_("remark"),
+        null=True,
+        blank=True,
+    )
+
+    total_quantity = models.IntegerField(
+        verbose_name=_("total quantity"),
+    )
+
+    free_quantity = models.IntegerField(
+        verbose_name=_("free quantity"),
+        null=True,
+        blank=True,
+    )
+
+    component_group = models.CharField(
+        max_length=100,
+        choices=COMPONENT_GROUP_CHOICES,
+        verbose_name=_("component group"),
+        null=True,
+        blank=True,
+    )
+
+    def __str__(self):
+        return Order_item.__str__(self)
+
+    get_billable_flag_display = Order_item.get_billable_flag_display
+
+    get_order_item_type_display = Order_item.get_order_item_type_display
+
+    is_a_client_bill = Order_item.is_a_client_bill
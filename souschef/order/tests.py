@@ -22,7 +22,13 @@ from django.utils.translation import gettext as _
 from souschef.meal.constants import (
     COMPONENT_GROUP_CHOICES_MAIN_DISH,
 )
-from souschef.meal.factories import ComponentFactory
+from souschef.meal.factories import (
+    ComponentFactory,
+    ComponentIngredientFactory,
+    IncompatibilityFactory,
+    IngredientFactory,
+    RestrictedItemFactory,
+)
 from souschef.member.factories import (
     ClientFactory,
     RouteFactory,
@@ -30,7 +36,9 @@ from souschef.member.factories import (
 from souschef.member.models import (
     Address,
     Client,
+    Client_avoid_ingredient,
     Member,
+    Restriction,
     Route,
 )
 from souschef.order.constants import (
@@ -41,6 +49,7 @@ from souschef.order.constants import (
 )
 from souschef.order.factories import OrderFactory
 from souschef.order.models import (
+    DishClashIndex,
     Order,
     Order_item,
     OrderStatusChange,
@@ -142,6 +151,123 @@ class OrderManagerTestCase(TestCase):
         )
         self.assertEqual(ordered_count, len(delivered))
 
+    def test_change_orders_status(self):
+        """
+        Should change the status of the orders in bulk, recording the
+        status changes.
+        """
+        orders = Order.objects.filter(pk__in=[o.pk for o in self.orders])
+        with self.assertNumQueries(5):
+            changes = Order.objects.change_orders_status(
+                orders,
+                ORDER_STATUS_CANCELLED,
+                status_from=ORDER_STATUS_ORDERED,
+                reason="Holidays",
+            )
+        self.assertEqual(len(changes), len(self.orders))
+        self.assertFalse(orders.exclude(status=ORDER_STATUS_CANCELLED).exists())
+        for order in self.orders:
+            change = order.status_changes.get()
+            self.assertEqual(change.status_from, ORDER_STATUS_ORDERED)
+            self.assertEqual(change.status_to, ORDER_STATUS_CANCELLED)
+            self.assertEqual(change.reason, "Holidays")
+            self.assertIsNotNone(change.change_time)
+
+        # The orders already cancelled are left untouched.
+        changes = Order.objects.change_orders_status(orders, ORDER_STATUS_CANCELLED)
+        self.assertEqual(changes, [])
+
+    def test_change_orders_status_invalid_status_from(self):
+        """
+        Should change no order if one of them does not have the expected
+        status.
+        """
+        delivered = self.orders[0]
+        delivered.status = ORDER_STATUS_DELIVERED
+        delivered.save()
+        with self.assertRaises(ValidationError) as cm:
+            Order.objects.change_orders_status(
+                self.orders, ORDER_STATUS_CANCELLED, status_from=ORDER_STATUS_ORDERED
+            )
+        self.assertIn(f"#{delivered.pk}", cm.exception.messages[0])
+        self.assertFalse(
+            Order.objects.filter(
+                pk__in=[o.pk for o in self.orders], status=ORDER_STATUS_CANCELLED
+            ).exists()
+        )
+        self.assertFalse(OrderStatusChange.objects.exists())
+
+
+class DishClashIndexTestCase(TestCase):
+    fixtures = ["routes.json"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.day = date(2025, 3, 10)
+        cls.pork = IngredientFactory(name="Pork")
+        cls.peanuts = IngredientFactory(name="Peanuts")
+        cls.rice = IngredientFactory(name="Rice")
+        cls.ginger_pork = ComponentFactory(
+            name="Ginger pork", component_group=COMPONENT_GROUP_CHOICES_MAIN_DISH
+        )
+        cls.pad_thai = ComponentFactory(
+            name="Pad thai", component_group=COMPONENT_GROUP_CHOICES_MAIN_DISH
+        )
+        for dish, ingredients in (
+            (cls.ginger_pork, [cls.pork, cls.rice]),
+            (cls.pad_thai, [cls.peanuts, cls.rice]),
+        ):
+            for ingredient in ingredients:
+                ComponentIngredientFactory(component=dish, ingredient=ingredient)
+
+        cls.orders = OrderFactory.create_batch(
+            3,
+            delivery_date=cls.day,
+            status=ORDER_STATUS_ORDERED,
+            order_item__component_group=COMPONENT_GROUP_CHOICES_MAIN_DISH,
+        )
+        clients = [order.client for order in cls.orders]
+        # The first client avoids pork, the second one does not eat
+        # meat and the third one avoids pork and peanuts.
+        Client_avoid_ingredient.objects.create(client=clients[0], ingredient=cls.pork)
+        meat = IncompatibilityFactory(
+            restricted_item=RestrictedItemFactory(
+                name="meat", restricted_item_group="meat"
+            ),
+            ingredient=cls.pork,
+        ).restricted_item
+        Restriction.objects.create(client=clients[1], restricted_item=meat)
+        Restriction.objects.create(client=clients[2], restricted_item=meat)
+        Client_avoid_ingredient.objects.create(
+            client=clients[2], ingredient=cls.peanuts
+        )
+
+    def test_count_dish_clashes(self):
+        index = DishClashIndex(self.day)
+        self.assertEqual(
+            index.count_dish_clashes([self.ginger_pork, self.pad_thai]),
+            {self.ginger_pork.id: 3, self.pad_thai.id: 1},
+        )
+        self.assertEqual(index.count_clashes([self.rice.id]), 0)
+
+    def test_day_ingredients(self):
+        """The ingredients chosen for the day replace the recipe."""
+        ComponentIngredientFactory(
+            component=self.ginger_pork, ingredient=self.rice, date=self.day
+        )
+        clashes = DishClashIndex(self.day).count_dish_clashes([self.ginger_pork])
+        self.assertEqual(clashes, {self.ginger_pork.id: 0})
+
+    def test_cancelled_orders(self):
+        """Only the clients of the orders not cancelled clash."""
+        Order.objects.filter(id=self.orders[1].id).update(status=ORDER_STATUS_CANCELLED)
+        clashes = DishClashIndex(self.day).count_dish_clashes([self.ginger_pork])
+        self.assertEqual(clashes, {self.ginger_pork.id: 2})
+        other_day = DishClashIndex(date(2025, 3, 11))
+        self.assertEqual(
+            other_day.count_dish_clashes([self.ginger_pork]), {self.ginger_pork.id: 0}
+        )
+
 
 class OrderItemTestCase(TestCase):
     @classmethod
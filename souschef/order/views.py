@@ -7,6 +7,7 @@ from django.contrib.auth.mixins import (
     LoginRequiredMixin,
     PermissionRequiredMixin,
 )
+from django.db.models import Prefetch, prefetch_related_objects
 from django.http import HttpResponse
 from django.http.response import HttpResponseRedirect
 from django.shortcuts import get_object_or_404
@@ -35,6 +36,7 @@ from souschef.meal.settings import COMPONENT_SYSTEM_DEFAULT
 from souschef.member.constants import DAYS_OF_WEEK
 from souschef.member.models import (
     Client,
+    ClientScheduledStatus,
 )
 from souschef.order.constants import (
     ORDER_STATUS,
@@ -55,12 +57,20 @@ from souschef.order.models import (
     Order,
     OrderStatusChange,
 )
+from souschef.sous_chef.dbrouting import reporting
+from souschef.sous_chef.pagination import KeysetPaginationMixin
 
 
-class OrderList(LoginRequiredMixin, PermissionRequiredMixin, generic.ListView):
+class OrderList(
+    LoginRequiredMixin,
+    PermissionRequiredMixin,
+    KeysetPaginationMixin,
+    generic.ListView,
+):
     context_object_name = "orders"
     model = Order
     paginate_by = 20
+    keyset_ordering = ["-delivery_date", "id"]
     permission_required = "sous_chef.read"
     template_name = "list.html"
 
@@ -68,6 +78,30 @@ class OrderList(LoginRequiredMixin, PermissionRequiredMixin, generic.ListView):
         uf = OrderFilter(self.request.GET)
         return uf.qs.select_related("client__member").prefetch_related("orders")
 
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, orders, is_paginated = super().paginate_queryset(
+            queryset, page_size
+        )
+        # Used by `Order.client_planned_status_at_delivery`: the scheduled
+        # changes for the coming orders, the status history for the past
+        # ones. Only what the page needs is prefetched.
+        today = datetime.now().date()
+        lookups = []
+        if any(order.delivery_date >= today for order in orders):
+            lookups.append(
+                Prefetch(
+                    "client__scheduled_statuses",
+                    queryset=ClientScheduledStatus.objects.filter(
+                        change_state=ClientScheduledStatus.END,
+                        operation_status=ClientScheduledStatus.TOBEPROCESSED,
+                    ),
+                )
+            )
+        if any(order.delivery_date < today for order in orders):
+            lookups.append("client__status_intervals")
+        prefetch_related_objects(orders, *lookups)
+        return paginator, page, orders, is_paginated
+
     def get_context_data(self, **kwargs):
         uf = OrderFilter(self.request.GET, queryset=self.get_queryset())
 
@@ -96,7 +130,8 @@ class OrderList(LoginRequiredMixin, PermissionRequiredMixin, generic.ListView):
         self.format = request.GET.get("format", False)
 
         if self.format == "csv":
-            return ExportCSV(self, self.get_queryset())
+            with reporting():
+                return ExportCSV(self, self.get_queryset())
 
         return super().get(request, **kwargs)
 
@@ -5,6 +5,10 @@ from django.conf import settings
 
 
 def clean_old_pdf_files():
+    """
+    Remove the generated PDF files older than a year. Returns their number.
+    """
+    removed = 0
     now = time.time()
     a_year = 356 * 24 * 60 * 60
     for filename in os.listdir(settings.GENERATED_DOCS_DIR):
@@ -15,3 +19,5 @@ def clean_old_pdf_files():
             and os.path.isfile(file_path)
         ):
             os.remove(file_path)
+            removed += 1
+    return removed
@@ -0,0 +1,23 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+
+
+class SousChefConfig(AppConfig):
+    name = "souschef.sous_chef"
+
+    def ready(self):
+        from .registry import REFERENCE_MODELS, invalidate_on_change
+        from .slowqueries import install_slow_query_recorder
+
+        connection_created.connect(
+            install_slow_query_recorder,
+            dispatch_uid="connection_created.install_slow_query_recorder",
+        )
+        for model in REFERENCE_MODELS:
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    invalidate_on_change,
+                    sender=model,
+                    dispatch_uid=f"{model}.invalidate_registry",
+                )
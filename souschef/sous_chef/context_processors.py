@@ -3,7 +3,10 @@ import os
 from importlib.metadata import version
 
 from django.conf import settings
+from django.urls import reverse
 
+from souschef.delivery import routing
+from souschef.member.constants import DEFAULT_VEHICLE
 from souschef.member.models import (
     Client,
     Route,
@@ -50,6 +53,13 @@ def total(request):
         "SC_VERSION": get_sous_chef_version(),
         "GIT_HEAD": settings.GIT_HEAD,
         "GIT_TAG": settings.GIT_TAG,
+        # The maps draw the itineraries with the local road network once its
+        # graphs are built, with Mapbox otherwise.
+        "ROUTING_URL": (
+            reverse("delivery:road_itinerary")
+            if routing.is_graph_built(DEFAULT_VEHICLE)
+            else ""
+        ),
     }
 
     return COMMON_CONTEXT
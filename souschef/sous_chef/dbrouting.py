@@ -0,0 +1,152 @@
+"""
+Routing of the report workloads to a read replica of the database.
+
+The reports and exports (kitchen count, route sheets, billing summaries,
+CSV exports) only read, but heavily, on the mornings when the orders are
+edited. In a `reporting()` block, or a view using `ReportingMixin`, the
+reads go to the REPORTING_DATABASE alias when it is configured and
+reachable, and to the primary database otherwise. The writes always go to
+the primary database.
+
+The raw SQL queries use `get_read_database()` to pick their connection.
+
+The replica lags behind the primary database: a request that wrote, and
+the requests of the same browser for READ_AFTER_WRITE_SECONDS after it
+(e.g. the kitchen count after confirming the ingredients), read from the
+primary database (see `ReadAfterWriteMiddleware`).
+"""
+
+import contextvars
+import logging
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+_reporting_database = contextvars.ContextVar("reporting_database", default=None)
+
+# Seconds; longer than the usual replication lag.
+READ_AFTER_WRITE_SECONDS = 10
+
+READ_AFTER_WRITE_COOKIE = "souschef_read_primary"
+
+# The current request, if any, as a dict: whether it wrote, and whether it
+# must read from the primary database.
+_request_state = contextvars.ContextVar("request_state", default=None)
+
+
+def is_pinned():
+    """Whether the reads must go to the primary database after a write."""
+    state = _request_state.get()
+    return state is not None and (state["written"] or state["pinned"])
+
+
+def get_reporting_database():
+    """
+    The alias of the database for the reports: REPORTING_DATABASE, unless
+    it is not configured or its server does not answer.
+    """
+    alias = getattr(settings, "REPORTING_DATABASE", DEFAULT_DB_ALIAS)
+    if alias == DEFAULT_DB_ALIAS or alias not in settings.DATABASES or is_pinned():
+        return DEFAULT_DB_ALIAS
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        logger.warning(
+            "The reporting database %s is unavailable, reading from %s.",
+            alias,
+            DEFAULT_DB_ALIAS,
+            exc_info=True,
+        )
+        return DEFAULT_DB_ALIAS
+    return alias
+
+
+def get_read_database():
+    """The alias of the database to read from in the current context."""
+    if is_pinned():
+        return DEFAULT_DB_ALIAS
+    return _reporting_database.get() or DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def reporting():
+    """
+    Read from the reporting database in the block (or the decorated
+    function).
+    """
+    token = _reporting_database.set(get_reporting_database())
+    try:
+        yield
+    finally:
+        _reporting_database.reset(token)
+
+
+class ReportingMixin:
+    """Read from the reporting database in the view, rendering included."""
+
+    def dispatch(self, request, *args, **kwargs):
+        with reporting():
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+        return response
+
+
+class ReadAfterWriteMiddleware:
+    """
+    Keep the reads on the primary database for the rest of a request that
+    wrote, and for READ_AFTER_WRITE_SECONDS in the next requests of the
+    browser (with a cookie).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = {
+            "written": False,
+            "pinned": READ_AFTER_WRITE_COOKIE in request.COOKIES,
+        }
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        if state["written"]:
+            response.set_cookie(
+                READ_AFTER_WRITE_COOKIE,
+                "1",
+                max_age=READ_AFTER_WRITE_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class ReportingRouter:
+    def db_for_read(self, model, **hints):
+        if is_pinned():
+            return DEFAULT_DB_ALIAS
+        return _reporting_database.get()
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state["written"] = True
+        # Even for the objects read from the reporting database.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The databases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db != DEFAULT_DB_ALIAS and db == getattr(
+            settings, "REPORTING_DATABASE", DEFAULT_DB_ALIAS
+        ):
+            # A replica gets the changes of the primary database.
+            return False
+        return None
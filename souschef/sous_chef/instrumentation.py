@@ -0,0 +1,168 @@
+"""
+Opt-in per-request performance instrumentation.
+
+Enabled with `SOUSCHEF_PERFORMANCE_INSTRUMENTATION=1` (see settings.py), it
+measures for each request:
+
+- the number and the duration of the SQL queries;
+- the duration of the template rendering (including the queries run
+  while rendering);
+- the total duration.
+
+The measures are sent to the browser in a `Server-Timing` header (visible
+in the network tab of the developer tools) and logged on the
+`souschef.performance` logger, tagged with the view name. One request in
+`PERFORMANCE_PROFILE_SAMPLE_RATE` is also profiled with cProfile, to a file
+of `PERFORMANCE_PROFILE_DIR` that can be read with `pstats` or snakeviz.
+"""
+
+import cProfile
+import itertools
+import logging
+import os
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.django import Template as DjangoTemplate
+
+logger = logging.getLogger("souschef.performance")
+
+# The measures of the request being processed.
+current_timings: ContextVar["RequestTimings | None"] = ContextVar(
+    "current_timings", default=None
+)
+
+
+@dataclass
+class RequestTimings:
+    db_queries: int = 0
+    db_time: float = 0
+    template_time: float = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper, see `connection.execute_wrapper`.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.db_queries += 1
+
+
+class TimedTemplate(DjangoTemplate):
+    def render(self, context=None, request=None):
+        timings = current_timings.get()
+        if timings is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    Django templates backend measuring the rendering time of the templates.
+
+    Only the templates rendered by the views are measured: the included
+    templates and the template tags are part of their rendering.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class PerformanceMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.PERFORMANCE_PROFILE_SAMPLE_RATE
+        self.profile_dir = settings.PERFORMANCE_PROFILE_DIR
+        self.counter = itertools.count(1)
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        profiler = None
+        request_number = next(self.counter)
+        if self.sample_rate and request_number % self.sample_rate == 0:
+            profiler = cProfile.Profile()
+
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings))
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+        finally:
+            current_timings.reset(token)
+        total_time = time.perf_counter() - start
+
+        view_name = request.resolver_match and request.resolver_match.view_name
+        profile_path = None
+        if profiler is not None:
+            profile_path = self.dump_profile(profiler, view_name, request_number)
+
+        response["Server-Timing"] = ", ".join(
+            (
+                f'db;dur={timings.db_time * 1000:.1f};desc="{timings.db_queries} '
+                'queries"',
+                f"template;dur={timings.template_time * 1000:.1f}",
+                f"total;dur={total_time * 1000:.1f}",
+            )
+        )
+        logger.info(
+            "view=%s method=%s path=%s status=%s total_ms=%.1f db_queries=%d "
+            "db_ms=%.1f template_ms=%.1f profile=%s",
+            view_name,
+            request.method,
+            request.path,
+            response.status_code,
+            total_time * 1000,
+            timings.db_queries,
+            timings.db_time * 1000,
+            timings.template_time * 1000,
+            profile_path,
+            extra={
+                "view_name": view_name,
+                "method": request.method,
+                "path": request.path,
+                "status_code": response.status_code,
+                "total_ms": total_time * 1000,
+                "db_queries": timings.db_queries,
+                "db_ms": timings.db_time * 1000,
+                "template_ms": timings.template_time * 1000,
+                "profile": profile_path,
+            },
+        )
+        return response
+
+    def dump_profile(self, profiler, view_name, request_number):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(
+            self.profile_dir,
+            "{}-{}-{}-{}.prof".format(
+                time.strftime("%Y%m%d-%H%M%S"),
+                (view_name or "unknown").replace(":", "-"),
+                os.getpid(),
+                request_number,
+            ),
+        )
+        profiler.dump_stats(path)
+        return path
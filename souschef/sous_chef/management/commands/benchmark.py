@@ -0,0 +1,317 @@
+import contextlib
+import json
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from souschef.billing.csvexport import export_csv
+from souschef.billing.models import Billing
+from souschef.billing.views import BillingSummaryView
+from souschef.delivery.views import (
+    IngredientsMissingError,
+    get_kitchen_list,
+    kcr_make_component_lines,
+    kcr_make_meal_lines,
+    make_kitchen_count,
+    make_labels,
+    make_route_sheets,
+)
+from souschef.meal.constants import (
+    COMPONENT_GROUP_CHOICES_MAIN_DISH,
+    COMPONENT_GROUP_CHOICES_SIDES,
+)
+from souschef.meal.models import (
+    Component,
+    Component_ingredient,
+    Ingredient,
+    Menu,
+)
+from souschef.member.models import (
+    Client,
+    DeliveryHistory,
+    Route,
+)
+from souschef.order.models import Order
+from souschef.sous_chef.context_processors import get_sous_chef_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the hot paths (kitchen count, meal labels, route sheets, "
+        "order generation, billing) for a delivery date and output the "
+        "measures as JSON. Nothing is written to the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            help="The delivery date, in the format YYYY-MM-DD. Defaults to today.",
+        )
+        parser.add_argument(
+            "--billing-period",
+            help=(
+                "The billing period, in the format YYYY-MM. Defaults to the "
+                "month before the delivery date."
+            ),
+        )
+        parser.add_argument(
+            "--clients",
+            help=(
+                "Run on a synthetic dataset of this many clients (see "
+                "generate_load_dataset) instead of the current data."
+            ),
+            type=int,
+        )
+        parser.add_argument(
+            "--seed",
+            help="The random seed of the synthetic dataset.",
+            default=42,
+            type=int,
+        )
+        parser.add_argument(
+            "--repeat",
+            help="The number of timed runs of each benchmark, at least 1.",
+            default=3,
+            type=int,
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON to this file instead of the standard output.",
+        )
+
+    def handle(self, *args, **options):
+        if options["date"]:
+            delivery_date = date.fromisoformat(options["date"])
+        else:
+            delivery_date = date.today()
+        if options["billing_period"]:
+            year, month = map(int, options["billing_period"].split("-"))
+        else:
+            previous_month = delivery_date.replace(day=1) - timedelta(days=1)
+            year, month = previous_month.year, previous_month.month
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        self.repeat = options["repeat"]
+
+        # Everything, including the synthetic dataset, is rolled back.
+        with transaction.atomic():
+            if options["clients"]:
+                self.generate_dataset(
+                    options["clients"], options["seed"], delivery_date
+                )
+            results = {
+                "version": get_sous_chef_version(),
+                "database": connection.vendor,
+                "delivery_date": delivery_date.isoformat(),
+                "billing_period": f"{year}-{month:02}",
+                "dataset": {
+                    "clients": Client.objects.count(),
+                    "orders": Order.objects.count(),
+                    "orders_on_date": Order.objects.filter(
+                        delivery_date=delivery_date
+                    ).count(),
+                },
+                "benchmarks": self.run_benchmarks(delivery_date, year, month),
+            }
+            transaction.set_rollback(True)
+
+        output = json.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def generate_dataset(self, clients, seed, delivery_date):
+        """
+        Generate the clients and their orders, then confirm the menu of the
+        day and organize the routes as the staff does before printing.
+        """
+        days = (delivery_date - date.today()).days
+        call_command(
+            "generate_load_dataset",
+            clients=clients,
+            seed=seed,
+            # At least two months of history, for the billing.
+            days=max(62, 62 - days),
+            days_ahead=max(1, days + 1),
+            stdout=self.stderr,
+        )
+
+        sides, _ = Component.objects.get_or_create(
+            component_group=COMPONENT_GROUP_CHOICES_SIDES,
+            defaults={"name": "Sides"},
+        )
+        main_dish = Component.objects.filter(
+            component_group=COMPONENT_GROUP_CHOICES_MAIN_DISH
+        ).first() or Component.objects.create(
+            name="Main dish", component_group=COMPONENT_GROUP_CHOICES_MAIN_DISH
+        )
+        ingredient = Ingredient.objects.first() or Ingredient.objects.create(
+            name="Ingredient"
+        )
+        for component in (main_dish, sides):
+            if not Component_ingredient.objects.filter(
+                component=component, date=delivery_date
+            ).exists():
+                Component_ingredient.objects.create(
+                    component=component, ingredient=ingredient, date=delivery_date
+                )
+        Menu.create_menu_and_components(delivery_date, [main_dish.name])
+
+        for route in Route.objects.exclude(delivery_histories__date=delivery_date):
+            DeliveryHistory.objects.create(
+                route=route,
+                date=delivery_date,
+                vehicle=route.vehicle,
+                client_id_sequence=list(
+                    Order.objects.get_shippable_orders_by_route(
+                        route.id, delivery_date, exclude_non_geolocalized=True
+                    ).values_list("client__pk", flat=True)
+                ),
+            )
+
+    def run_benchmarks(self, delivery_date, year, month):
+        def kitchen_list():
+            return get_kitchen_list(delivery_date)
+
+        def kitchen_count_lines():
+            kitchen_list = get_kitchen_list(delivery_date)
+            return (
+                kitchen_list,
+                kcr_make_component_lines(kitchen_list, delivery_date),
+                kcr_make_meal_lines(kitchen_list),
+            )
+
+        def kitchen_count_pdf(kitchen_list, component_lines, meal_lines):
+            return make_kitchen_count(
+                kitchen_list, component_lines, meal_lines, delivery_date
+            )
+
+        def labels_pdf(kitchen_list, component_lines, meal_lines):
+            return make_labels(kitchen_list, component_lines, delivery_date)
+
+        def route_sheets_pdf():
+            return make_route_sheets(delivery_date)[0]
+
+        def delete_orders():
+            # Generate the orders from scratch, as the daily cron job does.
+            Order.objects.filter(delivery_date=delivery_date).delete()
+            return ()
+
+        def auto_create_orders():
+            return Order.objects.auto_create_orders(delivery_date, Client.ongoing.all())
+
+        def billing_create_new():
+            return Billing.objects.billing_create_new(year, month)
+
+        def new_billing():
+            billing = Billing.objects.billing_create_new(year, month)
+            # The same query as the CSV export view.
+            return (BillingSummaryView.queryset.get(id=billing.id),)
+
+        def billing_csv_export(billing):
+            return export_csv(billing, next_invoice_number=1)
+
+        benchmarks = [
+            ("kitchen_list", kitchen_list, None),
+            ("kitchen_count_pdf", kitchen_count_pdf, kitchen_count_lines),
+            ("labels_pdf", labels_pdf, kitchen_count_lines),
+            ("route_sheets_pdf", route_sheets_pdf, None),
+            ("auto_create_orders", auto_create_orders, delete_orders),
+            ("billing_create_new", billing_create_new, None),
+            ("billing_csv_export", billing_csv_export, new_billing),
+        ]
+        results = {}
+        for name, func, setup in benchmarks:
+            try:
+                results[name] = self.measure(func, setup)
+            except IngredientsMissingError:
+                results[name] = {"error": "The ingredients are not confirmed."}
+            self.stderr.write(f"{name}: {results[name]}")
+        return results
+
+    def measure(self, func, setup=None):
+        """
+        Run `func` `self.repeat` times, plus once to trace its memory
+        allocations. `setup` returns the arguments of `func`; it is not
+        measured. Each run is rolled back, and its PDF removed.
+        """
+        wall_times = []
+        for _ in range(self.repeat):
+            with transaction.atomic():
+                args = setup() if setup else ()
+                query_counter = QueryCounter()
+                with connection.execute_wrapper(query_counter):
+                    start = time.perf_counter()
+                    result = func(*args)
+                    wall_times.append(time.perf_counter() - start)
+                output_size = get_output_size(result)
+                remove_output(result)
+                transaction.set_rollback(True)
+
+        with transaction.atomic():
+            args = setup() if setup else ()
+            tracemalloc.start()
+            try:
+                result = func(*args)
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            remove_output(result)
+            transaction.set_rollback(True)
+
+        return {
+            "wall_time": statistics.median(wall_times),
+            "wall_times": wall_times,
+            "queries": query_counter.count,
+            "peak_memory": peak_memory,
+            "output_size": output_size,
+        }
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting the queries, whatever their number.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def get_output_size(result):
+    """
+    Size of the output of a benchmark: bytes of the generated file or HTTP
+    response, number of items otherwise.
+    """
+    if result is None:
+        return 0
+    if hasattr(result, "stat"):  # Path
+        return result.stat().st_size
+    if hasattr(result, "content"):  # HttpResponse
+        return len(result.content)
+    if isinstance(result, Billing):
+        return result.orders.count()
+    if hasattr(result, "__len__"):
+        return len(result)
+    raise CommandError(f"Unknown benchmark output: {result!r}")
+
+
+def remove_output(result):
+    """
+    Remove the PDF generated by a benchmark from GENERATED_DOCS_DIR, and
+    its directory (of the delivery date) if it is left empty.
+    """
+    if hasattr(result, "unlink"):  # Path
+        result.unlink(missing_ok=True)
+        with contextlib.suppress(OSError):
+            result.parent.rmdir()
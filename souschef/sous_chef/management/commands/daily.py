@@ -0,0 +1,172 @@
+import fcntl
+import json
+import os
+import time
+import traceback
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.contrib.admin.models import (
+    ADDITION,
+    LogEntry,
+)
+from django.core.management.base import BaseCommand, CommandError
+
+from souschef.member.models import (
+    ClientScheduledStatus,
+    get_ongoing_clients_at_date,
+)
+from souschef.order.models import Order
+from souschef.pycrons.cleaning import clean_old_pdf_files
+
+TASKS = [
+    "process_scheduled_status_changes",
+    "set_orders_delivered",
+    "generate_orders",
+    "clean_old_pdf_files",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the daily maintenance tasks in one process: scheduled status "
+        "changes, orders of the day before set to delivered, orders "
+        "generation and old PDF files cleaning. Outputs a JSON summary."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            help="The day of the run, in the format YYYY-MM-DD. Defaults to today.",
+        )
+        parser.add_argument(
+            "--generate-orders-days",
+            help=(
+                "Generate the orders of the ongoing clients for this many days, "
+                "starting with the day of the run. Defaults to 0 (no orders "
+                "generated, the kitchen generates them from the delivery page)."
+            ),
+            default=0,
+            type=int,
+        )
+        parser.add_argument(
+            "--skip",
+            help="Skip a task. Can be repeated.",
+            action="append",
+            choices=TASKS,
+            default=[],
+        )
+        parser.add_argument(
+            "--lock-file",
+            help="The lock preventing overlapping runs. Defaults to "
+            "GENERATED_DOCS_DIR/daily.lock.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Write the JSON summary to this file instead of the standard output.",
+        )
+
+    def handle(self, *args, **options):
+        if options["date"]:
+            self.day = date.fromisoformat(options["date"])
+        else:
+            self.day = date.today()
+        self.generate_orders_days = options["generate_orders_days"]
+        lock_path = options["lock_file"] or os.path.join(
+            settings.GENERATED_DOCS_DIR, "daily.lock"
+        )
+
+        with open(lock_path, "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError as e:
+                raise CommandError(
+                    f"Another daily run holds the lock {lock_path}."
+                ) from e
+            summary = self.run_tasks(options["skip"])
+
+        output = json.dumps(summary, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+        failed = [
+            task["name"] for task in summary["tasks"] if task["status"] == "error"
+        ]
+        if failed:
+            raise CommandError(f"Daily tasks failed: {', '.join(failed)}.")
+
+    def run_tasks(self, skip):
+        """
+        Run the tasks in order. A failing task does not prevent the next
+        ones from running.
+        """
+        start = time.perf_counter()
+        summary = {
+            "date": self.day.isoformat(),
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "tasks": [],
+        }
+        for name in TASKS:
+            task = {"name": name}
+            summary["tasks"].append(task)
+            if name in skip:
+                task["status"] = "skipped"
+                continue
+            task_start = time.perf_counter()
+            try:
+                task["result"] = getattr(self, name)()
+                task["status"] = "ok"
+            except Exception as e:
+                task["status"] = "error"
+                task["error"] = repr(e)
+                self.stderr.write(traceback.format_exc())
+            task["duration"] = round(time.perf_counter() - task_start, 3)
+            self.stderr.write(f"{name}: {task['status']} in {task['duration']}s")
+        summary["duration"] = round(time.perf_counter() - start, 3)
+        return summary
+
+    def process_scheduled_status_changes(self):
+        processed, errors = ClientScheduledStatus.objects.process_due_changes(self.day)
+        for scheduled_change in errors:
+            self.stderr.write(
+                f"Client «{scheduled_change.client.member}» status not updated: "
+                f"{scheduled_change}."
+            )
+        return {"processed": len(processed), "errors": len(errors)}
+
+    def set_orders_delivered(self):
+        delivery_date = self.day - timedelta(days=1)
+        orders = Order.objects.set_orders_delivered(delivery_date)
+        log_execution(
+            "Status set to delivered for orders on"
+            + str(delivery_date.strftime("%Y-%m-%d %H:%M"))
+        )
+        return {"delivery_date": delivery_date.isoformat(), "orders": orders}
+
+    def generate_orders(self):
+        orders = {}
+        for i in range(self.generate_orders_days):
+            delivery_date = self.day + timedelta(days=i)
+            clients = get_ongoing_clients_at_date(delivery_date, self.day)
+            created = Order.objects.auto_create_orders(delivery_date, clients)
+            log_execution(
+                "Orders creation for " + str(delivery_date.strftime("%Y-%m-%d %H:%M"))
+            )
+            orders[delivery_date.isoformat()] = len(created)
+        return {"orders": orders}
+
+    def clean_old_pdf_files(self):
+        return {"removed_files": clean_old_pdf_files()}
+
+
+def log_execution(object_repr):
+    LogEntry.objects.log_action(
+        user_id=1,
+        content_type_id=1,
+        object_id="",
+        object_repr=object_repr,
+        action_flag=ADDITION,
+    )
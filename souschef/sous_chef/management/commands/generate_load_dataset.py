@@ -0,0 +1,339 @@
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+from faker import Faker
+
+from souschef.billing.models import Billing
+from souschef.datamigration.importer import bulk_create_with_ids
+from souschef.meal.constants import COMPONENT_GROUP_CHOICES
+from souschef.meal.models import Restricted_item
+from souschef.member.constants import (
+    CELL,
+    DAYS_OF_WEEK,
+    EMAIL,
+    GENDER_CHOICES,
+    HOME,
+    MAILING_TYPE,
+    PAYMENT_TYPE,
+    RATE_TYPE,
+)
+from souschef.member.models import (
+    Address,
+    Client,
+    Client_option,
+    Contact,
+    Member,
+    Option,
+    Restriction,
+    Route,
+)
+from souschef.order.constants import (
+    ORDER_STATUS_CANCELLED,
+    ORDER_STATUS_DELIVERED,
+    ORDER_STATUS_NO_CHARGE,
+    ORDER_STATUS_ORDERED,
+)
+from souschef.order.models import (
+    Order,
+    Order_item,
+    make_order_items,
+)
+
+# Montréal downtown, the clients are spread around it.
+MONTREAL_LATITUDE = 45.5017
+MONTREAL_LONGITUDE = -73.5673
+SPREAD = 0.08
+
+# Meals are delivered on week days.
+DELIVERY_DAYS = [day for day, _ in DAYS_OF_WEEK[:5]]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large synthetic dataset (clients, schedules, restrictions, "
+        "orders and billings) for load testing. Do not run in production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clients",
+            help="The number of clients to create.",
+            default=1000,
+            type=int,
+        )
+        parser.add_argument(
+            "--days",
+            help="The number of days of order history, ending yesterday.",
+            default=365,
+            type=int,
+        )
+        parser.add_argument(
+            "--days-ahead",
+            help="The number of days of upcoming orders, starting today.",
+            default=7,
+            type=int,
+        )
+        parser.add_argument(
+            "--seed",
+            help="The random seed. The same seed gives the same dataset.",
+            default=42,
+            type=int,
+        )
+        parser.add_argument(
+            "--batch-size",
+            help="The number of rows inserted per query.",
+            default=1000,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.fake = Faker("fr_CA")
+        self.fake.seed_instance(options["seed"])
+        self.batch_size = options["batch_size"]
+        start = time.perf_counter()
+
+        if not Route.objects.exists():
+            call_command("loaddata", "routes.json", verbosity=0)
+
+        with transaction.atomic():
+            clients = self.create_clients(options["clients"])
+            today = date.today()
+            orders, items = self.create_orders(
+                clients,
+                today - timedelta(days=options["days"]),
+                today + timedelta(days=options["days_ahead"]),
+            )
+            billings = self.create_billings(
+                today - timedelta(days=options["days"]), today
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(clients)} clients, {orders} orders, {items} order "
+                f"items and {billings} billings in "
+                f"{time.perf_counter() - start:.1f}s."
+            )
+        )
+
+    def create_clients(self, number):
+        fake = self.fake
+        routes = list(Route.objects.all())
+        restricted_items = list(Restricted_item.objects.all())
+        schedule_option, _ = Option.objects.get_or_create(name="meals_schedule")
+
+        addresses = [
+            Address(
+                number=self.random.randint(1, 9999),
+                street=fake.street_name(),
+                apartment=str(self.random.randint(1, 20))
+                if self.random.random() < 0.5
+                else None,
+                city="Montréal",
+                postal_code=(
+                    f"H{self.random.randint(1, 9)}{fake.random_uppercase_letter()} "
+                    f"{self.random.randint(0, 9)}{fake.random_uppercase_letter()}"
+                    f"{self.random.randint(0, 9)}"
+                ),
+                latitude=round(
+                    MONTREAL_LATITUDE + self.random.uniform(-SPREAD, SPREAD), 6
+                ),
+                longitude=round(
+                    MONTREAL_LONGITUDE + self.random.uniform(-SPREAD, SPREAD), 6
+                ),
+            )
+            for _ in range(number)
+        ]
+        for address in addresses:
+            address.update_grid_cell()
+        bulk_create_with_ids(Address, addresses, self.batch_size)
+
+        members = [
+            Member(firstname=fake.first_name(), lastname=fake.last_name(), address=a)
+            for a in addresses
+        ]
+        for member in members:
+            member.update_search_key()
+        bulk_create_with_ids(Member, members, self.batch_size)
+
+        contacts = []
+        for member in members:
+            contacts.append(
+                Contact(member=member, type=HOME, value=fake.phone_number())
+            )
+            if self.random.random() < 0.3:
+                contacts.append(
+                    Contact(member=member, type=CELL, value=fake.phone_number())
+                )
+            if self.random.random() < 0.2:
+                contacts.append(Contact(member=member, type=EMAIL, value=fake.email()))
+        Contact.objects.bulk_create(contacts, batch_size=self.batch_size)
+
+        clients = []
+        for member in members:
+            # Nine clients out of ten have a weekly schedule.
+            ongoing = self.random.random() < 0.9
+            clients.append(
+                Client(
+                    member=member,
+                    billing_member=member,
+                    billing_payment_type=self.random.choice(PAYMENT_TYPE)[0],
+                    billing_mailing_type=self.random.choice(MAILING_TYPE)[0],
+                    rate_type=self.random.choice(RATE_TYPE)[0],
+                    status=Client.ACTIVE
+                    if self.random.random() < 0.85
+                    else self.random.choice(Client.CLIENT_STATUS)[0],
+                    language=self.random.choice(Client.LANGUAGES)[0],
+                    delivery_type=Client.ONGOING_DELIVERY
+                    if ongoing
+                    else Client.EPISODIC_DELIVERY,
+                    gender=self.random.choice(GENDER_CHOICES)[0],
+                    birthdate=fake.date_of_birth(minimum_age=60, maximum_age=100),
+                    route=self.random.choice(routes),
+                    alert=fake.sentence() if self.random.random() < 0.1 else "",
+                    delivery_note=fake.sentence() if self.random.random() < 0.3 else "",
+                    meal_default_week=self.make_meal_default_week(),
+                )
+            )
+        bulk_create_with_ids(Client, clients, self.batch_size)
+
+        client_options = []
+        restrictions = []
+        for client in clients:
+            if client.delivery_type == Client.ONGOING_DELIVERY:
+                client.schedule = sorted(
+                    self.random.sample(DELIVERY_DAYS, self.random.randint(1, 5)),
+                    key=DELIVERY_DAYS.index,
+                )
+                client_options.append(
+                    Client_option(
+                        client=client,
+                        option=schedule_option,
+                        value=json.dumps(client.schedule),
+                    )
+                )
+            else:
+                client.schedule = []
+            if restricted_items and self.random.random() < 0.3:
+                for restricted_item in self.random.sample(
+                    restricted_items, min(len(restricted_items), 2)
+                ):
+                    restrictions.append(
+                        Restriction(client=client, restricted_item=restricted_item)
+                    )
+        Client_option.objects.bulk_create(client_options, batch_size=self.batch_size)
+        Restriction.objects.bulk_create(restrictions, batch_size=self.batch_size)
+        return clients
+
+    def make_meal_default_week(self):
+        meal_default_week = {}
+        for day, _ in DAYS_OF_WEEK:
+            meal_default_week[f"size_{day}"] = self.random.choice(["R", "R", "L"])
+            for component_group, _ in COMPONENT_GROUP_CHOICES:
+                meal_default_week[f"{component_group}_{day}_quantity"] = (
+                    self.random.choice([1, 1, 1, 2])
+                    if component_group == "main_dish"
+                    else self.random.choice([0, 0, 0, 1])
+                )
+        return meal_default_week
+
+    def make_order_status(self, delivery_date, today):
+        if delivery_date >= today:
+            return ORDER_STATUS_ORDERED
+        return self.random.choices(
+            [ORDER_STATUS_DELIVERED, ORDER_STATUS_CANCELLED, ORDER_STATUS_NO_CHARGE],
+            weights=[90, 7, 3],
+        )[0]
+
+    def create_orders(self, clients, start_date, end_date):
+        """
+        Create the orders of the clients on their delivery days, flushing
+        them to the database by batches to keep the memory usage low.
+        """
+        today = date.today()
+        nb_orders = nb_items = 0
+        orders = []
+        delivery_date = start_date
+        while delivery_date < end_date:
+            day = DAYS_OF_WEEK[delivery_date.weekday()][0]
+            for client in clients:
+                if client.delivery_type == Client.ONGOING_DELIVERY:
+                    if day not in client.schedule:
+                        continue
+                elif day not in DELIVERY_DAYS or self.random.random() > 0.2:
+                    # Episodic clients order about once a week.
+                    continue
+                orders.append(
+                    Order(
+                        client=client,
+                        delivery_date=delivery_date,
+                        status=self.make_order_status(delivery_date, today),
+                    )
+                )
+            if len(orders) >= self.batch_size * 10:
+                nb_items += self.flush_orders(orders)
+                nb_orders += len(orders)
+                orders = []
+            delivery_date += timedelta(days=1)
+        nb_items += self.flush_orders(orders)
+        nb_orders += len(orders)
+        return nb_orders, nb_items
+
+    def flush_orders(self, orders):
+        bulk_create_with_ids(Order, orders, self.batch_size)
+        items = []
+        for order in orders:
+            day = DAYS_OF_WEEK[order.delivery_date.weekday()][0]
+            meal_default_week = order.client.meal_default_week
+            order_items = {
+                f"{component_group}_default_quantity": meal_default_week[
+                    f"{component_group}_{day}_quantity"
+                ]
+                for component_group, _ in COMPONENT_GROUP_CHOICES
+            }
+            order_items["size_default"] = meal_default_week[f"size_{day}"]
+            items.extend(make_order_items(order, order_items))
+        Order_item.objects.bulk_create(items, batch_size=self.batch_size)
+        return len(items)
+
+    def create_billings(self, start_date, today):
+        """
+        Bill every past month of the order history.
+        """
+        billings = []
+        billing_order_ids = []
+        year, month = start_date.year, start_date.month
+        while (year, month) < (today.year, today.month):
+            orders = Order.objects.get_billable_orders(year, month)
+            order_ids = list(orders.values_list("id", flat=True))
+            if order_ids:
+                total_amount = Order_item.objects.filter(
+                    order__in=orders, billable_flag=True
+                ).aggregate(total=Sum("price"))["total"]
+                billing = Billing(
+                    total_amount=total_amount or 0,
+                    billing_month=month,
+                    billing_year=year,
+                    detail={},
+                )
+                billings.append(billing)
+                billing_order_ids.append((billing, order_ids))
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        bulk_create_with_ids(Billing, billings, self.batch_size)
+
+        Through = Billing.orders.through
+        Through.objects.bulk_create(
+            [
+                Through(billing_id=billing.id, order_id=order_id)
+                for billing, order_ids in billing_order_ids
+                for order_id in order_ids
+            ],
+            batch_size=self.batch_size,
+        )
+        return len(billings)
@@ -0,0 +1,138 @@
+import glob
+import json
+import os
+import re
+from collections import Counter, defaultdict
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+GROUP_BY = {
+    "statement": lambda entry: normalize_sql(entry["sql"]),
+    "call_site": lambda entry: entry.get("call_site") or "unknown",
+    "origin": lambda entry: entry.get("origin") or "unknown",
+}
+
+
+def normalize_sql(sql):
+    """
+    The statement without its values, so that the runs of the same query
+    with different parameters are grouped together.
+    """
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"%s|\b\d+(?:\.\d+)?\b", "?", sql)
+    sql = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(...)", sql)
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def read_log(path):
+    """
+    The entries of the log and of its rotated backups, oldest first.
+    """
+    backups = sorted(
+        (
+            p
+            for p in glob.glob(glob.escape(path) + ".*")
+            if p.rpartition(".")[2].isdigit()
+        ),
+        key=lambda p: int(p.rpartition(".")[2]),
+        reverse=True,
+    )
+    for file_path in [*backups, path]:
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarize the slow-query log (see SOUSCHEF_SLOW_QUERY_THRESHOLD_MS): "
+        "the slowest statements in total, with their call sites and origins."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            help="The slow-query log. Defaults to SLOW_QUERY_LOG_FILE.",
+        )
+        parser.add_argument(
+            "--since",
+            help="Only the queries logged from this date, in the format YYYY-MM-DD.",
+        )
+        parser.add_argument(
+            "--by",
+            help="Group the queries by statement, call site or origin.",
+            choices=list(GROUP_BY),
+            default="statement",
+        )
+        parser.add_argument(
+            "--top",
+            help="The number of groups to show.",
+            default=20,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        path = options["file"] or settings.SLOW_QUERY_LOG_FILE
+        since = None
+        if options["since"]:
+            try:
+                since = date.fromisoformat(options["since"]).isoformat()
+            except ValueError as e:
+                raise CommandError(f"Invalid date: {options['since']}") from e
+        key = GROUP_BY[options["by"]]
+
+        groups = defaultdict(
+            lambda: {
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "call_sites": Counter(),
+                "origins": Counter(),
+            }
+        )
+        for entry in read_log(path):
+            if since and entry["time"] < since:
+                continue
+            group = groups[key(entry)]
+            group["count"] += 1
+            group["total_ms"] += entry["duration_ms"]
+            group["max_ms"] = max(group["max_ms"], entry["duration_ms"])
+            group["call_sites"][entry.get("call_site") or "unknown"] += 1
+            group["origins"][entry.get("origin") or "unknown"] += 1
+
+        if not groups:
+            self.stdout.write(f"No slow queries in {path}.")
+            return
+
+        ranking = sorted(
+            groups.items(), key=lambda item: item[1]["total_ms"], reverse=True
+        )
+        self.stdout.write(
+            f"{sum(g['count'] for g in groups.values())} slow queries, "
+            f"{len(groups)} distinct {options['by'].replace('_', ' ')}s, in {path}."
+        )
+        for name, group in ranking[: options["top"]]:
+            self.stdout.write("")
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{group['count']} queries, total {group['total_ms']:.0f} ms, "
+                    f"mean {group['total_ms'] / group['count']:.0f} ms, "
+                    f"max {group['max_ms']:.0f} ms"
+                )
+            )
+            self.stdout.write(f"  {name}")
+            for label, counter in (
+                ("call sites", group["call_sites"]),
+                ("origins", group["origins"]),
+            ):
+                self.stdout.write(
+                    f"  {label}: "
+                    + ", ".join(f"{k} ({n})" for k, n in counter.most_common(5))
+                )
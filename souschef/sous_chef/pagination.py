@@ -0,0 +1,228 @@
+"""
+Keyset (cursor) pagination for the large lists.
+
+Django's `Paginator` counts all the rows and skips the previous pages with
+`OFFSET`, which gets slower with every page. `KeysetPaginator` instead
+filters on the ordering values of the last row of the previous page (the
+cursor), so that every page is a range read on the ordering index, and
+only counts the rows up to `count_limit`.
+
+The cursor is passed in the `page` parameter, like a page number: the
+`next_page_number` and `previous_page_number` of a `KeysetPage` return the
+cursors, so the pagination templates work unchanged, except for the number
+of pages, given by the page since the count can be approximate.
+"""
+
+import math
+from functools import reduce
+
+from django.core import signing
+from django.db import connections
+from django.db.models import Q
+
+CURSOR_SALT = "souschef.sous_chef.pagination"
+
+
+def get_table_row_estimate(model, using):
+    """
+    The number of rows of the table of `model` estimated by MySQL from its
+    statistics, or None with the other databases.
+    """
+    connection = connections[using]
+    if connection.vendor != "mysql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def get_value(obj, field):
+    """The value of `field` ("member__created_at") for `obj`."""
+    for name in field.split("__"):
+        obj = getattr(obj, name)
+    return obj
+
+
+class KeysetPage:
+    def __init__(self, object_list, number, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<Page {self.number}>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.next_cursor
+
+    def previous_page_number(self):
+        return self.previous_cursor
+
+    @property
+    def num_pages_is_approximate(self):
+        return self.has_next() and self.paginator.count_is_approximate
+
+    @property
+    def num_pages(self):
+        """
+        The number of pages, at least up to this one. Only a lower bound,
+        shown as "M+", if `num_pages_is_approximate`.
+        """
+        if not self.has_next():
+            return self.number
+        return max(self.number + 1, self.paginator.num_pages)
+
+
+class KeysetPaginator:
+    """
+    Paginate `queryset` on `ordering`, a list of field names, by default
+    the ordering of the queryset. The primary key is added to the ordering
+    if needed, to make it unique. The fields must not be nullable.
+    """
+
+    def __init__(self, queryset, per_page, ordering=None, count_limit=1000):
+        ordering = list(
+            ordering or queryset.query.order_by or queryset.model._meta.ordering
+        )
+        if not {"pk", "-pk", "id", "-id"} & set(ordering):
+            ordering.append("pk")
+        self.ordering = ordering
+        self.queryset = queryset.order_by(*ordering)
+        self.per_page = per_page
+        self.count_limit = count_limit
+
+    @property
+    def count_and_approximate(self):
+        if not hasattr(self, "_count"):
+            estimate = None
+            if not self.queryset.query.where:
+                estimate = get_table_row_estimate(self.queryset.model, self.queryset.db)
+            if estimate is not None:
+                self._count, self._approximate = estimate, True
+            else:
+                count = self.queryset[: self.count_limit + 1].count()
+                self._count = min(count, self.count_limit)
+                self._approximate = count > self.count_limit
+        return self._count, self._approximate
+
+    @property
+    def count(self):
+        """
+        The number of rows, estimated by the database for a table without
+        filter, and capped to `count_limit` otherwise.
+        """
+        return self.count_and_approximate[0]
+
+    @property
+    def count_is_approximate(self):
+        return self.count_and_approximate[1]
+
+    @property
+    def num_pages(self):
+        return max(1, math.ceil(self.count / self.per_page))
+
+    def make_cursor(self, number, direction, obj):
+        values = [get_value(obj, field.lstrip("-")) for field in self.ordering]
+        # The dates and the decimals are converted back by the lookups.
+        values = [v if isinstance(v, int | float) else str(v) for v in values]
+        return signing.dumps([number, direction, values], salt=CURSOR_SALT)
+
+    def read_cursor(self, cursor):
+        """
+        The page number, the direction and the ordering values of the
+        cursor, or None for the first page or a tampered cursor.
+        """
+        if not cursor:
+            return None
+        try:
+            number, direction, values = signing.loads(cursor, salt=CURSOR_SALT)
+        except (signing.BadSignature, TypeError, ValueError):
+            return None
+        if (
+            not isinstance(number, int)
+            or direction not in ("after", "before")
+            or len(values) != len(self.ordering)
+        ):
+            return None
+        return number, direction, values
+
+    def seek(self, direction, values):
+        """
+        The rows after (or before) the row having `values`, in the order
+        of the pages: for the ordering (a, -b), `a > x OR (a = x AND b < y)`.
+        """
+        conditions = []
+        for i, field in enumerate(self.ordering):
+            descending = field.startswith("-")
+            name = field.lstrip("-")
+            lookup = "lt" if descending == (direction == "after") else "gt"
+            equal = {f.lstrip("-"): v for f, v in zip(self.ordering[:i], values)}
+            conditions.append(Q(**equal, **{f"{name}__{lookup}": values[i]}))
+        return self.queryset.filter(reduce(lambda a, b: a | b, conditions))
+
+    def page(self, cursor):
+        """
+        The page designated by `cursor`, as returned by
+        `KeysetPage.next_page_number`, or the first page.
+        """
+        position = self.read_cursor(cursor)
+        if position is None:
+            rows = list(self.queryset[: self.per_page + 1])
+            number, has_more, has_less = 1, len(rows) > self.per_page, False
+            rows = rows[: self.per_page]
+        elif position[1] == "after":
+            number = position[0]
+            rows = list(self.seek("after", position[2])[: self.per_page + 1])
+            has_more, has_less = len(rows) > self.per_page, True
+            rows = rows[: self.per_page]
+        else:
+            number = position[0]
+            rows = list(self.seek("before", position[2]).reverse()[: self.per_page + 1])
+            has_more, has_less = True, len(rows) > self.per_page
+            rows = rows[: self.per_page][::-1]
+
+        next_cursor = previous_cursor = None
+        if rows and has_more:
+            next_cursor = self.make_cursor(number + 1, "after", rows[-1])
+        if rows and has_less and number > 1:
+            previous_cursor = self.make_cursor(number - 1, "before", rows[0])
+        return KeysetPage(rows, number, self, next_cursor, previous_cursor)
+
+
+class KeysetPaginationMixin:
+    """
+    Paginate a `ListView` with `KeysetPaginator`, on `keyset_ordering` or
+    the ordering of the queryset.
+    """
+
+    keyset_ordering = None
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        page = paginator.page(self.request.GET.get(self.page_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,152 @@
+"""
+In-process registry of the small reference tables: ingredients, components,
+restricted items and options.
+
+These tables rarely change but are read by most pages (the sides component,
+the choices of the client forms...). Each process keeps them in memory,
+with the version stamp found in the shared cache when they were loaded.
+Saving or deleting a reference object replaces the stamp, so that every
+process reloads the tables on its next access. The stamp is stored in the
+default cache, which must be shared by the processes of the server (see
+CACHES in the settings); without a cache, the tables are read at every
+access.
+"""
+
+import uuid
+from functools import cached_property
+
+from django.core.cache import cache
+from django.db import transaction
+
+from souschef.meal.constants import COMPONENT_GROUP_CHOICES_SIDES
+from souschef.meal.models import Component, Ingredient, Restricted_item
+from souschef.member.constants import OPTION_GROUP_CHOICES_PREPARATION
+from souschef.member.models import Option
+
+STAMP_KEY = "souschef.sous_chef.registry.stamp"
+
+REFERENCE_MODELS = [
+    "meal.Ingredient",
+    "meal.Component",
+    "meal.Restricted_item",
+    "member.Option",
+]
+
+_registry = None
+
+
+def get_stamp():
+    """The version stamp of the reference tables, shared by the processes."""
+    stamp = cache.get(STAMP_KEY)
+    if stamp is None:
+        stamp = uuid.uuid4().hex
+        if not cache.add(STAMP_KEY, stamp, timeout=None):
+            # Set by another process in the meantime.
+            stamp = cache.get(STAMP_KEY, stamp)
+    return stamp
+
+
+def get_registry():
+    """The registry of the reference tables, reloaded if they changed."""
+    global _registry
+    stamp = get_stamp()
+    registry = _registry
+    if registry is None or registry.stamp != stamp:
+        registry = _registry = ReferenceData(stamp)
+    return registry
+
+
+def invalidate():
+    """
+    Make all the processes reload the reference tables. To be called after
+    changing them without saving objects (bulk operations, `update`).
+    """
+    global _registry
+    _registry = None
+    cache.set(STAMP_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_on_change(sender, **kwargs):
+    """
+    Invalidate the registry when a reference object is saved or deleted,
+    and again on commit, since another process may have reloaded the
+    tables before the changes were visible.
+    """
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+class ReferenceData:
+    """The reference tables, as lists and maps loaded on first access."""
+
+    def __init__(self, stamp):
+        self.stamp = stamp
+
+    @cached_property
+    def ingredients(self):
+        return {obj.pk: obj for obj in Ingredient.objects.order_by("pk")}
+
+    @cached_property
+    def components(self):
+        return {obj.pk: obj for obj in Component.objects.order_by("pk")}
+
+    @cached_property
+    def restricted_items(self):
+        return {obj.pk: obj for obj in Restricted_item.objects.order_by("pk")}
+
+    @cached_property
+    def options(self):
+        return {obj.pk: obj for obj in Option.objects.order_by("pk")}
+
+    def get_components(self, component_group):
+        return [
+            component
+            for component in self.components.values()
+            if component.component_group == component_group
+        ]
+
+    @property
+    def sides_component(self):
+        """
+        The only component of the sides group. Raises like
+        `Component.objects.get` if there is none or several.
+        """
+        components = self.get_components(COMPONENT_GROUP_CHOICES_SIDES)
+        if not components:
+            raise Component.DoesNotExist("There is no sides component.")
+        if len(components) > 1:
+            raise Component.MultipleObjectsReturned(
+                "There are several sides components."
+            )
+        return components[0]
+
+    def get_option(self, name):
+        """The first option named `name`, or None."""
+        for option in self.options.values():
+            if option.name == name:
+                return option
+        return None
+
+    @staticmethod
+    def make_choices(objects):
+        return [(obj.pk, str(obj)) for obj in objects]
+
+    @cached_property
+    def ingredient_choices(self):
+        return self.make_choices(self.ingredients.values())
+
+    @cached_property
+    def component_choices(self):
+        return self.make_choices(self.components.values())
+
+    @cached_property
+    def restricted_item_choices(self):
+        return self.make_choices(self.restricted_items.values())
+
+    @cached_property
+    def preparation_choices(self):
+        return self.make_choices(
+            option
+            for option in self.options.values()
+            if option.option_group == OPTION_GROUP_CHOICES_PREPARATION
+        )
@@ -95,6 +95,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.middleware.locale.LocaleMiddleware",
+    "souschef.sous_chef.dbrouting.ReadAfterWriteMiddleware",
 ]
 
 ROOT_URLCONF = "souschef.sous_chef.urls"
@@ -130,10 +131,22 @@ DATABASES = {
         "USER": os.environ.get("SOUSCHEF_DJANGO_DB_USER", "root"),
         "PASSWORD": os.environ.get("SOUSCHEF_DJANGO_DB_PASSWORD", "123456"),
         "HOST": os.environ.get("SOUSCHEF_DJANGO_DB_HOST", "db"),
-        "port": os.environ.get("SOUSCHEF_DJANGO_DB_PORT", "3306"),
+        "PORT": os.environ.get("SOUSCHEF_DJANGO_DB_PORT", "3306"),
     }
 }
 
+# Optional read replica of the database, used by the reports and exports
+# (see souschef/sous_chef/dbrouting.py).
+if os.environ.get("SOUSCHEF_DJANGO_REPLICA_DB_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ["SOUSCHEF_DJANGO_REPLICA_DB_HOST"],
+        "PORT": os.environ.get("SOUSCHEF_DJANGO_REPLICA_DB_PORT", "3306"),
+        "TEST": {"MIRROR": "default"},
+    }
+REPORTING_DATABASE = "replica" if "replica" in DATABASES else "default"
+DATABASE_ROUTERS = ["souschef.sous_chef.dbrouting.ReportingRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/1.9/ref/settings/#auth-password-validators
@@ -225,6 +238,84 @@ else:
     MEDIA_ROOT = os.path.join(STATIC_ROOT, "media")
     MEDIA_URL = "/static/media/"
 
+# The cache must be shared by the processes of the server: it holds the
+# version stamp of the reference data registry (see
+# souschef/sous_chef/registry.py) and the travel times (see below).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get(
+            "SOUSCHEF_CACHE_DIR", os.path.join(GENERATED_DOCS_DIR, "cache")
+        ),
+    }
+}
+
+# An OpenStreetMap extract (.osm XML) of the delivery area, to optimise the
+# routes and draw their itineraries on the road network without network
+# access (see souschef/delivery/routing.py). Without it, the routes are
+# optimised for the straight-line distance and drawn with Mapbox.
+ROUTING_OSM_EXTRACT = os.environ.get("SOUSCHEF_ROUTING_OSM_EXTRACT") or None
+# Where the `buildroadgraph` command saves the road graphs of the extract.
+ROUTING_GRAPH_DIR = os.environ.get(
+    "SOUSCHEF_ROUTING_GRAPH_DIR", os.path.join(GENERATED_DOCS_DIR, "routing")
+)
+
+
+# Opt-in per-request performance instrumentation: Server-Timing headers,
+# log lines and sampled profiles (see souschef/sous_chef/instrumentation.py).
+PERFORMANCE_INSTRUMENTATION = (
+    os.environ.get("SOUSCHEF_PERFORMANCE_INSTRUMENTATION") == "1"
+)
+# Profile one request in N (0 to disable).
+PERFORMANCE_PROFILE_SAMPLE_RATE = int(
+    os.environ.get("SOUSCHEF_PERFORMANCE_PROFILE_SAMPLE_RATE", "0")
+)
+PERFORMANCE_PROFILE_DIR = os.environ.get(
+    "SOUSCHEF_PERFORMANCE_PROFILE_DIR", os.path.join(GENERATED_DOCS_DIR, "profiles")
+)
+
+# Opt-in slow-query log: the SQL statements slower than this threshold, in
+# milliseconds, are logged with their origin to SLOW_QUERY_LOG_FILE (see
+# souschef/sous_chef/slowqueries.py and `manage.py slowqueries`).
+SLOW_QUERY_THRESHOLD_MS = (
+    float(os.environ["SOUSCHEF_SLOW_QUERY_THRESHOLD_MS"])
+    if os.environ.get("SOUSCHEF_SLOW_QUERY_THRESHOLD_MS")
+    else None
+)
+SLOW_QUERY_LOG_FILE = os.environ.get(
+    "SOUSCHEF_SLOW_QUERY_LOG_FILE", os.path.join(GENERATED_DOCS_DIR, "slow_queries.log")
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {},
+    "loggers": {},
+}
+
+if PERFORMANCE_INSTRUMENTATION:
+    MIDDLEWARE.insert(0, "souschef.sous_chef.instrumentation.PerformanceMiddleware")
+    TEMPLATES[0]["BACKEND"] = "souschef.sous_chef.instrumentation.TimedDjangoTemplates"
+    LOGGING["handlers"]["console"] = {"class": "logging.StreamHandler"}
+    LOGGING["loggers"]["souschef.performance"] = {
+        "handlers": ["console"],
+        "level": "INFO",
+    }
+
+if SLOW_QUERY_THRESHOLD_MS is not None:
+    MIDDLEWARE.insert(0, "souschef.sous_chef.slowqueries.SlowQueryMiddleware")
+    LOGGING["handlers"]["slow_queries"] = {
+        "class": "logging.handlers.RotatingFileHandler",
+        "filename": SLOW_QUERY_LOG_FILE,
+        "maxBytes": 10 * 1024 * 1024,
+        "backupCount": 5,
+        "delay": True,
+    }
+    LOGGING["loggers"]["souschef.slowqueries"] = {
+        "handlers": ["slow_queries"],
+        "level": "WARNING",
+        "propagate": False,
+    }
 
 MEAL_LABELS_FILE = os.path.join(GENERATED_DOCS_DIR, "meal_labels.pdf")
 KITCHEN_COUNT_FILE = os.path.join(GENERATED_DOCS_DIR, "kitchen_count.pdf")
@@ -5,9 +5,24 @@ SECRET_KEY = "SecretKeyForUseOnTravis"
 DEBUG = False
 TEMPLATE_DEBUG = False
 
+# No cache: the reference data registry would otherwise keep the rows of
+# the previous tests, whose transactions are rolled back.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    }
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
-    }
+    },
+    # To test the routing of the reports (with REPORTING_DATABASE set to
+    # "replica"), the replica is the test database.
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+        "TEST": {"MIRROR": "default"},
+    },
 }
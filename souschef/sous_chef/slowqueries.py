@@ -0,0 +1,143 @@
+"""
+Opt-in slow-query log.
+
+Enabled by setting `SOUSCHEF_SLOW_QUERY_THRESHOLD_MS` (see settings.py): every
+SQL statement, ORM or raw, slower than the threshold is logged as a line of
+JSON on the `souschef.slowqueries` logger, written to the rotating file
+`SLOW_QUERY_LOG_FILE`. Each line holds the statement, its parameters, its
+duration, its origin (the view or the management command that ran it) and
+its call site (the innermost Sous-Chef frame of the stack).
+
+`manage.py slowqueries` summarizes the log.
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime
+
+from django.conf import settings
+
+logger = logging.getLogger("souschef.slowqueries")
+
+# The view being processed, set by SlowQueryMiddleware.
+current_origin: ContextVar[str | None] = ContextVar("current_origin", default=None)
+
+SOUSCHEF_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Code of the helpers running SQL on behalf of their callers, see
+# `skip_call_site`.
+skipped_code = set()
+
+
+def skip_call_site(func):
+    """
+    Attribute the queries run by `func` to its caller, e.g. for a helper
+    executing raw SQL.
+    """
+    skipped_code.add(func.__code__)
+    return func
+
+
+def get_call_site():
+    """
+    The innermost frame of the Sous-Chef code, as "path:line in function".
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        if (
+            code.co_filename.startswith(SOUSCHEF_DIR)
+            and code.co_filename != __file__
+            and code not in skipped_code
+        ):
+            path = os.path.relpath(code.co_filename, SOUSCHEF_DIR)
+            return f"{path}:{frame.f_lineno} in {code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def get_origin():
+    """
+    The view or the management command running the query.
+    """
+    origin = current_origin.get()
+    if origin is not None:
+        return origin
+    if len(sys.argv) > 1 and os.path.basename(sys.argv[0]) in (
+        "manage.py",
+        "django-admin",
+    ):
+        return f"command:{sys.argv[1]}"
+    return None
+
+
+class SlowQueryRecorder:
+    """
+    Database execute wrapper logging the queries slower than
+    `SLOW_QUERY_THRESHOLD_MS`, see `connection.execute_wrapper`.
+    """
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            threshold = settings.SLOW_QUERY_THRESHOLD_MS
+            if threshold is not None and duration >= threshold:
+                self.record(sql, params, many, context, duration)
+
+    def record(self, sql, params, many, context, duration):
+        logger.warning(
+            json.dumps(
+                {
+                    "time": datetime.now().isoformat(timespec="seconds"),
+                    "duration_ms": round(duration, 1),
+                    "database": context["connection"].alias,
+                    "sql": sql,
+                    # The parameters of `executemany` may be a consumed
+                    # iterator.
+                    "params": None if many else params,
+                    "many": many,
+                    "origin": get_origin(),
+                    "call_site": get_call_site(),
+                },
+                default=str,
+            )
+        )
+
+
+def install_slow_query_recorder(sender, connection, **kwargs):
+    """
+    `connection_created` handler adding the recorder to the connection.
+    """
+    if settings.SLOW_QUERY_THRESHOLD_MS is None:
+        return
+    if not any(isinstance(w, SlowQueryRecorder) for w in connection.execute_wrappers):
+        # First, since `connection.execute_wrapper` pops the last one on
+        # exit. It is then the outermost wrapper: its timing includes the
+        # other wrappers, e.g. the query counters.
+        connection.execute_wrappers.insert(0, SlowQueryRecorder())
+
+
+class SlowQueryMiddleware:
+    """
+    Tag the queries with the name of the view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_origin.set(f"path:{request.path}")
+        try:
+            return self.get_response(request)
+        finally:
+            current_origin.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        current_origin.set(f"view:{request.resolver_match.view_name}")
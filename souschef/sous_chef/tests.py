@@ -1,12 +1,59 @@
+import fcntl
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
 from urllib.parse import quote as urlquote
 
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.management import call_command
-from django.db import connection
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import (
+    OperationalError,
+    connection,
+    connections,
+)
 from django.db.migrations.executor import MigrationExecutor
-from django.test import TransactionTestCase
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from souschef.meal.models import Component
+from souschef.member.factories import (
+    ClientFactory,
+    ClientScheduledStatusFactory,
+)
+from souschef.member.models import Client, Option
+from souschef.order.factories import OrderFactory
+from souschef.order.models import Order, day_avoid_ingredient, sql_exec
+from souschef.sous_chef.dbrouting import (
+    READ_AFTER_WRITE_COOKIE,
+    ReadAfterWriteMiddleware,
+    get_read_database,
+    get_reporting_database,
+    reporting,
+)
+from souschef.sous_chef.pagination import KeysetPaginator
+from souschef.sous_chef.registry import STAMP_KEY, get_registry
+from souschef.sous_chef.slowqueries import (
+    SlowQueryRecorder,
+    install_slow_query_recorder,
+)
 
 METHODS = ("GET", "POST", "PUT", "DELETE", "HEAD", "OPTIONS")
 
@@ -100,3 +147,544 @@ class TestMigrations(TransactionTestCase):
         In the end, ensure that the tested app has its latest migration.
         """
         call_command("migrate", self.app, verbosity=0)
+
+
+FULL_SCAN_SQLITE = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+FULL_SCAN_MYSQL_TYPES = ("ALL", "index")
+
+
+def get_full_table_scans(sql, using="default"):
+    """
+    Return the set of tables that the database would fully scan to run `sql`.
+
+    Supports the SQLite (unit tests) and MySQL (production) query plans.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            details = (row[-1] for row in cursor.fetchall())
+            return {
+                match.group(1)
+                for match in map(FULL_SCAN_SQLITE.match, details)
+                if match
+            }
+        elif connection.vendor == "mysql":
+            cursor.execute("EXPLAIN " + sql)
+            columns = [col[0] for col in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return {
+                row["table"] for row in rows if row["type"] in FULL_SCAN_MYSQL_TYPES
+            }
+        raise NotImplementedError(
+            f"Query plans are not supported on '{connection.vendor}'."
+        )
+
+
+class QueryPlanMixin:
+    """
+    Assertions on the query plans of the SQL statements run by a callable.
+
+    Used to make sure that the hot paths (kitchen count, route sheets,
+    billing) keep using the database indexes.
+    """
+
+    def assertNoFullTableScan(self, tables, func, *args, **kwargs):
+        """
+        Run `func` and check that none of its SELECT statements fully scans
+        one of the given `tables`. Returns the result of `func`.
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            result = func(*args, **kwargs)
+        selects = [
+            query["sql"]
+            for query in ctx.captured_queries
+            if query["sql"].lstrip().upper().startswith("SELECT")
+        ]
+        self.assertTrue(selects, f"{func.__name__} did not run any SELECT.")
+        for sql in selects:
+            scanned = get_full_table_scans(sql) & set(tables)
+            self.assertFalse(
+                scanned,
+                f"Full scan of {', '.join(sorted(scanned))} in query: {sql}",
+            )
+        return result
+
+
+class QueryBudgetMixin:
+    """
+    Assertions on the number of queries and the wall time of a request.
+
+    Used to catch N+1 regressions on the main views: the query count of
+    a page must not grow with the number of clients or orders displayed.
+    The measures are written to stderr so that they can be followed over
+    time.
+    """
+
+    def assertQueryBudget(self, url, max_queries, max_seconds, data=None):
+        """
+        GET `url` and check that it runs at most `max_queries` queries and
+        takes at most `max_seconds`. Returns the response.
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = self.client.get(url, data)
+            elapsed = time.perf_counter() - start
+        num_queries = len(ctx.captured_queries)
+        sys.stderr.write(
+            f"\n{url}: {num_queries} queries (max {max_queries}), "
+            f"{elapsed:.3f}s (max {max_seconds}s) "
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(
+            num_queries,
+            max_queries,
+            f"{url} ran {num_queries} queries:\n"
+            + "\n".join(query["sql"] for query in ctx.captured_queries),
+        )
+        self.assertLessEqual(
+            elapsed, max_seconds, f"{url} took {elapsed:.3f}s to respond."
+        )
+        return response
+
+
+class PerformanceMiddlewareTestCase(TestMixin, TestCase):
+    def setUp(self):
+        self.profile_dir = tempfile.TemporaryDirectory()
+        templates = [dict(settings.TEMPLATES[0])]
+        templates[0]["BACKEND"] = (
+            "souschef.sous_chef.instrumentation.TimedDjangoTemplates"
+        )
+        self.enterContext(
+            override_settings(
+                MIDDLEWARE=[
+                    "souschef.sous_chef.instrumentation.PerformanceMiddleware",
+                    *settings.MIDDLEWARE,
+                ],
+                TEMPLATES=templates,
+                PERFORMANCE_PROFILE_SAMPLE_RATE=2,
+                PERFORMANCE_PROFILE_DIR=self.profile_dir.name,
+            )
+        )
+        self.addCleanup(self.profile_dir.cleanup)
+        self.force_login()
+
+    def test_server_timing(self):
+        with self.assertLogs("souschef.performance", "INFO") as logs:
+            response = self.client.get(reverse("page:home"))
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="[1-9]\d* queries", '
+            r"template;dur=[\d.]*[1-9][\d.]*, total;dur=[\d.]+$",
+        )
+        self.assertIn(
+            "view=page:home method=GET path=/p/home status=200", logs.output[0]
+        )
+        self.assertEqual(logs.records[0].view_name, "page:home")
+        self.assertIsNone(logs.records[0].profile)
+
+    def test_profile_sampling(self):
+        with self.assertLogs("souschef.performance", "INFO") as logs:
+            for _ in range(4):
+                self.client.get(reverse("page:home"))
+        profiles = [record.profile for record in logs.records]
+        self.assertIsNone(profiles[0])
+        self.assertIsNone(profiles[2])
+        self.assertTrue(os.path.exists(profiles[1]))
+        self.assertTrue(os.path.exists(profiles[3]))
+        self.assertEqual(len(os.listdir(self.profile_dir.name)), 2)
+
+
+class SlowQueryLogTestCase(TestMixin, TestCase):
+    def setUp(self):
+        self.enterContext(override_settings(SLOW_QUERY_THRESHOLD_MS=0))
+
+    def test_raw_query_call_site(self):
+        with (
+            self.assertLogs("souschef.slowqueries", "WARNING") as logs,
+            connection.execute_wrapper(SlowQueryRecorder()),
+        ):
+            day_avoid_ingredient(date(2024, 5, 6))
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertIn("order_order", entry["sql"])
+        self.assertEqual(entry["params"][0], "2024-05-06")
+        self.assertEqual(entry["database"], "default")
+        self.assertRegex(entry["call_site"], r"^order/models.py:\d+ in day_avoid_")
+
+    def test_view_origin(self):
+        install_slow_query_recorder(sender=None, connection=connection)
+        install_slow_query_recorder(sender=None, connection=connection)
+        self.addCleanup(connection.execute_wrappers.pop, 0)
+        self.assertEqual(len(connection.execute_wrappers), 1)
+        self.force_login()
+        with (
+            override_settings(
+                MIDDLEWARE=[
+                    "souschef.sous_chef.slowqueries.SlowQueryMiddleware",
+                    *settings.MIDDLEWARE,
+                ]
+            ),
+            self.assertLogs("souschef.slowqueries", "WARNING") as logs,
+        ):
+            self.client.get(reverse("page:home"))
+        origins = {json.loads(r.getMessage())["origin"] for r in logs.records}
+        self.assertEqual(origins, {"view:page:home"})
+
+    def test_threshold(self):
+        with (
+            override_settings(SLOW_QUERY_THRESHOLD_MS=60000),
+            self.assertNoLogs("souschef.slowqueries"),
+            connection.execute_wrapper(SlowQueryRecorder()),
+        ):
+            User.objects.count()
+
+    def test_report(self):
+        log_dir = self.enterContext(tempfile.TemporaryDirectory())
+        path = os.path.join(log_dir, "slow_queries.log")
+        entries = [
+            ("2024-05-01T10:00:00", 120, "SELECT * FROM t WHERE id IN (%s, %s)", "a"),
+            ("2024-05-02T10:00:00", 300, "SELECT * FROM t WHERE id IN (%s)", "a"),
+            ("2024-05-03T10:00:00", 200, "SELECT name FROM u WHERE id = 12", "b"),
+        ]
+        for file_path, lines in ((path + ".1", entries[:2]), (path, entries[2:])):
+            with open(file_path, "w") as f:
+                for time_, duration, sql, call_site in lines:
+                    entry = {
+                        "time": time_,
+                        "duration_ms": duration,
+                        "sql": sql,
+                        "call_site": call_site,
+                        "origin": "view:page:home",
+                    }
+                    f.write(json.dumps(entry) + "\n")
+
+        out = StringIO()
+        call_command("slowqueries", file=path, stdout=out)
+        output = out.getvalue()
+        self.assertIn("3 slow queries, 2 distinct statements", output)
+        self.assertLess(
+            output.index("SELECT * FROM t WHERE id IN (...)"),
+            output.index("SELECT name FROM u WHERE id = ?"),
+        )
+        self.assertIn("2 queries, total 420 ms, mean 210 ms, max 300 ms", output)
+        self.assertIn("call sites: a (2)", output)
+
+        out = StringIO()
+        call_command(
+            "slowqueries", file=path, since="2024-05-02", by="call_site", stdout=out
+        )
+        self.assertIn("2 slow queries, 2 distinct call sites", out.getvalue())
+
+
+class DailyCommandTestCase(TestCase):
+    fixtures = ["routes.json"]
+
+    def setUp(self):
+        self.docs_dir = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(GENERATED_DOCS_DIR=self.docs_dir))
+        self.output = os.path.join(self.docs_dir, "daily.json")
+        self.today = date.today()
+        # The executions are logged as the first user, the administrator.
+        User.objects.create_superuser(id=1, username="admin", password="admin")
+
+        self.client = ClientFactory(status=Client.ACTIVE)
+        ClientScheduledStatusFactory(
+            client=self.client,
+            change_date=self.today,
+            status_from=Client.ACTIVE,
+            status_to=Client.PAUSED,
+        )
+        self.order = OrderFactory(
+            delivery_date=self.today - timedelta(days=1), status="O"
+        )
+        old_pdf = os.path.join(self.docs_dir, "old.pdf")
+        open(old_pdf, "w").close()
+        two_years_ago = time.time() - 2 * 365 * 24 * 60 * 60
+        os.utime(old_pdf, (two_years_ago, two_years_ago))
+        open(os.path.join(self.docs_dir, "new.pdf"), "w").close()
+
+    def get_summary(self):
+        with open(self.output) as f:
+            return {task["name"]: task for task in json.load(f)["tasks"]}
+
+    def test_daily(self):
+        call_command(
+            "daily", output=self.output, skip=["generate_orders"], stderr=StringIO()
+        )
+        tasks = self.get_summary()
+        self.assertEqual(
+            tasks["process_scheduled_status_changes"]["result"],
+            {"processed": 1, "errors": 0},
+        )
+        self.assertEqual(tasks["set_orders_delivered"]["result"]["orders"], 1)
+        self.assertEqual(tasks["generate_orders"]["status"], "skipped")
+        self.assertEqual(tasks["clean_old_pdf_files"]["result"], {"removed_files": 1})
+        self.assertGreaterEqual(tasks["clean_old_pdf_files"]["duration"], 0)
+        self.client.refresh_from_db()
+        self.assertEqual(self.client.status, "S")
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "D")
+        self.assertEqual(
+            sorted(os.listdir(self.docs_dir)), ["daily.json", "daily.lock", "new.pdf"]
+        )
+
+    def test_failing_task(self):
+        """
+        A failing task is reported, the next ones still run.
+        """
+        with (
+            override_settings(GENERATED_DOCS_DIR=os.path.join(self.docs_dir, "x")),
+            self.assertRaisesMessage(
+                CommandError, "Daily tasks failed: clean_old_pdf_files."
+            ),
+        ):
+            call_command(
+                "daily",
+                output=self.output,
+                lock_file=os.path.join(self.docs_dir, "daily.lock"),
+                stderr=StringIO(),
+            )
+        tasks = self.get_summary()
+        self.assertEqual(tasks["clean_old_pdf_files"]["status"], "error")
+        self.assertIn("FileNotFoundError", tasks["clean_old_pdf_files"]["error"])
+        self.assertEqual(tasks["set_orders_delivered"]["status"], "ok")
+
+    def test_overlapping_runs(self):
+        with open(os.path.join(self.docs_dir, "daily.lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            with self.assertRaisesMessage(CommandError, "Another daily run"):
+                call_command("daily", output=self.output)
+        self.assertFalse(os.path.exists(self.output))
+
+
+class ImportTimeTestCase(SimpleTestCase):
+    """
+    The URLs are loaded by every gunicorn worker and every management
+    command (through the system checks): they must not import the slow
+    PDF libraries, only needed when generating documents.
+    """
+
+    LAZY_MODULES = ("reportlab", "labels", "souschef.delivery.pdf")
+
+    def get_imported_modules(self):
+        """The modules imported when loading the URLs."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                "import django; django.setup(); "
+                "from django.urls import get_resolver; get_resolver().url_patterns",
+            ],
+            capture_output=True,
+            check=True,
+            env={
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+                "PYTHONPATH": os.pathsep.join(sys.path),
+            },
+            text=True,
+        )
+        modules = []
+        for line in result.stderr.splitlines():
+            match = re.match(r"import time:\s+\d+ \|\s+\d+ \| \s*(\S+)$", line)
+            if match:
+                modules.append(match.group(1))
+        return modules
+
+    def test_lazy_pdf_modules(self):
+        modules = self.get_imported_modules()
+        self.assertIn("souschef.delivery.views", modules)
+        self.assertEqual(
+            [name for name in modules if name.startswith(self.LAZY_MODULES)], []
+        )
+
+
+class KeysetPaginationTestCase(TestMixin, TestCase):
+    fixtures = ["routes.json"]
+
+    @classmethod
+    def setUpTestData(cls):
+        # Several orders per delivery date, to test the ties.
+        for i in range(9):
+            OrderFactory.create_batch(
+                5, delivery_date=date(2024, 5, 1) + timedelta(days=i % 4)
+            )
+
+    def get_expected_ids(self):
+        return list(
+            Order.objects.order_by("-delivery_date", "id").values_list("id", flat=True)
+        )
+
+    def test_pages(self):
+        paginator = KeysetPaginator(
+            Order.objects.all(), 10, ["-delivery_date", "id"], count_limit=20
+        )
+        self.assertEqual((paginator.count, paginator.count_is_approximate), (20, True))
+
+        pages = [paginator.page(None)]
+        while pages[-1].has_next():
+            with self.assertNumQueries(1):
+                pages.append(paginator.page(pages[-1].next_page_number()))
+        self.assertEqual([page.number for page in pages], [1, 2, 3, 4, 5])
+        # Never fewer pages than the pages seen, and exact on the last page.
+        self.assertEqual(
+            [(page.num_pages, page.num_pages_is_approximate) for page in pages],
+            [(2, True), (3, True), (4, True), (5, True), (5, False)],
+        )
+        self.assertFalse(pages[0].has_previous())
+        self.assertEqual(
+            [order.id for page in pages for order in page], self.get_expected_ids()
+        )
+
+        previous = paginator.page(pages[-1].previous_page_number())
+        self.assertEqual(previous.number, 4)
+        self.assertEqual(list(previous), list(pages[3]))
+        first = paginator.page(pages[1].previous_page_number())
+        self.assertEqual(list(first), list(pages[0]))
+        self.assertFalse(first.has_previous())
+
+    def test_tampered_cursor(self):
+        paginator = KeysetPaginator(Order.objects.all(), 10)
+        cursor = paginator.page(None).next_page_number()
+        self.assertEqual(paginator.page(cursor[:-1] + "x").number, 1)
+        self.assertEqual(paginator.page("3").number, 1)
+
+    def test_order_list(self):
+        self.force_login()
+        url = reverse("order:list")
+        ids = []
+        page = ""
+        while page is not None:
+            response = self.client.get(url, {"page": page})
+            page_obj = response.context["page_obj"]
+            ids.extend(order.id for order in page_obj)
+            page = page_obj.next_page_number()
+        self.assertEqual(ids, self.get_expected_ids())
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ReferenceDataRegistryTestCase(TestCase):
+    def setUp(self):
+        self.sides = Component.objects.create(name="Sides", component_group="sides")
+
+    def test_cached(self):
+        registry = get_registry()
+        self.assertEqual(registry.sides_component, self.sides)
+        with self.assertNumQueries(0):
+            self.assertIs(get_registry(), registry)
+            self.assertEqual(get_registry().sides_component, self.sides)
+
+    def test_invalidated_on_save(self):
+        registry = get_registry()
+        self.assertIn((self.sides.pk, "Sides"), registry.component_choices)
+        Component.objects.create(name="More sides", component_group="sides")
+        self.assertIsNot(get_registry(), registry)
+        with self.assertRaises(Component.MultipleObjectsReturned):
+            self.assertIsNone(get_registry().sides_component)
+        self.sides.delete()
+        self.assertEqual(get_registry().sides_component.name, "More sides")
+
+    def test_invalidated_by_other_process(self):
+        """A process reloads the tables when another one changed them."""
+        registry = get_registry()
+        cache.set(STAMP_KEY, "changed by another process")
+        self.assertIsNot(get_registry(), registry)
+
+    def test_options(self):
+        puree = Option.objects.create(name="Puree all", option_group="preparation")
+        Option.objects.create(name="meals_schedule", option_group="other")
+        self.assertEqual(get_registry().preparation_choices, [(puree.pk, "Puree all")])
+        self.assertIsNone(get_registry().get_option("Cut up meat"))
+        with self.assertNumQueries(0):
+            self.assertEqual(get_registry().get_option("Puree all"), puree)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_without_cache(self):
+        """Without a shared cache, the tables are read at every access."""
+        self.assertIsNot(get_registry(), get_registry())
+
+
+@override_settings(REPORTING_DATABASE="replica")
+class ReportingRoutingTestCase(TestMixin, TransactionTestCase):
+    # Not a TestCase: the replica connection could not read the rows of the
+    # transaction of the test.
+    databases = {"default", "replica"}
+    fixtures = ["routes.json"]
+
+    def setUp(self):
+        self.order = OrderFactory(delivery_date=date(2024, 5, 1))
+
+    def test_reads_routed(self):
+        self.assertEqual(Order.objects.all().db, "default")
+        with reporting():
+            self.assertEqual(get_read_database(), "replica")
+            self.assertEqual(Order.objects.all().db, "replica")
+            order = Order.objects.get(pk=self.order.pk)
+            self.assertEqual(order._state.db, "replica")
+            # The writes go to the primary database.
+            order.save()
+            self.assertEqual(order._state.db, "default")
+        self.assertEqual(get_read_database(), "default")
+
+    def test_raw_sql(self):
+        with (
+            reporting(),
+            CaptureQueriesContext(connections["replica"]) as replica_queries,
+        ):
+            rows = sql_exec("SELECT id FROM order_order", {})
+        self.assertEqual([row.id for row in rows], [self.order.pk])
+        self.assertEqual(len(replica_queries), 1)
+
+    def test_fallback(self):
+        """The primary database is used when the replica is unavailable."""
+        with (
+            mock.patch.object(
+                connections["replica"],
+                "ensure_connection",
+                side_effect=OperationalError,
+            ),
+            self.assertLogs("souschef.sous_chef.dbrouting", "WARNING"),
+        ):
+            self.assertEqual(get_reporting_database(), "default")
+        with self.settings(REPORTING_DATABASE="unknown"):
+            self.assertEqual(get_reporting_database(), "default")
+
+    def test_read_after_write(self):
+        """The reads stay on the primary database after a write."""
+        databases = []
+
+        def view(request):
+            with reporting():
+                databases.append(Order.objects.all().db)
+                if request.method == "POST":
+                    Order.objects.filter(pk=self.order.pk).update(status="D")
+                    databases.append(Order.objects.all().db)
+            return HttpResponse()
+
+        middleware = ReadAfterWriteMiddleware(view)
+        response = middleware(RequestFactory().post("/"))
+        self.assertEqual(["replica", "default"], databases)
+        self.assertEqual(10, response.cookies[READ_AFTER_WRITE_COOKIE]["max-age"])
+
+        databases.clear()
+        request = RequestFactory().get("/")
+        request.COOKIES[READ_AFTER_WRITE_COOKIE] = "1"
+        response = middleware(request)
+        request = RequestFactory().get("/")
+        middleware(request)
+        self.assertEqual(["default", "replica"], databases)
+        self.assertNotIn(READ_AFTER_WRITE_COOKIE, response.cookies)
+
+    def test_view(self):
+        """The CSV export reads from the replica."""
+        self.force_login()
+        with CaptureQueriesContext(connections["replica"]) as replica_queries:
+            response = self.client.get(reverse("order:list"), {"format": "csv"})
+        self.assertContains(response, str(self.order.pk))
+        self.assertTrue(replica_queries)
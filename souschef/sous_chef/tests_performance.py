@@ -0,0 +1,265 @@
+"""
+Query budgets of the main views on a large synthetic dataset.
+
+The query counts must not depend on the number of clients or orders: the
+budgets below must hold whatever the size of the dataset. The size can be
+raised with the `SOUSCHEF_PERF_CLIENTS` environment variable, e.g. to check
+a change against a production-sized database:
+
+    SOUSCHEF_PERF_CLIENTS=5000 python manage.py test souschef.sous_chef
+
+The wall-time ceilings are generous on purpose, to catch only the
+regressions of an order of magnitude on slow CI machines.
+"""
+
+import datetime
+import json
+import os
+import random
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from souschef.billing.models import Billing
+from souschef.meal.constants import COMPONENT_GROUP_CHOICES_SIDES
+from souschef.meal.models import (
+    Component,
+    Component_ingredient,
+    Ingredient,
+    Menu,
+)
+from souschef.member.factories import (
+    ClientFactory,
+    ClientScheduledStatusFactory,
+)
+from souschef.member.models import (
+    Client,
+    ClientScheduledStatus,
+    Member,
+    Route,
+)
+from souschef.order.constants import (
+    ORDER_STATUS_CANCELLED,
+    ORDER_STATUS_DELIVERED,
+    ORDER_STATUS_ORDERED,
+)
+from souschef.order.factories import (
+    OrderFactory,
+    OrderItemFactory,
+)
+from souschef.order.models import Order
+from souschef.sous_chef.tests import QueryBudgetMixin
+from souschef.sous_chef.tests import TestMixin as SousChefTestMixin
+
+NB_CLIENTS = int(os.environ.get("SOUSCHEF_PERF_CLIENTS", 1000))
+MAX_SECONDS = 5
+
+
+class ViewsQueryBudgetTestCase(QueryBudgetMixin, SousChefTestMixin, TestCase):
+    fixtures = ["sample_data"]
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(NB_CLIENTS)
+        cls.today = datetime.date.today()
+        last_month = (cls.today.replace(day=1) - datetime.timedelta(days=1)).replace(
+            day=15
+        )
+        routes = list(Route.objects.all())
+        for i in range(NB_CLIENTS):
+            client = ClientFactory(
+                status=Client.ACTIVE,
+                route=routes[i % len(routes)],
+                member__address__latitude="45.5",
+                member__address__longitude="-73.6",
+            )
+            if i % 10 == 0:
+                ClientScheduledStatusFactory(
+                    client=client,
+                    status_from=Client.ACTIVE,
+                    status_to=Client.PAUSED,
+                    change_date=cls.today,
+                    change_state=ClientScheduledStatus.END,
+                )
+            order = OrderFactory(
+                client=client,
+                delivery_date=cls.today,
+                status=ORDER_STATUS_CANCELLED if i % 20 == 0 else ORDER_STATUS_ORDERED,
+            )
+            OrderItemFactory(
+                order=order,
+                component_group="main_dish",
+                order_item_type="meal_component",
+                size="R",
+                total_quantity=1,
+            )
+            OrderFactory(
+                client=client,
+                delivery_date=last_month,
+                status=ORDER_STATUS_DELIVERED,
+            )
+
+        main_dish = Component.objects.get(name="Ginger pork")
+        for ingredient in Component.get_recipe_ingredients(main_dish.id):
+            Component_ingredient.objects.create(
+                component=main_dish, ingredient=ingredient, date=cls.today
+            )
+        Component_ingredient.objects.create(
+            component=Component.objects.get(
+                component_group=COMPONENT_GROUP_CHOICES_SIDES
+            ),
+            ingredient=Ingredient.objects.get(name="Cabbage"),
+            date=cls.today,
+        )
+        Menu.create_menu_and_components(cls.today, ["Ginger pork", "Green Salad"])
+        cls.billing = Billing.objects.billing_create_new(
+            last_month.year, last_month.month
+        )
+
+    def setUp(self):
+        self.force_login()
+
+    def test_client_list(self):
+        self.assertQueryBudget(reverse("member:list"), 12, MAX_SECONDS)
+
+    def test_order_list(self):
+        self.assertQueryBudget(reverse("order:list"), 12, MAX_SECONDS)
+
+    def test_review_orders(self):
+        self.assertQueryBudget(
+            reverse("delivery:order"),
+            12,
+            MAX_SECONDS,
+            {"delivery_date": self.today.isoformat()},
+        )
+
+    def test_kitchen_count(self):
+        self.assertQueryBudget(
+            reverse("delivery:kitchen_count"),
+            19,
+            MAX_SECONDS,
+            {"delivery_date": self.today.isoformat()},
+        )
+
+    def test_routes_information(self):
+        self.assertQueryBudget(
+            reverse("delivery:routes"),
+            11,
+            MAX_SECONDS,
+            {"delivery_date": self.today.isoformat()},
+        )
+
+    def test_billing_summary(self):
+        self.assertQueryBudget(
+            reverse("billing:view", args=[self.billing.pk]), 13, MAX_SECONDS
+        )
+
+    def test_home(self):
+        self.assertQueryBudget(reverse("page:home"), 16, MAX_SECONDS)
+
+
+class GenerateLoadDatasetTestCase(TestCase):
+    def generate(self):
+        out = StringIO()
+        call_command(
+            "generate_load_dataset",
+            clients=30,
+            days=70,
+            days_ahead=3,
+            seed=7,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_generate(self):
+        output = self.generate()
+        self.assertIn("Created 30 clients", output)
+        self.assertEqual(Client.objects.count(), 30)
+        self.assertTrue(Route.objects.exists())
+
+        today = datetime.date.today()
+        orders = Order.objects.all()
+        self.assertTrue(orders.filter(delivery_date__gte=today).exists())
+        self.assertFalse(
+            orders.filter(delivery_date__gte=today)
+            .exclude(status=ORDER_STATUS_ORDERED)
+            .exists()
+        )
+        # Ongoing clients only receive orders on their scheduled days.
+        for client in Client.objects.filter(delivery_type=Client.ONGOING_DELIVERY):
+            schedule = client.simple_meals_schedule
+            for order in client.client_order.all():
+                self.assertIn(
+                    order.delivery_date.strftime("%A").lower(), schedule, order
+                )
+            self.assertTrue(all(order.price > 0 for order in client.client_order.all()))
+
+        billing = Billing.objects.first()
+        self.assertEqual(
+            billing.total_amount, sum(order.price for order in billing.orders.all())
+        )
+
+    def test_same_seed_same_dataset(self):
+        self.generate()
+        first = list(Member.objects.order_by("id").values_list("firstname", "lastname"))
+        orders = Order.objects.count()
+        self.generate()
+        second = list(
+            Member.objects.order_by("id").values_list("firstname", "lastname")
+        )[len(first) :]
+        self.assertEqual(first, second)
+        self.assertEqual(Order.objects.count(), orders * 2)
+
+
+class BenchmarkTestCase(TestCase):
+    fixtures = ["meal_initial_data"]
+
+    def test_benchmark_synthetic_dataset(self):
+        out = StringIO()
+        docs_dir = self.enterContext(tempfile.TemporaryDirectory())
+        with self.settings(
+            **{
+                name: os.path.join(docs_dir, os.path.basename(getattr(settings, name)))
+                for name in (
+                    "KITCHEN_COUNT_FILE",
+                    "MEAL_LABELS_FILE",
+                    "ROUTE_SHEETS_FILE",
+                )
+            }
+        ):
+            call_command(
+                "benchmark", clients=20, repeat=1, stdout=out, stderr=StringIO()
+            )
+        # The generated PDFs are removed.
+        self.assertEqual([], os.listdir(docs_dir))
+        results = json.loads(out.getvalue())
+        self.assertEqual(results["dataset"]["clients"], 20)
+        self.assertEqual(
+            set(results["benchmarks"]),
+            {
+                "kitchen_list",
+                "kitchen_count_pdf",
+                "labels_pdf",
+                "route_sheets_pdf",
+                "auto_create_orders",
+                "billing_create_new",
+                "billing_csv_export",
+            },
+        )
+        for name, result in results["benchmarks"].items():
+            self.assertNotIn("error", result, name)
+            self.assertGreater(result["output_size"], 0, name)
+            self.assertGreater(result["peak_memory"], 0, name)
+            self.assertEqual(len(result["wall_times"]), 1, name)
+        self.assertGreater(results["benchmarks"]["kitchen_list"]["queries"], 0)
+        # Nothing is left in the database.
+        self.assertFalse(Client.objects.exists())
+        self.assertFalse(Order.objects.exists())
+
+    def test_benchmark_repeat(self):
+        with self.assertRaisesMessage(CommandError, "--repeat must be at least 1."):
+            call_command("benchmark", repeat=0, stdout=StringIO())